@@ -0,0 +1,99 @@
+import tracemalloc
+from collections.abc import Iterable
+from typing import Any, Callable
+
+import pytest
+
+# Offline benchmarks of the processing stages on a synthetic corpus, run with
+#   pytest benchmarks --no-cov --corpus-sizes 1000,100000,1000000
+# Each benchmark records `records_per_s` and `peak_mib` (tracemalloc peak of one
+# extra run) in its extra_info, which --benchmark-json saves alongside the timings.
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("ctgforge benchmarks")
+    group.addoption(
+        "--corpus-sizes",
+        default="1000",
+        help="comma-separated numbers of studies to benchmark with (default: 1000)",
+    )
+    group.addoption(
+        "--materialize-limit",
+        type=int,
+        default=100_000,
+        help="largest corpus whose stage inputs are built before timing; the inputs "
+        "of larger ones are generated inside the timed stage (default: 100000)",
+    )
+    group.addoption(
+        "--no-memory",
+        action="store_true",
+        help="skip the extra tracemalloc run that measures peak memory",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "n_studies" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("corpus_sizes").split(",")]
+        metafunc.parametrize("n_studies", sizes, ids=[f"{size:_}" for size in sizes])
+
+
+class Stage:
+    """Runs one pipeline stage under pytest-benchmark and records throughput and memory."""
+
+    def __init__(self, benchmark: Any, config: pytest.Config) -> None:
+        self._benchmark = benchmark
+        self._limit = config.getoption("materialize_limit")
+        self._memory = not config.getoption("no_memory")
+
+    def source(self, n: int, make: Callable[[int], Iterable[Any]]) -> Callable[[], Iterable[Any]]:
+        """
+        Inputs of a stage: built once, outside the timings, when `n` is within
+        --materialize-limit; otherwise regenerated lazily by every run.
+        """
+        if n <= self._limit:
+            items = list(make(n))
+            self._benchmark.extra_info["input"] = "prebuilt"
+            return lambda: items
+        self._benchmark.extra_info["input"] = "lazy"
+        return lambda: make(n)
+
+    def run(self, fn: Callable[[], Any], records: int) -> None:
+        rounds = max(1, min(5, 20_000 // max(records, 1)))
+        self._benchmark.pedantic(fn, rounds=rounds, iterations=1)
+
+        info = self._benchmark.extra_info
+        info["records"] = records
+        info.setdefault("input", "generated")
+        stats = getattr(self._benchmark, "stats", None)
+        if stats is not None:
+            info["records_per_s"] = round(records / stats.stats.min)
+        if self._memory:
+            tracemalloc.start()
+            try:
+                fn()
+                info["peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            finally:
+                tracemalloc.stop()
+
+
+@pytest.fixture
+def stage(benchmark: Any, request: pytest.FixtureRequest) -> Stage:
+    return Stage(benchmark, request.config)
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    session = getattr(terminalreporter.config, "_benchmarksession", None)
+    benchmarks = getattr(session, "benchmarks", None)
+    if not benchmarks:
+        return
+
+    terminalreporter.section("throughput and peak memory")
+    for bench in benchmarks:
+        info = bench.extra_info
+        rate = info.get("records_per_s")
+        peak = info.get("peak_mib")
+        terminalreporter.write_line(
+            f"{bench.fullname.split('::')[-1]:<50} "
+            f"{f'{rate:,} records/s' if rate is not None else '-':>20} "
+            f"{f'{peak} MiB' if peak is not None else '-':>12}  ({info.get('input')} input)"
+        )
@@ -0,0 +1,54 @@
+from collections import deque
+
+import pytest
+
+from ctgforge.export import to_dataframe, to_property_graph
+from ctgforge.flatten import flatten_core
+from ctgforge.query.compiler import compile_to_params
+from ctgforge.testing import SyntheticCorpus, synthetic_queries
+
+CORPUS = SyntheticCorpus(seed=0)
+
+
+def _consume(items) -> None:
+    deque(items, maxlen=0)
+
+
+def _raws(n):
+    return CORPUS.studies(n)
+
+
+def _trials(n):
+    return (flatten_core(raw) for raw in CORPUS.studies(n))
+
+
+def test_generate(stage, n_studies):
+    stage.run(lambda: _consume(_raws(n_studies)), n_studies)
+
+
+def test_flatten_core(stage, n_studies):
+    raws = stage.source(n_studies, _raws)
+    stage.run(lambda: _consume(flatten_core(raw) for raw in raws()), n_studies)
+
+
+def test_flatten_to_table(stage, n_studies):
+    pytest.importorskip("pyarrow")
+    from ctgforge.flatten.arrow import flatten_to_table
+
+    raws = stage.source(n_studies, _raws)
+    stage.run(lambda: flatten_to_table(raws()), n_studies)
+
+
+def test_to_dataframe(stage, n_studies):
+    trials = stage.source(n_studies, _trials)
+    stage.run(lambda: to_dataframe(trials()), n_studies)
+
+
+def test_to_property_graph(stage, n_studies):
+    trials = stage.source(n_studies, _trials)
+    stage.run(lambda: to_property_graph(trials()), n_studies)
+
+
+def test_compile_to_params(stage, n_studies):
+    queries = stage.source(n_studies, synthetic_queries)
+    stage.run(lambda: _consume(map(compile_to_params, queries())), n_studies)
@@ -0,0 +1,86 @@
+from typing import Optional
+
+import pytest
+
+from ctgforge import CTG
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.requests_client import CTGRequestsClient
+from ctgforge.flatten import flatten_core, projection_fields
+from ctgforge.testing import CorpusConfig, FakeCTGServer, Faults
+
+# Request throughput of the HTTP transports against a loopback FakeCTGServer. The
+# server keeps encoded studies, so after warm-up its cost is mostly socket I/O.
+SEARCH_STUDIES = 5_000
+LOOKUPS = 200
+TRANSPORTS = {"httpx": CTGHttpxClient, "requests": CTGRequestsClient}
+
+
+def _warm(server: FakeCTGServer, n: int, fields: Optional[list[str]] = None) -> FakeCTGServer:
+    client = CTGHttpxClient(base_url=server.url)
+    for _ in client.search(limit=n):
+        pass
+    if fields:
+        for _ in client.search(limit=n, fields=fields):
+            pass
+    client.close()
+    return server
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeCTGServer(n_studies=SEARCH_STUDIES) as server:
+        yield _warm(server, SEARCH_STUDIES)
+
+
+@pytest.fixture(scope="module")
+def full_server():
+    # full study documents, with results, locations and MeSH trees
+    config = CorpusConfig(full_documents=True)
+    with FakeCTGServer(n_studies=SEARCH_STUDIES, config=config) as server:
+        yield _warm(server, SEARCH_STUDIES, projection_fields(flatten_core))
+
+
+@pytest.fixture(scope="module")
+def slow_server():
+    # 20 ms per request: bulk lookups are bound by latency, not bandwidth
+    with FakeCTGServer(n_studies=LOOKUPS, faults=Faults(latency=0.02)) as server:
+        yield _warm(server, LOOKUPS)
+
+
+@pytest.mark.parametrize("stream_pages", [False, True], ids=["buffered", "streamed"])
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_search(stage, server, transport, stream_pages):
+    client = TRANSPORTS[transport](base_url=server.url, stream_pages=stream_pages)
+
+    def search():
+        for _ in client.search(limit=None):
+            pass
+
+    stage.run(search, SEARCH_STUDIES)
+    client.close()
+
+
+@pytest.mark.parametrize("project", [None, flatten_core], ids=["full", "projected"])
+def test_search_projection(stage, full_server, project):
+    client = CTG(client=CTGHttpxClient(base_url=full_server.url))
+
+    def search():
+        for _ in client.search(limit=None, project=project):
+            pass
+
+    stage.run(search, SEARCH_STUDIES)
+    client.close()
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_get_many(stage, slow_server, transport, workers):
+    client = TRANSPORTS[transport](base_url=slow_server.url)
+    ids = [f"NCT{i:08d}" for i in range(LOOKUPS)]
+
+    def lookups():
+        for _ in client.get_many(ids, batch_size=1, workers=workers):
+            pass
+
+    stage.run(lookups, LOOKUPS)
+    client.close()
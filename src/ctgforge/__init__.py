@@ -1,4 +1,4 @@
-from .ctg import CTG
+from .ctg import CTG, AsyncCTG
 from .query.fields import F
 
-__all__ = ["CTG", "F"]
+__all__ = ["CTG", "AsyncCTG", "F"]
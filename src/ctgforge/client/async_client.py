@@ -0,0 +1,297 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, Optional, Union
+
+import httpx
+
+from ctgforge.client.ctg_client import (
+    CTGClient,
+    CTGTransportError,
+    FetchResult,
+    RetryConfig,
+    backoff_delay,
+)
+from ctgforge.client.decode import Decoder, get_decoder
+from ctgforge.client.pagination import MAX_PAGE_SIZE, SearchCursor, SearchPager, TransferStats
+
+
+class CTGAsyncClient:
+    """
+    Asyncio-based thin HTTP transport for ClinicalTrials.gov v2, built on httpx.AsyncClient.
+
+    Mirrors the CTGClient API with coroutines:
+      - search() / resume(cursor) returning an async iterator of raw study dicts,
+        prefetching the next page while the current one is being consumed
+      - get(nct_id) / get_many(nct_ids) / count(query)
+      - at most `max_concurrency` requests in flight at any time
+      - non-blocking retry/backoff on transient failures / rate limits
+    """
+
+    BASE_URL = CTGClient.BASE_URL
+    SEARCH_PATH = CTGClient.SEARCH_PATH
+    STUDY_PATH = CTGClient.STUDY_PATH
+
+    DEFAULT_HEADERS = CTGClient.DEFAULT_HEADERS
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 30.0,
+        base_url: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+        retry: Optional[RetryConfig] = None,
+        max_concurrency: int = 8,
+        json_decoder: Optional[Union[str, Decoder]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self._retry = retry or RetryConfig()
+        self._max_concurrency = max_concurrency
+        self._decode = get_decoder(json_decoder)
+
+        self._headers = self.DEFAULT_HEADERS.copy()
+        if headers:
+            self._headers.update(headers)
+
+        self._client = client or httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(timeout),
+            headers=self._headers,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_concurrency),
+        )
+        self._owns_client = client is None
+
+        self.stats = TransferStats()
+
+        # Created lazily so that it binds to the running event loop.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def close(self) -> None:
+        """Close any underlying resources (e.g., HTTP client)."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "CTGAsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    # ------ public API ------
+
+    async def get(self, nct_id: str) -> dict[str, Any]:
+        """Fetch a single study by NCT ID."""
+        path = self.STUDY_PATH.format(nct_id=nct_id)
+        return await self._request_json("GET", path)
+
+    async def get_many(
+        self,
+        nct_ids: Iterable[str],
+        *,
+        batch_size: int = 100,
+    ) -> AsyncIterator[FetchResult]:
+        """
+        Fetch many studies by NCT ID, yielding results as they arrive (not in input order).
+
+        Same strategy as CTGClient.get_many(): `filter.ids` batch searches first, then
+        one STUDY_PATH request per ID the batches did not return. Concurrency is bounded
+        by `max_concurrency`; failures are reported per ID through FetchResult.error.
+
+        Args:
+            nct_ids: NCT IDs to fetch; duplicates are fetched once
+            batch_size: number of IDs per `filter.ids` search, capped at MAX_PAGE_SIZE;
+                1 disables batching
+        """
+        ids = list(dict.fromkeys(nct_id.strip().upper() for nct_id in nct_ids))
+        if not ids:
+            return
+        batch_size = min(batch_size, MAX_PAGE_SIZE)  # a batch is one page of results
+
+        pending: set[asyncio.Future] = set()
+        try:
+            if batch_size > 1:
+                for i in range(0, len(ids), batch_size):
+                    pending.add(asyncio.ensure_future(self._get_batch(ids[i : i + batch_size])))
+            else:
+                pending.update(asyncio.ensure_future(self._get_one(nct_id)) for nct_id in ids)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    result = fut.result()
+                    if isinstance(result, FetchResult):
+                        yield result
+                        continue
+
+                    found, missing = result
+                    for item in found:
+                        yield item
+                    pending.update(asyncio.ensure_future(self._get_one(n)) for n in missing)
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+    async def count(
+        self,
+        query: Optional[dict[str, Any]] = None,
+    ) -> int:
+        """
+        Count studies matching the query.
+
+        Args:
+            query: compiled query object as a dict of query parameters
+        """
+        params: dict[str, Any] = dict(query or {})
+
+        # Use a page size of 1 to minimize data transfer
+        params["pageSize"] = 1
+        params["countTotal"] = "true"
+
+        payload = await self._request_json("GET", self.SEARCH_PATH, params=params)
+
+        # The total count is included in the response's metadata
+        return payload.get("totalCount", 0)
+
+    def search(
+        self,
+        query: Optional[dict[str, Any]] = None,
+        *,
+        fields: Optional[list[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = 100,
+        sort: str = "LastUpdatePostDate",
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Search studies with pagination.
+
+        The request for page N+1 is started as soon as page N arrives, so network
+        latency overlaps with whatever the caller does with the yielded studies.
+
+        Args:
+            query: compiled query string
+            fields: list of fields to return
+            offset: number of records to skip, walked with ID-only pages
+            limit: maximum number of records to return, None for all of them
+            sort: sort order
+        """
+        cursor = SearchCursor.start(query, fields=fields, offset=offset, limit=limit, sort=sort)
+        return self.resume(cursor)
+
+    async def resume(self, cursor: SearchCursor) -> AsyncIterator[dict[str, Any]]:
+        """Continue a search from `cursor`, updating it in place as studies are yielded."""
+        pager = SearchPager(cursor, stats=self.stats)
+
+        def fetch_next() -> Optional[asyncio.Future]:
+            page_params = pager.next_params()
+            if page_params is None:
+                return None
+            return asyncio.ensure_future(
+                self._request_json("GET", self.SEARCH_PATH, params=page_params)
+            )
+
+        pending = fetch_next()
+        try:
+            while pending is not None:
+                payload = await pending
+                studies = pager.feed(payload)
+
+                # prefetch the next page (if any) before handing out this one
+                pending = fetch_next()
+                for s in studies:
+                    pager.advance()
+                    yield s
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    # ------ internal helpers ------
+
+    async def _get_one(self, nct_id: str) -> FetchResult:
+        try:
+            return FetchResult(nct_id, study=await self.get(nct_id))
+        except CTGTransportError as e:
+            return FetchResult(nct_id, error=e)
+
+    async def _get_batch(self, nct_ids: list[str]) -> tuple[list[FetchResult], list[str]]:
+        """Look up a batch of IDs with one search; returns (found, missing IDs)."""
+        params = {"filter.ids": ",".join(nct_ids), "pageSize": len(nct_ids)}
+        try:
+            payload = await self._request_json("GET", self.SEARCH_PATH, params=params)
+        except CTGTransportError:
+            return [], nct_ids
+
+        by_id = {}
+        for s in payload.get("studies") or []:
+            nct_id = s.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+            if nct_id:
+                by_id[nct_id.upper()] = s
+
+        found = [FetchResult(nct_id, study=by_id[nct_id]) for nct_id in nct_ids if nct_id in by_id]
+        missing = [nct_id for nct_id in nct_ids if nct_id not in by_id]
+        return found, missing
+
+    async def _request_json(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        json: Any = None,
+    ) -> dict[str, Any]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        last_exc: Optional[Exception] = None
+
+        # Convert dict-type params to httpx's QueryParams to keep "+" unescaped
+        str_params = []
+        if params is not None:
+            for k, v in params.items():
+                str_params.append(f"{k}={v}")
+        qp = httpx.QueryParams("&".join(str_params))
+
+        for attempt in range(self._retry.max_retries + 1):
+            try:
+                # hold a slot only while the request is in flight, not while backing off
+                async with self._semaphore:
+                    resp = await self._client.request(
+                        method,
+                        path,
+                        params=qp,
+                        json=json,
+                    )
+                self.stats.add_response(len(resp.content))
+                if resp.status_code in self._retry.retry_statuses:
+                    await self._sleep_backoff(attempt, resp.headers.get("Retry-After"))
+                    continue
+
+                resp.raise_for_status()
+                data = self._decode(resp.content)
+                if not isinstance(data, dict):
+                    raise CTGTransportError(f"Expected JSON object, got: {type(data)}")
+                return data
+
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                last_exc = e
+                await self._sleep_backoff(attempt, None)
+                continue
+            except httpx.HTTPStatusError as e:
+                # Non-retryable HTTP error
+                raise CTGTransportError(
+                    f"HTTP error: {e.response.status_code} calling {path}: {e.response.text[:300]}"
+                ) from e
+            except ValueError as e:
+                # JSON decoding errors
+                raise CTGTransportError(f"Invalid JSON response from {path}") from e
+
+        raise CTGTransportError(f"Exhausted retries calling {path}") from last_exc
+
+    async def _sleep_backoff(self, attempt: int, retry_after: Optional[Any]) -> None:
+        """Non-blocking counterpart of CTGClient._sleep_backoff()."""
+        delay = backoff_delay(self._retry, attempt, retry_after)
+        if delay is not None:
+            await asyncio.sleep(delay)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Union
+from urllib.parse import urlsplit
+
+
+def cache_key(
+    method: str, path: str, params: Optional[dict[str, Any]] = None, *, base_url: str = ""
+) -> str:
+    """
+    Canonical cache key of a request: parameter order and value types do not matter.
+    `base_url` keeps the responses of different servers apart in a shared cache; the
+    case of its scheme and host and a trailing slash do not matter.
+    """
+    canonical = json.dumps(
+        [
+            method.upper(),
+            _normalize_url(base_url),
+            path,
+            sorted((str(k), str(v)) for k, v in (params or {}).items()),
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    return parts._replace(
+        scheme=parts.scheme.lower(), netloc=parts.netloc.lower(), path=parts.path.rstrip("/")
+    ).geturl()
+
+
+class ResponseCache(ABC):
+    """
+    Abstract store of decoded JSON responses, consulted by CTGClient before any
+    request goes to the network.
+
+    Subclasses must implement _load(), _store() and clear().
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        value = self._load(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        self._store(key, value)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every cached response."""
+        raise NotImplementedError()
+
+    def close(self) -> None:  # noqa: B027 - nothing to release by default
+        """Release any underlying resources."""
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[dict[str, Any]]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        raise NotImplementedError()
+
+
+class SQLiteCache(ResponseCache):
+    """
+    Persistent response cache in a single SQLite file.
+
+    Payloads are stored as zlib-compressed JSON. Entries older than `ttl` seconds
+    are treated as misses and dropped; once the compressed payloads exceed
+    `max_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike] = "ctgforge-cache.sqlite",
+        *,
+        ttl: Optional[float] = 24 * 3600.0,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        compress_level: int = 6,
+    ) -> None:
+        super().__init__()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " payload BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the compressed payloads."""
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return row[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _load(self, key: str) -> Optional[dict[str, Any]]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+
+        return json.loads(zlib.decompress(payload))
+
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        payload = zlib.compress(
+            json.dumps(value, separators=(",", ":")).encode("utf-8"), self.compress_level
+        )
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            if self.max_bytes is not None:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
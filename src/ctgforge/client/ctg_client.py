@@ -1,9 +1,16 @@
 import random
 import time
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import Generator, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+from ctgforge.client.cache import ResponseCache, cache_key
+from ctgforge.client.decode import Decoder, StudyStream, get_decoder
+from ctgforge.client.hooks import ClientHooks, RequestEvent, as_hooks
+from ctgforge.client.pagination import MAX_PAGE_SIZE, SearchCursor, SearchPager, TransferStats
+from ctgforge.client.ratelimit import AdaptiveConcurrency, RateLimiter
 
 
 class CTGTransportError(RuntimeError):
@@ -19,17 +26,41 @@ class RetryConfig:
     retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
 
 
+@dataclass(frozen=True)
+class FetchResult:
+    """Outcome of fetching one study in a bulk lookup."""
+
+    nct_id: str
+    study: Optional[dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class CTGClient(ABC):
     """
     Abstract thin HTTP transport for ClinicalTrials.gov v2.
 
     Provides:
       - search() returning an iterator of raw study dicts
+      - resume(cursor) continuing a search from a persisted SearchCursor
       - get(nct_id) returning a raw study dict
-      - built-in pagination
+      - get_many(nct_ids) streaming raw study dicts in bulk
+      - built-in pagination, with pages sized from the requested limit
+      - transfer counters in `stats` (requests, bytes, records received/yielded)
       - retry/backoff on transient failures / rate limits
-
-    Subclasses must implement _request_json() and close().
+      - optional proactive rate limiting and AIMD concurrency control, shared with
+        other clients (see ctgforge.client.ratelimit)
+      - optional response cache (see ctgforge.client.cache) in front of the network
+      - instrumentation hooks for every HTTP attempt (see ctgforge.client.hooks and
+        ctgforge.client.metrics)
+      - JSON decoded with the fastest installed backend (see ctgforge.client.decode),
+        and optionally search pages parsed study by study as they download
+
+    Subclasses must implement _request_json() and close(), and _request_chunks()
+    to support `stream_pages`.
     """
 
     BASE_URL = "https://clinicaltrials.gov/api/v2"
@@ -44,11 +75,25 @@ class CTGClient(ABC):
     def __init__(
         self,
         *,
+        base_url: Optional[str] = None,
         headers: Optional[dict[str, str]] = None,
         retry: Optional[RetryConfig] = None,
         client: Optional[Any] = None,
+        cache: Optional[ResponseCache] = None,
+        json_decoder: Optional[Union[str, Decoder]] = None,
+        stream_pages: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        hooks: Optional[Union[ClientHooks, Sequence[ClientHooks]]] = None,
     ) -> None:
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
         self._retry = retry or RetryConfig()
+        self._cache = cache
+        self._decode = get_decoder(json_decoder)
+        self._stream_pages = stream_pages
+        self._rate_limiter = rate_limiter
+        self._concurrency = concurrency
+        self._hooks = as_hooks(hooks)
 
         self._headers = self.DEFAULT_HEADERS.copy()
         if headers:
@@ -57,6 +102,8 @@ class CTGClient(ABC):
         self._client = client
         self._owns_client = client is None
 
+        self.stats = TransferStats()
+
     @abstractmethod
     def close(self) -> None:
         """Close any underlying resources (e.g., HTTP client)."""
@@ -74,12 +121,75 @@ class CTGClient(ABC):
         """Perform an HTTP request and return the JSON response as a dict."""
         raise NotImplementedError()
 
+    def _request_chunks(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+    ) -> Generator[bytes, None, Optional[RequestEvent]]:
+        """
+        Perform an HTTP request and yield the response body as it arrives; returns the
+        RequestEvent of the successful attempt.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support stream_pages")
+
     # ------ public API ------
 
     def get(self, nct_id: str) -> dict[str, Any]:
         """Fetch a single study by NCT ID."""
         path = self.STUDY_PATH.format(nct_id=nct_id)
-        return self._request_json("GET", path)
+        return self._fetch_json(path)
+
+    def get_many(
+        self,
+        nct_ids: Iterable[str],
+        *,
+        batch_size: int = 100,
+        workers: int = 8,
+    ) -> Iterator[FetchResult]:
+        """
+        Fetch many studies by NCT ID, yielding results as they arrive (not in input order).
+
+        IDs are first looked up in batches through `filter.ids` searches; IDs that a
+        batch does not return (e.g. obsolete aliases) or batches that fail are retried
+        one by one through STUDY_PATH. All requests run on a bounded thread pool that
+        shares this client's connection pool. Failures are reported per ID through
+        FetchResult.error instead of aborting the whole lookup.
+
+        Args:
+            nct_ids: NCT IDs to fetch; duplicates are fetched once
+            batch_size: number of IDs per `filter.ids` search, capped at MAX_PAGE_SIZE;
+                1 disables batching
+            workers: maximum number of concurrent requests
+        """
+        ids = list(dict.fromkeys(nct_id.strip().upper() for nct_id in nct_ids))
+        if not ids:
+            return
+        batch_size = min(batch_size, MAX_PAGE_SIZE)  # a batch is one page of results
+
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        pending: set[Future] = set()
+        try:
+            if batch_size > 1:
+                for i in range(0, len(ids), batch_size):
+                    pending.add(pool.submit(self._get_batch, ids[i : i + batch_size]))
+            else:
+                pending.update(pool.submit(self._get_one, nct_id) for nct_id in ids)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    result = fut.result()
+                    if isinstance(result, FetchResult):
+                        yield result
+                        continue
+
+                    found, missing = result
+                    yield from found
+                    pending.update(pool.submit(self._get_one, nct_id) for nct_id in missing)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def count(
         self,
@@ -97,7 +207,7 @@ class CTGClient(ABC):
         params["pageSize"] = 1
         params["countTotal"] = "true"
 
-        payload = self._request_json("GET", self.SEARCH_PATH, params=params)
+        payload = self._fetch_json(self.SEARCH_PATH, params=params)
 
         # The total count is included in the response's metadata
         return payload.get("totalCount", 0)
@@ -108,7 +218,7 @@ class CTGClient(ABC):
         *,
         fields: Optional[list[str]] = None,
         offset: int = 0,
-        limit: int = 100,
+        limit: Optional[int] = 100,
         sort: str = "LastUpdatePostDate",
     ) -> Iterator[dict[str, Any]]:
         """
@@ -117,50 +227,167 @@ class CTGClient(ABC):
         Args:
             query: compiled query string
             fields: list of fields to return
-            offset: number of records to skip
-            limit: maximum number of records to return, up to 1000
+            offset: number of records to skip, walked with ID-only pages
+            limit: maximum number of records to return, None for all of them
             sort: sort order
-            extra_params: additional query parameters
         """
-        limit = min(limit, 1000)
-
-        params: dict[str, Any] = dict(query or {})
+        cursor = SearchCursor.start(query, fields=fields, offset=offset, limit=limit, sort=sort)
+        return self.resume(cursor)
 
-        if fields:
-            params["fields"] = ",".join(fields)
-
-        params["pageSize"] = 100
-        params["sort"] = sort
+    def resume(self, cursor: SearchCursor) -> Iterator[dict[str, Any]]:
+        """
+        Continue a search from `cursor`, updating it in place as studies are yielded.
 
-        yielded = 0
-        skipped = 0
-        next_token: Optional[str] = None
+        A cursor saved after processing a study resumes right after that study,
+        including after a CTGTransportError interrupted the previous run.
 
+        With `stream_pages` (and no cache), studies are yielded as they are parsed
+        from the response instead of once the whole page has been decoded.
+        """
+        pager = SearchPager(cursor, stats=self.stats)
+        stream = self._stream_pages and self._cache is None
         while True:
-            if next_token:
-                params["pageToken"] = next_token
-
-            payload = self._request_json("GET", self.SEARCH_PATH, params=params)
+            page_params = pager.next_params()
+            if page_params is None:
+                return
 
-            studies = payload.get("studies") or payload.get("StudyFieldsResponse", {}).get(
-                "StudyFields", []
-            )
+            if stream:
+                studies = pager.feed_stream(self._stream_page(self.SEARCH_PATH, page_params))
+            else:
+                studies = pager.feed(self._fetch_json(self.SEARCH_PATH, params=page_params))
             for s in studies:
-                if skipped < offset:
-                    skipped += 1
-                    continue
+                pager.advance()
                 yield s
-                yielded += 1
-                if limit is not None and yielded >= limit:
-                    return
-
-            next_token = payload.get("nextPageToken")
-            if not next_token:
-                return
 
     # ------ internal helpers ------
 
-    def _sleep_backoff(self, attempt: int, retry_after: Optional[Any]) -> None:
+    def _fetch_json(self, path: str, *, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """GET `path`, served from the response cache when one is configured."""
+        if self._cache is None:
+            return self._request_json("GET", path, params=params)
+
+        key = cache_key("GET", path, params, base_url=self.base_url)
+        data = self._cache.get(key)
+        if data is None:
+            data = self._request_json("GET", path, params=params)
+            self._cache.set(key, data)
+        return data
+
+    def _stream_page(
+        self, path: str, params: dict[str, Any]
+    ) -> Generator[dict[str, Any], None, dict[str, Any]]:
+        """Yield the studies of a search page as they arrive; returns the rest of the response."""
+        parser = StudyStream(self._decode)
+        chunks = self._request_chunks("GET", path, params=params)
+        decode_seconds = 0.0
+        n_studies = 0
+        try:
+            while True:
+                try:
+                    chunk = next(chunks)
+                except StopIteration as stop:
+                    event = stop.value
+                    break
+                start = time.perf_counter()
+                studies = parser.feed(chunk)
+                decode_seconds += time.perf_counter() - start
+                n_studies += len(studies)
+                yield from studies
+            start = time.perf_counter()
+            payload = parser.close()
+            decode_seconds += time.perf_counter() - start
+        except ValueError as e:
+            raise CTGTransportError(f"Invalid JSON response from {path}") from e
+        finally:
+            chunks.close()
+        if not isinstance(payload, dict):
+            raise CTGTransportError(f"Expected JSON object, got: {type(payload)}")
+        if event is not None:
+            event.decode_seconds = decode_seconds
+            event.studies = n_studies
+            self._hooks.decoded(event)
+        return payload
+
+    def _get_one(self, nct_id: str) -> FetchResult:
+        try:
+            return FetchResult(nct_id, study=self.get(nct_id))
+        except CTGTransportError as e:
+            return FetchResult(nct_id, error=e)
+
+    def _get_batch(self, nct_ids: list[str]) -> tuple[list[FetchResult], list[str]]:
+        """Look up a batch of IDs with one search; returns (found, missing IDs)."""
+        params = {"filter.ids": ",".join(nct_ids), "pageSize": len(nct_ids)}
+        try:
+            payload = self._fetch_json(self.SEARCH_PATH, params=params)
+        except CTGTransportError:
+            return [], nct_ids
+
+        by_id = {}
+        for s in payload.get("studies") or []:
+            nct_id = s.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+            if nct_id:
+                by_id[nct_id.upper()] = s
+
+        found = [FetchResult(nct_id, study=by_id[nct_id]) for nct_id in nct_ids if nct_id in by_id]
+        missing = [nct_id for nct_id in nct_ids if nct_id not in by_id]
+        return found, missing
+
+    def _before_request(self, event: RequestEvent) -> Optional[int]:
+        """
+        Wait for a concurrency slot and a rate-limiter token before sending a request.
+        Must be paired with _after_request(), which gets the returned ticket.
+        """
+        queued = time.perf_counter()
+        ticket = self._concurrency.acquire() if self._concurrency is not None else None
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        event.started = time.perf_counter()
+        event.queued = event.started - queued
+        self._hooks.request_start(event)
+        return ticket
+
+    def _after_request(
+        self, ticket: Optional[int], event: RequestEvent, response: Optional[Any]
+    ) -> None:
+        """
+        Report the outcome of a request to the limiters and, unless the body of a
+        streamed response is still to be read, to the hooks.
+
+        Args:
+            ticket: value returned by _before_request()
+            event: the attempt, with `error` set if it raised
+            response: HTTP response (with `status_code` and `headers`), None if none came
+        """
+        status = getattr(response, "status_code", None)
+        event.status = status
+        if response is None or not event.streamed:
+            self._end_request(event, 0 if response is None else len(response.content))
+        if self._concurrency is not None and ticket is not None:
+            throttled = status is None or status == 429 or status >= 500
+            self._concurrency.release(ticket, throttled=throttled)
+        if status == 429 and self._rate_limiter is not None:
+            delay = _parse_retry_after(response.headers.get("Retry-After"))
+            if delay is not None:
+                self._rate_limiter.pause(min(delay, self._retry.backoff_cap))
+
+    def _end_request(self, event: RequestEvent, nbytes: int) -> None:
+        event.nbytes = nbytes
+        event.elapsed = time.perf_counter() - event.started
+        self._hooks.request_end(event)
+
+    def _decode_json(self, event: RequestEvent, content: bytes) -> Any:
+        """Decode a response body, reporting the time taken to the hooks."""
+        start = time.perf_counter()
+        data = self._decode(content)
+        event.decode_seconds = time.perf_counter() - start
+        if isinstance(data, dict) and isinstance(data.get("studies"), list):
+            event.studies = len(data["studies"])
+        self._hooks.decoded(event)
+        return data
+
+    def _sleep_backoff(
+        self, attempt: int, retry_after: Optional[Any], event: Optional[RequestEvent] = None
+    ) -> None:
         """
         A simple exponential backoff with jitter strategy.
         Might be used in implementations of _request_json().
@@ -168,22 +395,45 @@ class CTGClient(ABC):
         Args:
             attempt: current retry attempt (0-based)
             retry_after: HTTP "Retry-After" header value from the last attempt
+            event: the failed attempt, reported to the hooks
         """
-        if attempt >= self._retry.max_retries:
-            return
+        delay = backoff_delay(self._retry, attempt, retry_after)
+        if delay is not None:
+            if event is not None:
+                self._hooks.retry(event, delay)
+            time.sleep(delay)
 
-        # honor Retry-After header if present
-        ra = None
-        if retry_after is not None:
-            try:
-                ra = float(retry_after)
-            except ValueError:
-                ra = None
 
-        if ra is not None:
-            time.sleep(min(ra, self._retry.backoff_cap))
-            return
+def backoff_delay(retry: RetryConfig, attempt: int, retry_after: Optional[Any]) -> Optional[float]:
+    """
+    Compute the delay before the next attempt, shared by sync and async transports.
 
-        base = min(self._retry.backoff_cap, self._retry.backoff_base * (2**attempt))
-        jitter = base * self._retry.jitter * (2 * random.random() - 1)
-        time.sleep(max(0.0, base + jitter))
+    Args:
+        retry: retry configuration
+        attempt: current retry attempt (0-based)
+        retry_after: HTTP "Retry-After" header value from the last attempt
+
+    Returns:
+        seconds to wait, or None if no more retries are left
+    """
+    if attempt >= retry.max_retries:
+        return None
+
+    # honor Retry-After header if present
+    ra = _parse_retry_after(retry_after)
+    if ra is not None:
+        return min(ra, retry.backoff_cap)
+
+    base = min(retry.backoff_cap, retry.backoff_base * (2**attempt))
+    jitter = base * retry.jitter * (2 * random.random() - 1)
+    return max(0.0, base + jitter)
+
+
+def _parse_retry_after(retry_after: Optional[Any]) -> Optional[float]:
+    """Seconds from a Retry-After header value, None if absent or not a number."""
+    if retry_after is None:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        return None
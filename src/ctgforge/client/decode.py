@@ -0,0 +1,193 @@
+import json
+from collections.abc import Callable
+from typing import Any, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: pip install ctgforge[json]
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Decoder = Callable[[bytes], Any]  # raises ValueError on invalid input
+
+
+def _msgspec_loads() -> Decoder:
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: bytes) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return loads
+
+
+_BACKENDS: dict[str, Callable[[], Optional[Decoder]]] = {
+    "orjson": lambda: orjson.loads if orjson is not None else None,
+    "msgspec": lambda: _msgspec_loads() if msgspec is not None else None,
+    "json": lambda: json.loads,
+}
+
+
+def available_decoders() -> list[str]:
+    """Names of the installed JSON backends, fastest first."""
+    return [name for name, make in _BACKENDS.items() if make() is not None]
+
+
+def get_decoder(decoder: Optional[Union[str, Decoder]] = None) -> Decoder:
+    """
+    A bytes -> object JSON decoder.
+
+    Args:
+        decoder: a backend name ("orjson", "msgspec" or "json"), a callable
+            returned as is, or None for the fastest installed backend
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is None:
+        decoder = available_decoders()[0]
+    if decoder not in _BACKENDS:
+        raise ValueError(f"Unknown JSON decoder: {decoder!r} (expected one of {list(_BACKENDS)})")
+
+    loads = _BACKENDS[decoder]()
+    if loads is None:
+        raise ValueError(f"JSON decoder {decoder!r} is not installed")
+    return loads
+
+
+# bracket byte -> +1 (open) / -1 (close), 0 for anything else
+_BRACKETS = np.zeros(256, dtype=np.int8)
+_BRACKETS[[ord("["), ord("{")]] = 1
+_BRACKETS[[ord("]"), ord("}")]] = -1
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+
+class StudyStream:
+    """
+    Incremental parser of a search response page: feed() it the body as bytes
+    arrive and it returns the items of the top-level "studies" array that are
+    complete so far, each decoded on its own. close() returns the rest of the
+    document (nextPageToken, totalCount, ...) with an empty "studies" list.
+
+    Only the study being received is buffered, plus the rest of the document,
+    so the first studies can be processed before the page has finished
+    downloading. Item boundaries are found by a vectorized scan of each chunk
+    for the brackets outside strings; the decoder only sees whole items.
+
+    Usage:
+        stream = StudyStream()
+        for chunk in chunks:
+            for study in stream.feed(chunk):
+                ...
+        payload = stream.close()
+    """
+
+    def __init__(self, decoder: Optional[Union[str, Decoder]] = None) -> None:
+        self._loads = get_decoder(decoder)
+        self._buf = bytearray()  # unconsumed bytes
+        self._head = bytearray()  # the document without the studies
+        self._depth = 0  # nesting depth at the end of _buf
+        self._in_string = 0  # whether the end of _buf is inside a string
+        self._backslashes = 0  # backslashes ending _buf
+        self._in_array = False
+        self._start: Optional[int] = None  # start of the current study in _buf
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Consume the next chunk of the body; returns the studies it completed."""
+        buf = self._buf
+        offset = len(buf)
+        buf += chunk
+        out = []
+        start = self._start
+        mark = 0  # start of the part of buf outside the array not yet in _head
+
+        for i, step, depth in self._scan(chunk):
+            pos = offset + i
+            if step > 0:
+                if self._in_array:
+                    if depth == 2:
+                        start = pos
+                elif depth == 1 and self._studies_key(buf[mark:pos]):
+                    self._head += buf[mark : pos + 1]
+                    self._in_array = True
+            elif self._in_array:
+                if depth == 3 and start is not None:
+                    out.append(self._loads(buf[start : pos + 1]))
+                    start = None
+                elif depth == 2:
+                    self._in_array = False
+                    mark = pos  # the closing bracket belongs to the head
+
+        # drop what has been consumed
+        if not self._in_array:
+            self._head += buf[mark:]
+            cut = len(buf)
+        else:
+            cut = len(buf) if start is None else start
+        del buf[:cut]
+        self._start = None if start is None else start - cut
+        return out
+
+    def close(self) -> Any:
+        """The document without its studies; raises ValueError if it is incomplete."""
+        if self._in_array or self._depth or self._in_string:
+            raise ValueError("Truncated JSON document")
+        return self._loads(self._head)
+
+    def _scan(self, chunk: bytes) -> list[tuple[int, int, int]]:
+        """
+        (position, +1/-1, depth before) of the brackets outside strings that
+        enter or leave depth 2 or less, i.e. the top-level object and the items
+        of its arrays.
+        """
+        a = np.frombuffer(chunk, dtype=np.uint8)
+        quotes = np.flatnonzero(a == _QUOTE)
+        backslash = a == _BACKSLASH
+        if self._backslashes or backslash.any():
+            # a quote is escaped by an odd run of backslashes before it, which
+            # may have started in the previous chunk
+            idx = np.arange(len(a))
+            last = np.maximum.accumulate(np.where(backslash, -1, idx))
+            before = np.concatenate(([-1], last))[quotes]  # last non-backslash before each quote
+            runs = quotes - 1 - before + np.where(before < 0, self._backslashes, 0)
+            quotes = quotes[runs % 2 == 0]
+            tail = len(a) - 1 - last[-1]
+            self._backslashes = tail + (self._backslashes if last[-1] < 0 else 0)
+        else:
+            self._backslashes = 0
+
+        steps = _BRACKETS[a]
+        brackets = np.flatnonzero(steps)
+        outside = (np.searchsorted(quotes, brackets) + self._in_string) % 2 == 0
+        brackets = brackets[outside]
+        steps = steps[brackets].astype(np.int64)
+        self._in_string ^= len(quotes) & 1
+        if not len(brackets):
+            return []
+
+        after = self._depth + np.cumsum(steps)
+        if after.min() < 0:
+            raise ValueError("Unbalanced brackets in JSON document")
+        before = after - steps
+        self._depth = int(after[-1])
+        shallow = np.minimum(before, after) <= 2
+        return list(
+            zip(
+                brackets[shallow].tolist(),
+                steps[shallow].tolist(),
+                before[shallow].tolist(),
+            )
+        )
+
+    def _studies_key(self, segment: bytes) -> bool:
+        """Whether an array opening after `segment` is the value of the top-level "studies" key."""
+        before = (self._head + segment).rstrip()
+        return before.endswith(b":") and before[:-1].rstrip().endswith(b'"studies"')
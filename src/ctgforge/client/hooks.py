@@ -0,0 +1,80 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+
+@dataclass
+class RequestEvent:
+    """
+    One HTTP attempt of a CTGClient, passed to every ClientHooks method concerning
+    it. Fields are filled in as the attempt progresses.
+    """
+
+    method: str
+    path: str
+    params: Optional[dict[str, Any]]
+    attempt: int  # 0 for the first try, then 1, 2, ... for retries
+    queued: float = 0.0  # seconds spent waiting for the rate limiter / a concurrency slot
+    started: float = 0.0  # time.perf_counter() when the request was sent
+    elapsed: Optional[float] = None  # seconds from sending to the end of the body
+    status: Optional[int] = None  # None if no response came
+    nbytes: int = 0  # body bytes received
+    error: Optional[BaseException] = None  # transport error, if the attempt raised one
+    streamed: bool = False  # body parsed while it downloaded (`stream_pages`)
+    decode_seconds: Optional[float] = None
+    studies: Optional[int] = None  # studies in the response, for search pages
+
+
+class ClientHooks:
+    """
+    Receives the transport events of a CTGClient; pass instances as `hooks`.
+
+    Subclasses override what they need. Methods are called on the thread making
+    the request, while it waits, so they should be cheap and thread-safe. For one
+    attempt the order is request_start(), request_end(), then retry() if it is
+    retried or decoded() once the body has been parsed.
+    """
+
+    def request_start(self, event: RequestEvent) -> None:
+        """The request is about to be sent (limiter waits are over)."""
+
+    def request_end(self, event: RequestEvent) -> None:
+        """The body was received, or the attempt failed (`event.error`)."""
+
+    def retry(self, event: RequestEvent, delay: float) -> None:
+        """The attempt failed and is retried after sleeping `delay` seconds."""
+
+    def decoded(self, event: RequestEvent) -> None:
+        """The JSON body was parsed in `event.decode_seconds`."""
+
+
+class HookList(ClientHooks):
+    """Forwards every event to several hooks, in order."""
+
+    def __init__(self, hooks: Sequence[ClientHooks]) -> None:
+        self.hooks = list(hooks)
+
+    def request_start(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            hook.request_start(event)
+
+    def request_end(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            hook.request_end(event)
+
+    def retry(self, event: RequestEvent, delay: float) -> None:
+        for hook in self.hooks:
+            hook.retry(event, delay)
+
+    def decoded(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            hook.decoded(event)
+
+
+def as_hooks(hooks: Optional[Union[ClientHooks, Sequence[ClientHooks]]]) -> ClientHooks:
+    """A single ClientHooks for the `hooks` argument of the clients."""
+    if hooks is None:
+        return ClientHooks()
+    if isinstance(hooks, ClientHooks):
+        return hooks
+    return HookList(hooks)
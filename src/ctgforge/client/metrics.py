@@ -0,0 +1,205 @@
+import bisect
+import threading
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from ctgforge.client.hooks import ClientHooks, RequestEvent
+
+# upper bounds in seconds, from 1 ms to 1 min
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+PAGE_BUCKETS = (0, 1, 10, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """
+    Counts of observations in fixed buckets, each counting the values up to its
+    upper bound (plus one overflow bucket), with count/sum/min/max. Quantiles are
+    interpolated within a bucket, so they are as precise as the bucket bounds.
+    Not thread-safe on its own.
+    """
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("bucket bounds must be strictly increasing")
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate `q`-quantile (0 <= q <= 1) of the observed values."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+        assert self.min is not None and self.max is not None
+
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = self.bounds[i - 1] if i > 0 else self.min
+                hi = self.bounds[i] if i < len(self.bounds) else self.max
+                lo, hi = max(lo, self.min), min(hi, self.max)
+                return lo + (hi - lo) * max(0.0, rank - seen) / n
+            seen += n
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                **{str(b): n for b, n in zip(self.bounds, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class MetricsCollector(ClientHooks):
+    """
+    In-memory transport metrics, collected as client hooks.
+
+    Usage:
+        metrics = MetricsCollector()
+        client = CTG(client=CTGHttpxClient(hooks=metrics))
+        ...
+        print(metrics.report())
+
+    `latency` times each attempt from sending to the end of its body, `queued` the
+    wait for the rate limiter and concurrency slots, `decode` the JSON parsing;
+    `page_sizes` counts the studies per search page.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._lock = threading.Lock()
+        self._latency_buckets = tuple(latency_buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.in_flight = 0
+            self.statuses: Counter[int] = Counter()
+            self.errors: Counter[str] = Counter()  # transport errors by exception type
+            self.retries = 0
+            self.backoff_seconds = 0.0
+            self.bytes_received = 0
+            self.studies_received = 0
+            self.latency = Histogram(self._latency_buckets)
+            self.queued = Histogram(self._latency_buckets)
+            self.decode = Histogram(self._latency_buckets)
+            self.page_sizes = Histogram(PAGE_BUCKETS)
+
+    # ------ hooks ------
+
+    def request_start(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.queued.observe(event.queued)
+
+    def request_end(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if event.status is not None:
+                self.statuses[event.status] += 1
+            if event.error is not None:
+                self.errors[type(event.error).__name__] += 1
+            self.bytes_received += event.nbytes
+            if event.elapsed is not None:
+                self.latency.observe(event.elapsed)
+
+    def retry(self, event: RequestEvent, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += delay
+
+    def decoded(self, event: RequestEvent) -> None:
+        with self._lock:
+            if event.decode_seconds is not None:
+                self.decode.observe(event.decode_seconds)
+            if event.studies is not None:
+                self.studies_received += event.studies
+                self.page_sizes.observe(event.studies)
+
+    # ------ reporting ------
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current values as plain data, e.g. for JSON."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "in_flight": self.in_flight,
+                "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+                "errors": dict(self.errors),
+                "retries": self.retries,
+                "backoff_seconds": self.backoff_seconds,
+                "bytes_received": self.bytes_received,
+                "studies_received": self.studies_received,
+                "latency": self.latency.to_dict(),
+                "queued": self.queued.to_dict(),
+                "decode": self.decode.to_dict(),
+                "page_sizes": self.page_sizes.to_dict(),
+            }
+
+    def report(self) -> str:
+        """Human-readable summary."""
+        snap = self.snapshot()
+        statuses = ", ".join(f"{k}: {v}" for k, v in snap["statuses"].items()) or "-"
+        errors = ", ".join(f"{k}: {v}" for k, v in snap["errors"].items()) or "-"
+        lines = [
+            f"requests          {snap['requests']} (statuses {statuses}; errors {errors})",
+            f"retries           {snap['retries']} ({snap['backoff_seconds']:.2f} s backing off)",
+            f"received          {snap['bytes_received'] / 2**20:.1f} MiB, "
+            f"{snap['studies_received']} studies",
+            "",
+            f"{'':<18}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}",
+        ]
+        for name in ("latency", "queued", "decode"):
+            hist = getattr(self, name)
+            lines.append(f"{name + ' (ms)':<18}{hist.count:>8}" + _row(hist, 1000))
+        lines.append(
+            f"{'studies per page':<18}{self.page_sizes.count:>8}" + _row(self.page_sizes, 1)
+        )
+        return "\n".join(lines)
+
+
+def _row(hist: Histogram, scale: float) -> str:
+    values = (hist.mean, hist.quantile(0.5), hist.quantile(0.9), hist.quantile(0.99), hist.max)
+    return "".join(f"{'-':>10}" if v is None else f"{v * scale:>10.1f}" for v in values)
@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Any, Optional
+
+from ctgforge.client.hooks import ClientHooks, RequestEvent
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - exercised when opentelemetry is not installed
+    trace = None  # type: ignore[assignment]
+
+
+class OpenTelemetryHooks(ClientHooks):
+    """
+    Emits OpenTelemetry spans for the transport events of a client: a CLIENT span
+    per HTTP attempt ("GET /studies"), a "backoff" span covering each retry sleep
+    and a "decode" span for each JSON parse. Spans go to `tracer`, by default the
+    "ctgforge" tracer of the global tracer provider.
+
+    A no-op when opentelemetry-api is not installed (`pip install ctgforge[otel]`).
+    """
+
+    def __init__(self, tracer: Optional[Any] = None) -> None:
+        if tracer is None and trace is not None:
+            tracer = trace.get_tracer("ctgforge")
+        self._tracer = tracer
+        self._spans: dict[int, Any] = {}  # open request spans by id(event)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._tracer is not None
+
+    def request_start(self, event: RequestEvent) -> None:
+        if self._tracer is None:
+            return
+        span = self._tracer.start_span(
+            f"{event.method} {event.path}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": event.method,
+                "url.path": event.path,
+                "http.request.resend_count": event.attempt,
+                "ctgforge.queued_s": event.queued,
+            },
+        )
+        with self._lock:
+            self._spans[id(event)] = span
+
+    def request_end(self, event: RequestEvent) -> None:
+        with self._lock:
+            span = self._spans.pop(id(event), None)
+        if span is None:
+            return
+        if event.status is not None:
+            span.set_attribute("http.response.status_code", event.status)
+        span.set_attribute("http.response.body.size", event.nbytes)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, type(event.error).__name__))
+        elif event.status is not None and event.status >= 400:
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end()
+
+    def retry(self, event: RequestEvent, delay: float) -> None:
+        if self._tracer is None:
+            return
+        start = time.time_ns()
+        self._emit(
+            "backoff",
+            start,
+            start + int(delay * 1e9),
+            {"url.path": event.path, "http.request.resend_count": event.attempt + 1},
+        )
+
+    def decoded(self, event: RequestEvent) -> None:
+        if self._tracer is None or event.decode_seconds is None:
+            return
+        end = time.time_ns()
+        attributes = {"url.path": event.path, "http.response.body.size": event.nbytes}
+        if event.studies is not None:
+            attributes["ctgforge.studies"] = event.studies
+        self._emit("decode", end - int(event.decode_seconds * 1e9), end, attributes)
+
+    def _emit(self, name: str, start: int, end: int, attributes: dict[str, Any]) -> None:
+        span = self._tracer.start_span(name, start_time=start, attributes=attributes)
+        span.end(end_time=end)
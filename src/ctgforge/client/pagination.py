@@ -0,0 +1,331 @@
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Generator, Iterator
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional, Union
+
+MAX_PAGE_SIZE = 1000  # largest pageSize accepted by the v2 API
+
+
+@dataclass
+class TransferStats:
+    """
+    Running counters of what a client transferred versus what it handed back to the caller.
+
+    `records_received - records_yielded` is what was downloaded for nothing; pages that
+    are only walked to reach an offset are requested with IDs only and are not counted
+    as received records.
+    """
+
+    requests: int = 0
+    bytes_received: int = 0
+    records_received: int = 0
+    records_yielded: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_response(self, nbytes: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += nbytes
+
+    def add_records(self, received: int, yielded: int) -> None:
+        with self._lock:
+            self.records_received += received
+            self.records_yielded += yielded
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.bytes_received = 0
+            self.records_received = 0
+            self.records_yielded = 0
+
+
+def page_studies(payload: dict[str, Any]) -> list[dict[str, Any]]:
+    """Extract the list of studies from a search response page."""
+    return payload.get("studies") or payload.get("StudyFieldsResponse", {}).get("StudyFields", [])
+
+
+@dataclass
+class SearchCursor:
+    """
+    Serializable position of a search, updated in place while results are consumed.
+
+    Persist it (`save`/`to_json`) after processing records and hand it back to
+    `resume()` to continue a harvest after a crash or retry exhaustion instead of
+    restarting from page one. Only the page being consumed is re-requested on
+    resume; records of it that were already yielded are dropped.
+    """
+
+    params: dict[str, Any]
+    limit: Optional[int] = None  # None walks nextPageToken to the end
+    skip: int = 0  # records still to skip before the first yielded one
+    page_token: Optional[str] = None  # token of the page being consumed, None for the first page
+    page_size: Optional[int] = None  # pageSize that page was requested with
+    page_offset: int = 0  # records of that page already yielded
+    yielded: int = 0
+    exhausted: bool = False  # the server has no more results
+
+    @classmethod
+    def start(
+        cls,
+        query: Optional[dict[str, Any]] = None,
+        *,
+        fields: Optional[list[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "LastUpdatePostDate",
+    ) -> "SearchCursor":
+        """Create a cursor positioned at the beginning of a search."""
+        if offset < 0:
+            raise ValueError("offset must be >= 0")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be >= 0")
+
+        params: dict[str, Any] = dict(query or {})
+        if fields:
+            params["fields"] = ",".join(fields)
+        params["sort"] = sort
+
+        return cls(params=params, limit=limit, skip=offset)
+
+    @property
+    def done(self) -> bool:
+        return self.exhausted or (self.limit is not None and self.yielded >= self.limit)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SearchCursor":
+        return cls(**data)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> "SearchCursor":
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Atomically write the cursor to `path` as JSON."""
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "SearchCursor":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_json(f.read())
+
+
+@dataclass
+class _Page:
+    token: Optional[str]
+    size: int
+    start: int  # records dropped from the head of the page when resuming mid-page
+    total: int  # records in the page
+    count: int  # records handed out from the page
+    next_token: Optional[str]
+    consumed: int = 0
+    streaming: bool = False  # still being received: total, count and next_token may grow
+
+
+class SearchPager:
+    """
+    Plans the page requests of one search; performs no I/O itself so that the sync
+    and async clients share it.
+
+    The v2 API has no offset parameter, only opaque `pageToken`s, so an offset is
+    reached by walking pages. Those pages are requested with `fields=NCTId` and a
+    pageSize that lands exactly on the offset, so no full study document is
+    downloaded just to be thrown away. Data pages are then sized from the number
+    of records still wanted (up to MAX_PAGE_SIZE) instead of a fixed 100.
+
+    Requests may run ahead of consumption (e.g. prefetching); the cursor only
+    moves when the caller reports a record as handed out through `advance()`.
+
+    Usage:
+        pager = SearchPager(cursor)
+        while (page_params := pager.next_params()) is not None:
+            for study in pager.feed(request(page_params)):
+                pager.advance()
+                yield study
+    """
+
+    SKIP_FIELDS = "NCTId"
+
+    def __init__(self, cursor: SearchCursor, *, stats: Optional[TransferStats] = None) -> None:
+        self.cursor = cursor
+        self._stats = stats
+
+        # request-side state, which may be ahead of the cursor
+        self._token = cursor.page_token
+        self._skip = cursor.skip
+        self._resume_offset = cursor.page_offset
+        self._resume_size = cursor.page_size if cursor.page_offset else None
+        self._planned = cursor.yielded
+        self._done = cursor.done
+
+        self._pages: deque[_Page] = deque()
+        self._last: tuple[Optional[str], int, bool] = (None, 0, False)
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def next_params(self) -> Optional[dict[str, Any]]:
+        """Query params of the next page to request, or None when the search is complete."""
+        if self._done:
+            return None
+
+        params = dict(self.cursor.params)
+        skipping = self._skip > 0
+        if skipping:
+            params["fields"] = self.SKIP_FIELDS
+            size = min(self._skip, MAX_PAGE_SIZE)
+        elif self._resume_size is not None:
+            # same page boundaries as when the cursor was saved
+            size, self._resume_size = self._resume_size, None
+        else:
+            remaining = self._remaining()
+            size = MAX_PAGE_SIZE if remaining is None else min(remaining, MAX_PAGE_SIZE)
+
+        params["pageSize"] = size
+        if self._token:
+            params["pageToken"] = self._token
+
+        self._last = (self._token, size, skipping)
+        return params
+
+    def feed(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        """Consume the response of the last planned page; returns the studies to yield."""
+        studies = page_studies(payload)
+        next_token = payload.get("nextPageToken")
+        token, size, skipping = self._last
+        self._token = next_token
+
+        if skipping:
+            # the server may return fewer records than asked for
+            self._skip = max(0, self._skip - len(studies))
+            self.cursor.skip = self._skip
+            self.cursor.page_token = next_token
+            if not next_token or not studies:
+                self.cursor.exhausted = True
+                self._done = True
+            return []
+
+        start, self._resume_offset = self._resume_offset, 0
+        out = studies[start:]
+        remaining = self._remaining()
+        if remaining is not None:
+            out = out[:remaining]
+        self._planned += len(out)
+
+        if self._stats is not None:
+            self._stats.add_records(len(studies), 0)
+
+        self._pages.append(_Page(token, size, start, len(studies), len(out), next_token))
+        self._settle()
+
+        remaining = self._remaining()
+        if not next_token or not studies or (remaining is not None and remaining <= 0):
+            self._done = True
+        return out
+
+    def feed_stream(
+        self, page: Generator[dict[str, Any], None, dict[str, Any]]
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streaming counterpart of feed(): `page` yields the studies of the last planned
+        page as they are received and returns the rest of the response. Studies to
+        hand out are passed through as they come, and the page is settled once `page`
+        is exhausted, i.e. when the caller asks for the study after its last one.
+        """
+        token, size, skipping = self._last
+        try:
+            if skipping:
+                studies: list[dict[str, Any]] = []
+                payload = _drain(page, studies)
+                self.feed({**payload, "studies": studies})
+                return
+
+            start, self._resume_offset = self._resume_offset, 0
+            record = _Page(token, size, start, 0, 0, None, streaming=True)
+            self._pages.append(record)
+            while True:
+                try:
+                    study = next(page)
+                except StopIteration as stop:
+                    payload = stop.value
+                    break
+                record.total += 1
+                remaining = self._remaining()
+                if record.total <= start or (remaining is not None and remaining <= 0):
+                    continue  # received but not handed out, as in feed()
+                record.count += 1
+                self._planned += 1
+                yield study
+        finally:
+            page.close()
+
+        next_token = payload.get("nextPageToken")
+        self._token = record.next_token = next_token
+        record.streaming = False
+        if self._stats is not None:
+            self._stats.add_records(record.total, 0)
+        self._settle()
+
+        remaining = self._remaining()
+        if not next_token or not record.total or (remaining is not None and remaining <= 0):
+            self._done = True
+
+    def advance(self) -> None:
+        """Record that the next study returned by `feed()` was handed out to the caller."""
+        page = self._pages[0]
+        page.consumed += 1
+
+        cursor = self.cursor
+        cursor.yielded += 1
+        cursor.page_token = page.token
+        cursor.page_size = page.size
+        cursor.page_offset = page.start + page.consumed
+
+        if self._stats is not None:
+            self._stats.add_records(0, 1)
+        self._settle()
+
+    def _remaining(self) -> Optional[int]:
+        if self.cursor.limit is None:
+            return None
+        return self.cursor.limit - self._planned
+
+    def _settle(self) -> None:
+        """Move the cursor past pages whose records have all been handed out."""
+        while self._pages and self._pages[0].consumed >= self._pages[0].count:
+            page = self._pages[0]
+            if page.streaming:
+                return
+            if page.start + page.count < page.total:
+                # truncated by the limit: keep the cursor inside this page
+                return
+
+            self._pages.popleft()
+            cursor = self.cursor
+            cursor.page_size = None
+            cursor.page_offset = 0
+            cursor.page_token = page.next_token
+            if not page.next_token or not page.total:
+                cursor.exhausted = True
+
+
+def _drain(page: Generator[Any, None, Any], items: list[Any]) -> Any:
+    """Collect what `page` yields into `items` and return its return value."""
+    while True:
+        try:
+            items.append(next(page))
+        except StopIteration as stop:
+            return stop.value
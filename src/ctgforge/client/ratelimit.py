@@ -0,0 +1,236 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+
+class RateLimiter(ABC):
+    """
+    Token bucket consulted by CTGClient before each request: `rate` requests per
+    second on average, at most `burst` at once. One limiter can be shared by any
+    number of clients and threads.
+
+    After a 429, the client pauses the bucket for the Retry-After delay, so every
+    client sharing it holds off instead of each collecting its own 429.
+
+    Subclasses must implement _take() and _pause_until().
+    """
+
+    def __init__(self, rate: float, *, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.acquired = 0
+        self.waited = 0.0  # seconds spent waiting for tokens
+        self._counter_lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self._take()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        with self._counter_lock:
+            self.acquired += 1
+            self.waited += waited
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds`, e.g. after a 429 with Retry-After."""
+        if seconds > 0:
+            self._pause_until(time.time() + seconds)
+
+    def close(self) -> None:  # noqa: B027 - nothing to release by default
+        """Release any underlying resources."""
+
+    @abstractmethod
+    def _take(self) -> float:
+        """Take a token if one is available and return 0, else return the seconds to wait."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _pause_until(self, until: float) -> None:
+        raise NotImplementedError()
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+
+    def _wait_for(self, tokens: float) -> float:
+        return (1.0 - tokens) / self.rate
+
+
+class TokenBucket(RateLimiter):
+    """In-process token bucket, shared by the threads of one process."""
+
+    def __init__(self, rate: float, *, burst: Optional[float] = None) -> None:
+        super().__init__(rate, burst=burst)
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._paused_until = 0.0
+
+    def _take(self) -> float:
+        with self._lock:
+            now = time.time()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = self._refill(self._tokens, self._updated, now)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return self._wait_for(self._tokens)
+
+    def _pause_until(self, until: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, until)
+
+
+class SQLiteTokenBucket(RateLimiter):
+    """
+    Token bucket kept in a SQLite file, shared by every process that opens the
+    same `path` and `name`, e.g. several harvest jobs behind one egress IP.
+
+    Each token is taken in an immediate transaction, so the file lock serializes
+    the processes. The state uses wall-clock time; `rate` and `burst` are those
+    of the process taking the token, so give every process the same values.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike] = "ctgforge-ratelimit.sqlite",
+        rate: float = 10.0,
+        *,
+        burst: Optional[float] = None,
+        name: str = "default",
+    ) -> None:
+        super().__init__(rate, burst=burst)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.fspath(path), timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " name TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " paused_until REAL NOT NULL)"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _take(self) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                tokens, updated, paused_until = self._state(now)
+                if now < paused_until:
+                    return paused_until - now
+                tokens = self._refill(tokens, updated, now)
+                wait = 0.0 if tokens >= 1 else self._wait_for(tokens)
+                if not wait:
+                    tokens -= 1
+                self._conn.execute(
+                    "UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?",
+                    (tokens, now, self.name),
+                )
+                return wait
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _pause_until(self, until: float) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._state(time.time())
+                self._conn.execute(
+                    "UPDATE buckets SET paused_until = MAX(paused_until, ?) WHERE name = ?",
+                    (until, self.name),
+                )
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _state(self, now: float) -> tuple[float, float, float]:
+        row = self._conn.execute(
+            "SELECT tokens, updated, paused_until FROM buckets WHERE name = ?", (self.name,)
+        ).fetchone()
+        if row is None:
+            row = (self.burst, now, 0.0)
+            self._conn.execute("INSERT INTO buckets VALUES (?, ?, ?, ?)", (self.name, *row))
+        return row
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the number of requests in flight, shared by the clients and
+    threads that use it.
+
+    Every successful request raises the limit by `increase / limit` (about
+    `increase` per limit's worth of requests); a 429, 5xx or connection error
+    multiplies it by `decrease`. Requests that were already in flight when the
+    limit was cut do not cut it again, so one burst of failures counts once.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        *,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial <= max_limit")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+
+        self.in_flight = 0
+        self.throttled = 0  # requests that failed with 429/5xx or a connection error
+        self.decreases = 0
+
+        self._cond = threading.Condition()
+        self._started = 0  # requests started so far; the ticket of each request
+        self._cut_at = 0  # requests started before the last decrease don't cut again
+
+    def acquire(self) -> int:
+        """Block until fewer than `limit` requests are in flight; returns a ticket for release()."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self._started += 1
+            return self._started
+
+    def release(self, ticket: int, *, throttled: bool) -> None:
+        """Record the outcome of the request that acquire() returned `ticket` for."""
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                if ticket > self._cut_at:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._cut_at = self._started
+                    self.decreases += 1
+            else:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self._cond.notify_all()
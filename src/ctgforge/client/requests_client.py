@@ -1,8 +1,15 @@
-from typing import Any, Optional
+from collections.abc import Generator, Sequence
+from typing import Any, Optional, Union
 
 import requests
 
+from ctgforge.client.cache import ResponseCache
 from ctgforge.client.ctg_client import CTGClient, CTGTransportError, RetryConfig
+from ctgforge.client.decode import Decoder
+from ctgforge.client.hooks import ClientHooks, RequestEvent
+from ctgforge.client.ratelimit import AdaptiveConcurrency, RateLimiter
+
+CHUNK_SIZE = 64 * 1024  # bytes read at a time from streamed responses
 
 
 class CTGRequestsClient(CTGClient):
@@ -14,14 +21,28 @@ class CTGRequestsClient(CTGClient):
         self,
         *,
         timeout: float = 30.0,
+        base_url: Optional[str] = None,
         headers: Optional[dict[str, str]] = None,
         retry: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        json_decoder: Optional[Union[str, Decoder]] = None,
+        stream_pages: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        hooks: Optional[Union[ClientHooks, Sequence[ClientHooks]]] = None,
         client: Optional[requests.Session] = None,
     ) -> None:
         super().__init__(
+            base_url=base_url,
             headers=headers,
             retry=retry,
             client=client,
+            cache=cache,
+            json_decoder=json_decoder,
+            stream_pages=stream_pages,
+            rate_limiter=rate_limiter,
+            concurrency=concurrency,
+            hooks=hooks,
         )
 
         self._client = client or requests.Session()
@@ -44,35 +65,26 @@ class CTGRequestsClient(CTGClient):
         json: Any = None,
     ) -> dict[str, Any]:
         last_exc: Optional[Exception] = None
-
-        # Convert dict-type params to requests's QueryParams to keep "+" unescaped
-        str_params = []
-        if params is not None:
-            for k, v in params.items():
-                str_params.append(f"{k}={v}")
-        qp = "&".join(str_params)
+        qp = _query_params(params)
 
         for attempt in range(self._retry.max_retries + 1):
+            event = RequestEvent(method, path, params, attempt)
             try:
-                resp = self._client.request(
-                    method,
-                    self.BASE_URL + path,
-                    params=qp,
-                    json=json,
-                )
+                resp = self._send(event, method, path, params=qp, json=json)
+                self.stats.add_response(len(resp.content))
                 if resp.status_code in self._retry.retry_statuses:
-                    self._sleep_backoff(attempt, resp.headers.get("Retry-After"))
+                    self._sleep_backoff(attempt, resp.headers.get("Retry-After"), event)
                     continue
 
                 resp.raise_for_status()
-                data = resp.json()
+                data = self._decode_json(event, resp.content)
                 if not isinstance(data, dict):
                     raise CTGTransportError(f"Expected JSON object, got: {type(data)}")
                 return data
 
             except (requests.Timeout, requests.ConnectionError) as e:
                 last_exc = e
-                self._sleep_backoff(attempt, None)
+                self._sleep_backoff(attempt, None, event)
                 continue
             except requests.HTTPError as e:
                 # Non-retryable HTTP error
@@ -84,3 +96,87 @@ class CTGRequestsClient(CTGClient):
                 raise CTGTransportError(f"Invalid JSON response from {path}") from e
 
         raise CTGTransportError(f"Exhausted retries calling {path}") from last_exc
+
+    def _request_chunks(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+    ) -> Generator[bytes, None, RequestEvent]:
+        resp, event = self._open_stream(method, path, params)
+        nbytes = 0
+        try:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                nbytes += len(chunk)
+                yield chunk
+        except requests.RequestException as e:
+            event.error = e
+            raise CTGTransportError(f"Connection lost while reading {path}") from e
+        finally:
+            resp.close()
+            self.stats.add_response(nbytes)
+            self._end_request(event, nbytes)
+        return event
+
+    def _send(
+        self, event: RequestEvent, method: str, path: str, **kwargs: Any
+    ) -> requests.Response:
+        ticket = self._before_request(event)
+        resp = None
+        try:
+            resp = self._client.request(method, self.base_url + path, **kwargs)
+            return resp
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            self._after_request(ticket, event, resp)
+
+    def _open_stream(
+        self, method: str, path: str, params: Optional[dict[str, Any]]
+    ) -> tuple[requests.Response, RequestEvent]:
+        """
+        Send a request with retries; returns the response with its body still unread,
+        and the attempt that got it.
+        """
+        last_exc: Optional[Exception] = None
+        qp = _query_params(params)
+
+        for attempt in range(self._retry.max_retries + 1):
+            event = RequestEvent(method, path, params, attempt, streamed=True)
+            try:
+                resp = self._send(event, method, path, params=qp, stream=True)
+                if not resp.ok:
+                    nbytes = 0
+                    try:
+                        nbytes = len(resp.content)
+                    finally:
+                        resp.close()
+                        self.stats.add_response(nbytes)
+                        self._end_request(event, nbytes)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                last_exc = e
+                self._sleep_backoff(attempt, None, event)
+                continue
+
+            if resp.status_code in self._retry.retry_statuses:
+                self._sleep_backoff(attempt, resp.headers.get("Retry-After"), event)
+                continue
+            if not resp.ok:
+                # Non-retryable HTTP error
+                raise CTGTransportError(
+                    f"HTTP error: {resp.status_code} calling {path}: {resp.text[:300]}"
+                )
+            return resp, event
+
+        raise CTGTransportError(f"Exhausted retries calling {path}") from last_exc
+
+
+def _query_params(params: Optional[dict[str, Any]]) -> str:
+    # Convert dict-type params to requests's QueryParams to keep "+" unescaped
+    str_params = []
+    if params is not None:
+        for k, v in params.items():
+            str_params.append(f"{k}={v}")
+    return "&".join(str_params)
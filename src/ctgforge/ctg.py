@@ -1,12 +1,30 @@
-from collections.abc import Iterator
-from typing import Any, Optional
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from typing import Any, Optional, Union
 
-from .client.ctg_client import CTGClient
+from .client.async_client import CTGAsyncClient
+from .client.ctg_client import CTGClient, FetchResult
 from .client.httpx_client import CTGHttpxClient
+from .client.pagination import SearchCursor
+from .flatten.projection import Flattener, projection_fields
 from .query.compiler import compile_to_params
 from .query.expr import Expr
 
 
+def _merge_params(expr: Optional[Expr], extra: Optional[dict[str, Any]]) -> dict[str, Any]:
+    compiled = compile_to_params(expr).params if expr is not None else {}
+
+    # user-supplied params override compiled params
+    return {**compiled, **(extra or {})}
+
+
+def _fields(
+    fields: Optional[list[str]], project: Optional[Union[Flattener, Sequence[Flattener]]]
+) -> Optional[list[str]]:
+    if project is None:
+        return fields
+    return projection_fields(project, fields or ()) or None
+
+
 class CTG:
     def __init__(self, client: Optional[CTGClient] = None) -> None:
         self.client = client or CTGHttpxClient()
@@ -17,15 +35,21 @@ class CTG:
     def get(self, nct_id: str) -> dict[str, Any]:
         return self.client.get(nct_id)
 
+    def get_many(
+        self,
+        nct_ids: Iterable[str],
+        *,
+        batch_size: int = 100,
+        workers: int = 8,
+    ) -> Iterator[FetchResult]:
+        return self.client.get_many(nct_ids, batch_size=batch_size, workers=workers)
+
     def count(
         self,
         expr: Optional[Expr] = None,
         extra: Optional[dict[str, Any]] = None,
     ) -> int:
-        compiled = compile_to_params(expr).params if expr is not None else {}
-
-        # user-supplied params override compiled params
-        merged = {**compiled, **(extra or {})}
+        merged = _merge_params(expr, extra)
 
         # Use a page size of 1 to minimize data transfer
         total = self.client.count(query=merged)
@@ -36,21 +60,118 @@ class CTG:
         expr: Optional[Expr] = None,
         *,
         fields: Optional[list[str]] = None,
+        project: Optional[Union[Flattener, Sequence[Flattener]]] = None,  # see projection_fields
         offset: int = 0,
-        limit: int = 100,  # Allowed max records returned, up to 1000,
+        limit: Optional[int] = 100,  # None streams every matching record
         sort: str = "LastUpdatePostDate",
         extra: Optional[dict[str, Any]] = None,
     ) -> Iterator[dict[str, Any]]:
-        limit = min(limit, 1000)  # Enforce max limit of 1000
+        merged = _merge_params(expr, extra)
+
+        return self.client.search(
+            query=merged,
+            fields=_fields(fields, project),
+            offset=offset,
+            limit=limit,
+            sort=sort,
+        )
+
+    def cursor(
+        self,
+        expr: Optional[Expr] = None,
+        *,
+        fields: Optional[list[str]] = None,
+        project: Optional[Union[Flattener, Sequence[Flattener]]] = None,  # see projection_fields
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "LastUpdatePostDate",
+        extra: Optional[dict[str, Any]] = None,
+    ) -> SearchCursor:
+        """Create a serializable cursor for a (by default unbounded) search; see resume()."""
+        merged = _merge_params(expr, extra)
+        return SearchCursor.start(
+            merged, fields=_fields(fields, project), offset=offset, limit=limit, sort=sort
+        )
+
+    def resume(self, cursor: SearchCursor) -> Iterator[dict[str, Any]]:
+        return self.client.resume(cursor)
+
+
+class AsyncCTG:
+    """
+    Asyncio counterpart of CTG. Several queries can be fanned out concurrently
+    from the same event loop; the client's `max_concurrency` bounds the total
+    number of requests in flight.
+    """
+
+    def __init__(self, client: Optional[CTGAsyncClient] = None) -> None:
+        self.client = client or CTGAsyncClient()
+
+    async def close(self) -> None:
+        await self.client.close()
 
-        compiled = compile_to_params(expr).params if expr is not None else {}
-        # user-supplied params override compiled params
-        merged = {**compiled, **(extra or {})}
+    async def __aenter__(self) -> "AsyncCTG":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def get(self, nct_id: str) -> dict[str, Any]:
+        return await self.client.get(nct_id)
+
+    def get_many(
+        self,
+        nct_ids: Iterable[str],
+        *,
+        batch_size: int = 100,
+    ) -> AsyncIterator[FetchResult]:
+        return self.client.get_many(nct_ids, batch_size=batch_size)
+
+    async def count(
+        self,
+        expr: Optional[Expr] = None,
+        extra: Optional[dict[str, Any]] = None,
+    ) -> int:
+        merged = _merge_params(expr, extra)
+        return await self.client.count(query=merged)
+
+    def search(
+        self,
+        expr: Optional[Expr] = None,
+        *,
+        fields: Optional[list[str]] = None,
+        project: Optional[Union[Flattener, Sequence[Flattener]]] = None,  # see projection_fields
+        offset: int = 0,
+        limit: Optional[int] = 100,  # None streams every matching record
+        sort: str = "LastUpdatePostDate",
+        extra: Optional[dict[str, Any]] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        merged = _merge_params(expr, extra)
 
         return self.client.search(
             query=merged,
-            fields=fields,
+            fields=_fields(fields, project),
             offset=offset,
             limit=limit,
             sort=sort,
         )
+
+    def cursor(
+        self,
+        expr: Optional[Expr] = None,
+        *,
+        fields: Optional[list[str]] = None,
+        project: Optional[Union[Flattener, Sequence[Flattener]]] = None,  # see projection_fields
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "LastUpdatePostDate",
+        extra: Optional[dict[str, Any]] = None,
+    ) -> SearchCursor:
+        """Create a serializable cursor for a (by default unbounded) search; see resume()."""
+        merged = _merge_params(expr, extra)
+        return SearchCursor.start(
+            merged, fields=_fields(fields, project), offset=offset, limit=limit, sort=sort
+        )
+
+    def resume(self, cursor: SearchCursor) -> AsyncIterator[dict[str, Any]]:
+        return self.client.resume(cursor)
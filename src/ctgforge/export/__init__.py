@@ -1,4 +1,5 @@
 from .dataframe import to_dataframe
 from .graph import to_property_graph
+from .tables import to_tables
 
-__all__ = ["to_dataframe", "to_property_graph"]
+__all__ = ["to_dataframe", "to_property_graph", "to_tables"]
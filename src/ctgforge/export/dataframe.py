@@ -1,31 +1,74 @@
-from collections.abc import Sequence
+from collections.abc import Iterable
+from typing import Any, Optional
 
 import pandas as pd
 
-from ..models.core import TrialCore
+from ..models.core import DateStruct, TrialCore
 
+CATEGORY_COLUMNS = ("study_type", "overall_status", "lead_sponsor")
+DATE_COLUMNS = ("start_date", "primary_completion_date", "completion_date", "last_update_post_date")
+
+
+def to_dataframe(trials: Iterable[TrialCore], *, list_columns: bool = False) -> pd.DataFrame:
+    """
+    One row per trial, built column by column in a single pass.
+
+    `study_type`, `overall_status` and `lead_sponsor` are categoricals, and the
+    date columns are datetime64 (partial `YYYY-MM` dates fall on the first of the
+    month). Collaborators, conditions, arm groups and interventions are
+    "; "-joined names, or lists of names with `list_columns=True`.
+    """
+    cols: dict[str, list[Any]] = {name: [] for name in TrialCore.model_fields}
 
-def to_dataframe(trials: Sequence[TrialCore]) -> pd.DataFrame:
-    rows = []
     for t in trials:
-        row = t.model_dump()
-
-        # Flatten lead_sponsor and collaborators
-        row["lead_sponsor"] = t.lead_sponsor.name if t.lead_sponsor else None
-        row["collaborators"] = (
-            "; ".join(c.name for c in t.collaborators) if t.collaborators else None
-        )
-
-        # Flatten interventions and conditions into semicolon-separated strings
-        row["conditions"] = "; ".join(c.name for c in t.conditions)
-        row["arm_groups"] = "; ".join(ag.label for ag in t.arm_groups)
-        row["interventions"] = "; ".join(i.name for i in t.interventions)
-
-        # Flatten date structs to just date strings
-        row["start_date"] = t.start_date.date if t.start_date else None
-        row["completion_date"] = t.completion_date.date if t.completion_date else None
-        row["primary_completion_date"] = (
-            t.primary_completion_date.date if t.primary_completion_date else None
-        )
-        rows.append(row)
-    return pd.DataFrame(rows)
+        cols["nct_id"].append(t.nct_id)
+        cols["brief_title"].append(t.brief_title)
+        cols["official_title"].append(t.official_title)
+        cols["brief_summary"].append(t.brief_summary)
+        cols["detailed_description"].append(t.detailed_description)
+        cols["study_type"].append(t.study_type)
+        cols["overall_status"].append(t.overall_status)
+        cols["phases"].append(list(t.phases))
+        cols["lead_sponsor"].append(t.lead_sponsor.name if t.lead_sponsor else None)
+
+        collaborators = [c.name for c in t.collaborators]
+        conditions = [c.name for c in t.conditions]
+        arm_groups = [ag.label for ag in t.arm_groups]
+        interventions = [i.name for i in t.interventions]
+        if list_columns:
+            cols["collaborators"].append(collaborators)
+            cols["conditions"].append(conditions)
+            cols["arm_groups"].append(arm_groups)
+            cols["interventions"].append(interventions)
+        else:
+            cols["collaborators"].append("; ".join(collaborators) if collaborators else None)
+            cols["conditions"].append("; ".join(conditions))
+            cols["arm_groups"].append("; ".join(arm_groups))
+            cols["interventions"].append("; ".join(interventions))
+
+        cols["start_date"].append(_date(t.start_date))
+        cols["primary_completion_date"].append(_date(t.primary_completion_date))
+        cols["completion_date"].append(_date(t.completion_date))
+        cols["last_update_post_date"].append(_date(t.last_update_post_date))
+        cols["has_results"].append(t.has_results)
+
+    df = pd.DataFrame(cols)
+    _categorize(df, CATEGORY_COLUMNS)
+    _parse_dates(df, DATE_COLUMNS)
+    df["has_results"] = df["has_results"].astype(bool)
+    return df
+
+
+def _date(ds: Optional[DateStruct]) -> Optional[str]:
+    return ds.date if ds else None
+
+
+def _categorize(df: pd.DataFrame, names: Iterable[str]) -> None:
+    for name in names:
+        df[name] = df[name].astype("category")
+
+
+def _parse_dates(df: pd.DataFrame, names: Iterable[str]) -> None:
+    """Parse ISO date strings in place; partial `YYYY-MM` dates fall on the 1st."""
+    for name in names:
+        df[name] = pd.to_datetime(df[name], format="ISO8601", errors="coerce")
@@ -1,63 +1,479 @@
-from collections.abc import Sequence
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Optional, Union
 
+import numpy as np
 import pandas as pd
 
+from ..flatten.core import flatten_core
 from ..models.core import TrialCore
 
+# Node property columns, shared by every label; a label leaves the others null.
+NODE_PROPS = ("title", "study_type", "overall_status", "mesh_uid", "type")
+_NODE_CATEGORIES = ("label", "study_type", "overall_status", "type")
 
-def to_property_graph(trials: Sequence[TrialCore]) -> tuple[pd.DataFrame, pd.DataFrame]:
-    nodes = []
-    edges = []
-
-    def normalize_id(name: str) -> str:
-        return name.strip().lower().replace(" ", "_")
-
-    def node(node_id, label, **props):
-        nodes.append({"node_id": node_id, "label": label, "props": props})
-
-    def edge(src, rel, dst):
-        edges.append({"src": src, "rel": rel, "dst": dst})
-
-    for t in trials:
-        tid = f"Trial:{t.nct_id}"
-        node(
-            tid,
-            "Trial",
-            title=t.brief_title,
-            study_type=t.study_type,
-            overall_status=t.overall_status,
-        )
-
-        for c in t.conditions:
-            cid = f"Condition:{normalize_id(c.name)}"
-            node(cid, "Condition", mesh_uid=c.mesh_uid if c.mesh_uid else None)
-            edge(tid, "HAS_CONDITION", cid)
-
-        for i in t.interventions:
-            iid = f"Intervention:{normalize_id(i.name)}"
-            node(
-                iid,
-                "Intervention",
-                mesh_uid=i.mesh_uid if i.mesh_uid else None,
-                type=i.type,
-                arm_group_types=set(
-                    [ag.type for ag in t.arm_groups if ag.label in i.arm_group_labels]
-                ),
+TrialSource = Iterable[Union[TrialCore, dict[str, Any]]]  # models and/or raw studies
+Edge = tuple[int, str, int]
+_Props = tuple[Optional[str], ...]  # aligned with NODE_PROPS
+_Mention = tuple[int, _Props, frozenset[str]]  # node ID, props, arm_group_types
+_Snapshot = tuple[_Props, frozenset[str]]
+
+
+def normalize_id(name: str) -> str:
+    return name.strip().lower().replace(" ", "_")
+
+
+@dataclass
+class GraphDelta:
+    """
+    Net changes to a PropertyGraphBuilder since the previous delta.
+
+    Node frames have the columns of PropertyGraphBuilder.to_frames() nodes, with
+    the current properties; removed nodes only have `id` and `node_id`. Edge
+    frames have `src`, `rel` and `dst`.
+    """
+
+    added_nodes: pd.DataFrame
+    updated_nodes: pd.DataFrame
+    removed_nodes: pd.DataFrame
+    added_edges: pd.DataFrame
+    removed_edges: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return all(
+            df.empty
+            for df in (
+                self.added_nodes,
+                self.updated_nodes,
+                self.removed_nodes,
+                self.added_edges,
+                self.removed_edges,
             )
-            edge(tid, "HAS_INTERVENTION", iid)
+        )
+
+
+class PropertyGraphBuilder:
+    """
+    Builds deduplicated node and edge tables from trials, and keeps them up to
+    date as trials are added, updated and removed.
+
+    Nodes are kept in a hash index on their `node_id` (e.g. "Condition:asthma")
+    and get integer IDs in order of first appearance, which are never reused;
+    edges refer to those IDs and are stored once per (src, rel, dst). A node
+    mentioned by several trials has its properties merged deterministically:
+    each property takes its most frequent non-null value over the mentions
+    (on ties, the one first given by the earliest added trial that still
+    mentions it), and `arm_group_types` is their union. So the merged
+    properties always equal those of a fresh build from the current trials,
+    in the order they were last added or updated.
+
+    Every node counts the trials that mention it, and the values they gave it.
+    `remove(nct_id)` and `update(trial)` retract a trial's mentions, so that
+    properties are re-merged and nodes no trial mentions any more disappear;
+    the net changes accumulate until `pop_delta()`, to be applied to a
+    downstream graph store instead of reloading it.
+
+    With `incremental=False` the builder is add-only: it does not remember what
+    each trial contributed, and remove/update/pop_delta are unavailable.
+
+    Usage:
+        builder = PropertyGraphBuilder()
+        builder.add_many(trials)
+        nodes, edges = builder.to_frames()
+        builder.update(changed_trial)
+        builder.remove("NCT00000001")
+        delta = builder.pop_delta()
+    """
+
+    def __init__(self, *, incremental: bool = True) -> None:
+        self.incremental = incremental
+
+        self._index: dict[str, int] = {}  # live nodes only
+        self._node_ids: list[str] = []
+        self._labels: list[str] = []
+        self._props: dict[str, list[Any]] = {name: [] for name in NODE_PROPS}
+        self._refs: list[int] = []  # number of trials mentioning each node
+        # per node: property -> value -> sequence numbers of the trials giving it,
+        # ascending, so that len() counts them and the first is the earliest
+        self._counts: list[dict[str, dict[str, dict[int, None]]]] = []
+        self._types: list[dict[str, int]] = []  # per node: arm group type -> mentions
+        self._seq = 0  # sequence number of the last trial added, for tie-breaking
+
+        self._trials: dict[str, list[Edge]] = {}  # NCT ID -> its edges
+        # NCT ID -> its sequence number and mentions
+        self._mentioned: dict[str, tuple[int, list[_Mention]]] = {}
+        self._num_edges = 0
+
+        # net changes since the last pop_delta()
+        self._added_nodes: set[int] = set()
+        self._updated_nodes: set[int] = set()
+        self._removed_nodes: set[int] = set()
+        self._added_edges: set[Edge] = set()
+        self._removed_edges: set[Edge] = set()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, nct_id: str) -> bool:
+        return nct_id in self._trials
+
+    @property
+    def num_edges(self) -> int:
+        return self._num_edges
+
+    def node_index(self, node_id: str) -> Optional[int]:
+        """Integer ID of a node, or None if it is not in the graph."""
+        return self._index.get(node_id)
+
+    def node_id(self, idx: int) -> str:
+        """The node_id of an integer node ID."""
+        return self._node_ids[idx]
+
+    def refcount(self, node_id: str) -> int:
+        """Number of trials mentioning a node (0 if it is not in the graph)."""
+        idx = self._index.get(node_id)
+        return 0 if idx is None else self._refs[idx]
+
+    def add(self, trial: TrialCore) -> None:
+        """
+        Add a trial. In incremental mode adding a trial that is already in the
+        graph raises ValueError (use update()); otherwise it is merged in.
+        """
+        if not self.incremental:
+            edges = self.index_trial(trial)
+            known = self._trials.setdefault(trial.nct_id, [])
+            new = [e for e in edges if e not in known] if known else edges
+            known.extend(new)
+            self._num_edges += len(new)
+            return
+
+        if trial.nct_id in self._trials:
+            raise ValueError(f"{trial.nct_id} is already in the graph; use update()")
+        self._apply(trial.nct_id, trial)
+
+    def add_many(self, trials: Iterable[TrialCore]) -> "PropertyGraphBuilder":
+        for trial in trials:
+            self.add(trial)
+        return self
+
+    def update(self, trial: TrialCore) -> None:
+        """Replace a trial's nodes and edges (or add it if it is not in the graph)."""
+        self._require_incremental()
+        self._apply(trial.nct_id, trial)
+
+    def remove(self, nct_id: str) -> None:
+        """Retract a trial; nodes no other trial mentions are removed. Unknown IDs are ignored."""
+        self._require_incremental()
+        if nct_id in self._trials:
+            self._apply(nct_id, None)
+
+    def index_trial(self, t: TrialCore) -> list[Edge]:
+        """
+        Add or merge the nodes of one trial and return its distinct edges,
+        without storing them (see write_property_graph()). Add-only builders only.
+        """
+        if self.incremental:
+            raise RuntimeError("index_trial() requires PropertyGraphBuilder(incremental=False)")
+        mentions, edges = _mentions(t)
+        self._seq += 1
+        ids = {}
+        for node_id, label, props, types in mentions:
+            idx = self._index.get(node_id)
+            if idx is None:
+                idx = self._new_node(node_id, label)
+            self._count(idx, props, types, 1, self._seq)
+            ids[node_id] = idx
+        return [(ids[src], rel, ids[dst]) for src, rel, dst in edges]
+
+    def pop_delta(self) -> GraphDelta:
+        """Net node and edge changes since the previous call (or since creation)."""
+        self._require_incremental()
+        removed = sorted(self._removed_nodes)
+        delta = GraphDelta(
+            added_nodes=self._node_frame(sorted(self._added_nodes)),
+            updated_nodes=self._node_frame(sorted(self._updated_nodes)),
+            removed_nodes=pd.DataFrame(
+                {
+                    "id": np.array(removed, dtype=np.int32),
+                    "node_id": [self._node_ids[idx] for idx in removed],
+                }
+            ),
+            added_edges=_edge_frame(sorted(self._added_edges)),
+            removed_edges=_edge_frame(sorted(self._removed_edges)),
+        )
+        for changes in (
+            self._added_nodes,
+            self._updated_nodes,
+            self._removed_nodes,
+            self._added_edges,
+            self._removed_edges,
+        ):
+            changes.clear()
+        return delta
+
+    def node_columns(self) -> dict[str, list[Any]]:
+        """Node table as plain columns: id, node_id, label, NODE_PROPS, arm_group_types."""
+        return self._node_columns(self._live_nodes())
+
+    def to_frames(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Node and edge DataFrames.
+
+        Nodes have an int32 `id`, the string `node_id`, the label and one typed
+        column per property; edges have int32 `src`/`dst` node IDs and a
+        categorical `rel`. IDs are dense until nodes get removed.
+        """
+        return self._node_frame(self._live_nodes()), _edge_frame(
+            list(chain.from_iterable(self._trials.values()))
+        )
+
+    # ------ internal helpers ------
+
+    def _require_incremental(self) -> None:
+        if not self.incremental:
+            raise RuntimeError("This PropertyGraphBuilder is add-only (incremental=False)")
+
+    def _apply(self, nct_id: str, trial: Optional[TrialCore]) -> None:
+        """Retract what `nct_id` contributed, if anything, then add `trial`, if given."""
+        # nodes touched by a retraction, with their state beforehand: the net
+        # change is only known once the new mentions are counted back in
+        before: dict[int, _Snapshot] = {}
+
+        old_edges = self._trials.pop(nct_id, [])
+        old_seq, old_mentions = self._mentioned.pop(nct_id, (0, []))
+        for idx, props, types in old_mentions:
+            before[idx] = self._snapshot(idx)
+            self._count(idx, props, types, -1, old_seq)
+
+        new_edges: list[Edge] = []
+        if trial is not None:
+            mentions, edges = _mentions(trial)
+            self._seq += 1
+            seq = self._seq
+            ids, mentioned = {}, []
+            for node_id, label, props, types in mentions:
+                idx = self._index.get(node_id)
+                if idx is None:
+                    idx = self._new_node(node_id, label)
+                    self._added_nodes.add(idx)
+                    self._count(idx, props, types, 1, seq)
+                elif idx in before:
+                    self._count(idx, props, types, 1, seq)
+                elif self._count(idx, props, types, 1, seq) and idx not in self._added_nodes:
+                    self._updated_nodes.add(idx)
+                ids[node_id] = idx
+                mentioned.append((idx, props, types))
+            new_edges = [(ids[src], rel, ids[dst]) for src, rel, dst in edges]
+            self._trials[nct_id] = new_edges
+            self._mentioned[nct_id] = (seq, mentioned)
+
+        for idx, snapshot in before.items():
+            if not self._refs[idx]:
+                self._remove_node(idx)
+            elif idx not in self._added_nodes and self._snapshot(idx) != snapshot:
+                self._updated_nodes.add(idx)
+
+        if old_edges:
+            old, new = set(old_edges), set(new_edges)
+            for edge in old - new:
+                if edge in self._added_edges:
+                    self._added_edges.discard(edge)
+                else:
+                    self._removed_edges.add(edge)
+            added = new - old
+        else:
+            added = new_edges
+        for edge in added:
+            if edge in self._removed_edges:
+                self._removed_edges.discard(edge)
+            else:
+                self._added_edges.add(edge)
+        self._num_edges += len(new_edges) - len(old_edges)
+
+    def _new_node(self, node_id: str, label: str) -> int:
+        idx = len(self._node_ids)
+        self._index[node_id] = idx
+        self._node_ids.append(node_id)
+        self._labels.append(label)
+        for values in self._props.values():
+            values.append(None)
+        self._refs.append(0)
+        self._counts.append({})
+        self._types.append({})
+        return idx
+
+    def _remove_node(self, idx: int) -> None:
+        del self._index[self._node_ids[idx]]
+        self._updated_nodes.discard(idx)
+        if idx in self._added_nodes:
+            self._added_nodes.discard(idx)
+        else:
+            self._removed_nodes.add(idx)
+
+    def _count(self, idx: int, props: _Props, types: frozenset[str], sign: int, seq: int) -> bool:
+        """
+        Add (sign=1) or retract (sign=-1) the mention of a node by the trial with
+        sequence number `seq`; returns whether the node's merged properties changed.
+        """
+        self._refs[idx] += sign
+        counts = self._counts[idx]
+        changed = False
+        for name, value in zip(NODE_PROPS, props):
+            if value is None:
+                continue
+            values = counts.setdefault(name, {})
+            column = self._props[name]
+            current = column[idx]
+            if sign > 0:
+                seqs = values.setdefault(value, {})
+                seqs[seq] = None  # the newest trial, so the order stays ascending
+                if current is None or (value != current and _ranks_before(seqs, values[current])):
+                    column[idx] = value
+                    changed = True
+            else:
+                seqs = values[value]
+                del seqs[seq]
+                if not seqs:
+                    del values[value]
+                if value == current:
+                    # fewer mentions, or a later first one: another value may lead now
+                    column[idx] = _leader(values)
+                    changed = changed or column[idx] != current
+        if types:
+            type_counts = self._types[idx]
+            for value in types:
+                n = type_counts[value] = type_counts.get(value, 0) + sign
+                if n <= 0:
+                    del type_counts[value]
+                    changed = True
+                elif n == 1:
+                    changed = True
+        return changed
+
+    def _snapshot(self, idx: int) -> _Snapshot:
+        return (
+            tuple(self._props[name][idx] for name in NODE_PROPS),
+            frozenset(self._arm_group_types(idx)),
+        )
+
+    def _arm_group_types(self, idx: int) -> Iterable[str]:
+        return self._types[idx].keys()
+
+    def _live_nodes(self) -> list[int]:
+        if len(self._index) == len(self._node_ids):
+            return list(range(len(self._node_ids)))
+        return sorted(self._index.values())
+
+    def _node_columns(self, idxs: list[int]) -> dict[str, list[Any]]:
+        return {
+            "id": idxs,
+            "node_id": [self._node_ids[i] for i in idxs],
+            "label": [self._labels[i] for i in idxs],
+            **{name: [values[i] for i in idxs] for name, values in self._props.items()},
+            "arm_group_types": [sorted(self._arm_group_types(i)) for i in idxs],
+        }
+
+    def _node_frame(self, idxs: list[int]) -> pd.DataFrame:
+        nodes = pd.DataFrame(self._node_columns(idxs))
+        nodes["id"] = nodes["id"].astype("int32")
+        for name in _NODE_CATEGORIES:
+            nodes[name] = nodes[name].astype("category")
+        return nodes
+
+
+def _ranks_before(a: dict[int, None], b: dict[int, None]) -> bool:
+    """Whether a value mentioned by trials `a` merges ahead of one mentioned by `b`."""
+    return len(a) > len(b) or (len(a) == len(b) and next(iter(a)) < next(iter(b)))
+
+
+def _leader(values: dict[str, dict[int, None]]) -> Optional[str]:
+    """The value with the most mentions, the earliest first mention breaking ties."""
+    return min(values, key=lambda v: (-len(values[v]), next(iter(values[v]))), default=None)
+
+
+def _edge_frame(edges: list[Edge]) -> pd.DataFrame:
+    src, rel, dst = zip(*edges) if edges else ((), (), ())
+    return pd.DataFrame(
+        {
+            "src": np.array(src, dtype=np.int32),
+            "rel": pd.Categorical(rel),
+            "dst": np.array(dst, dtype=np.int32),
+        }
+    )
+
+
+def _mentions(
+    t: TrialCore,
+) -> tuple[list[tuple[str, str, _Props, frozenset[str]]], list[tuple[str, str, str]]]:
+    """
+    The nodes a trial mentions, each once with its mentions merged, and its
+    distinct edges, both keyed by node_id.
+    """
+    nodes: dict[str, tuple[str, _Props, frozenset[str]]] = {}
+    edges: dict[tuple[str, str, str], None] = {}  # insertion-ordered set
+
+    # props are given in NODE_PROPS order: title, study_type, overall_status, mesh_uid, type
+    def node(node_id: str, label: str, props: _Props, types: frozenset[str] = frozenset()) -> str:
+        props = tuple(value or None for value in props)
+        seen = nodes.get(node_id)
+        if seen is not None:
+            # mentioned twice by the same trial: the first non-null value wins
+            props = tuple(a if a is not None else b for a, b in zip(seen[1], props))
+            types = seen[2] | types
+        nodes[node_id] = (label, props, types)
+        return node_id
+
+    tid = node(
+        f"Trial:{t.nct_id}",
+        "Trial",
+        (t.brief_title, t.study_type, t.overall_status, None, None),
+    )
+
+    for c in t.conditions:
+        cid = node(
+            f"Condition:{normalize_id(c.name)}", "Condition", (None, None, None, c.mesh_uid, None)
+        )
+        edges[(tid, "HAS_CONDITION", cid)] = None
+
+    arm_types = {ag.label: ag.type for ag in t.arm_groups}
+    for i in t.interventions:
+        iid = node(
+            f"Intervention:{normalize_id(i.name)}",
+            "Intervention",
+            (None, None, None, i.mesh_uid, i.type),
+            frozenset(arm_types[label] for label in i.arm_group_labels if arm_types.get(label)),
+        )
+        edges[(tid, "HAS_INTERVENTION", iid)] = None
+
+    if t.lead_sponsor:
+        sid = node(
+            f"Sponsor:{normalize_id(t.lead_sponsor.name)}",
+            "Sponsor",
+            (None, None, None, None, t.lead_sponsor.type),
+        )
+        edges[(tid, "SPONSORED_BY", sid)] = None
+
+    for collab in t.collaborators:
+        collid = node(
+            f"Sponsor:{normalize_id(collab.name)}", "Sponsor", (None, None, None, None, collab.type)
+        )
+        edges[(tid, "COLLABORATED_BY", collid)] = None
+
+    mentions = [(node_id, label, props, types) for node_id, (label, props, types) in nodes.items()]
+    return mentions, list(edges)
 
-        if t.lead_sponsor:
-            sid = f"Sponsor:{normalize_id(t.lead_sponsor.name)}"
-            node(sid, "Sponsor", type=t.lead_sponsor.type)
-            edge(tid, "SPONSORED_BY", sid)
 
-        if t.collaborators:
-            for collab in t.collaborators:
-                collid = f"Sponsor:{normalize_id(collab.name)}"
-                node(collid, "Sponsor", type=collab.type)
-                edge(tid, "COLLABORATED_BY", collid)
+def _as_trials(trials: TrialSource) -> Iterable[TrialCore]:
+    """TrialCore models from models and/or raw studies."""
+    for item in trials:
+        yield item if isinstance(item, TrialCore) else flatten_core(item)
 
-    nodes_df = pd.DataFrame(nodes).drop_duplicates("node_id")
-    edges_df = pd.DataFrame(edges)
 
-    return nodes_df, edges_df
+def to_property_graph(trials: Iterable[TrialCore]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Property-graph node and edge tables of the trials, with one row per
+    distinct node and edge; see PropertyGraphBuilder.
+    """
+    return PropertyGraphBuilder(incremental=False).add_many(trials).to_frames()
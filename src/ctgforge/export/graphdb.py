@@ -0,0 +1,186 @@
+import csv
+import os
+from dataclasses import dataclass, field
+from typing import Any, TextIO, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from .graph import NODE_PROPS, PropertyGraphBuilder, TrialSource, _as_trials
+
+PathLike = Union[str, os.PathLike]
+
+# label -> node properties written for it, in header order
+LABEL_PROPS: dict[str, tuple[str, ...]] = {
+    "Trial": ("title", "study_type", "overall_status"),
+    "Condition": ("mesh_uid",),
+    "Intervention": ("mesh_uid", "type", "arm_group_types"),
+    "Sponsor": ("type",),
+}
+# relationship type -> label of its end node; every relationship starts at a Trial
+RELATIONSHIPS: dict[str, str] = {
+    "HAS_CONDITION": "Condition",
+    "HAS_INTERVENTION": "Intervention",
+    "SPONSORED_BY": "Sponsor",
+    "COLLABORATED_BY": "Sponsor",
+}
+# neo4j-admin property types; anything not listed is a string
+_PROP_TYPES = {"arm_group_types": "string[]"}
+
+ARRAY_DELIMITER = ";"
+
+
+@dataclass
+class Neo4jImport:
+    """
+    The files written by write_neo4j_import(): one node file per label and one
+    relationship file per type, each with its header on the first line.
+    """
+
+    directory: str
+    nodes: dict[str, str] = field(default_factory=dict)  # label -> path
+    relationships: dict[str, str] = field(default_factory=dict)  # type -> path
+    node_counts: dict[str, int] = field(default_factory=dict)
+    relationship_counts: dict[str, int] = field(default_factory=dict)
+
+    def command(self, database: str = "neo4j") -> list[str]:
+        """`neo4j-admin database import full` arguments that load these files."""
+        return [
+            "neo4j-admin",
+            "database",
+            "import",
+            "full",
+            *(f"--nodes={path}" for path in self.nodes.values()),
+            *(f"--relationships={path}" for path in self.relationships.values()),
+            f"--array-delimiter={ARRAY_DELIMITER}",
+            "--multiline-fields=true",
+            database,
+        ]
+
+
+def node_header(label: str) -> list[str]:
+    """Header of a label's node file, e.g. node_id:ID(Trial),title:string,...,:LABEL"""
+    props = [f"{name}:{_PROP_TYPES.get(name, 'string')}" for name in LABEL_PROPS[label]]
+    return [f"node_id:ID({label})", *props, ":LABEL"]
+
+
+def relationship_header(rel: str) -> list[str]:
+    """Header of a relationship file: :START_ID(Trial),:END_ID(<label>),:TYPE"""
+    return [":START_ID(Trial)", f":END_ID({RELATIONSHIPS[rel]})", ":TYPE"]
+
+
+def write_neo4j_import(trials: TrialSource, directory: PathLike) -> Neo4jImport:
+    """
+    Stream the property graph of the trials into CSV files for
+    `neo4j-admin database import`, one `<Label>.nodes.csv` per label and one
+    `<TYPE>.relationships.csv` per relationship type, in `directory`.
+
+    Every label has its own ID space named after it, keyed by the node_id of
+    to_property_graph(). Properties are typed in the headers; arm_group_types
+    is a string[] joined with ARRAY_DELIMITER, and missing values are empty
+    fields, which the importer leaves unset.
+
+    Relationships are written as the trials are consumed, nodes at the end so
+    that their properties can be merged across trials; see
+    write_property_graph(). Every file is created, with its header, even if it
+    has no rows. Neo4jImport.command() gives the import command line.
+    """
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    result = Neo4jImport(directory)
+    builder = PropertyGraphBuilder(incremental=False)
+    node_id = builder.node_id
+
+    files: list[TextIO] = []
+    try:
+        rel_writers = {}
+        for rel in RELATIONSHIPS:
+            path = os.path.join(directory, f"{rel}.relationships.csv")
+            rel_writers[rel] = _csv_writer(path, files)
+            rel_writers[rel].writerow(relationship_header(rel))
+            result.relationships[rel] = path
+            result.relationship_counts[rel] = 0
+
+        for trial in _as_trials(trials):
+            for src, rel, dst in builder.index_trial(trial):
+                rel_writers[rel].writerow((node_id(src), node_id(dst), rel))
+                result.relationship_counts[rel] += 1
+
+        node_writers = {}
+        for label in LABEL_PROPS:
+            path = os.path.join(directory, f"{label}.nodes.csv")
+            node_writers[label] = _csv_writer(path, files)
+            node_writers[label].writerow(node_header(label))
+            result.nodes[label] = path
+            result.node_counts[label] = 0
+
+        columns = builder.node_columns()
+        for row in range(len(builder)):
+            label = columns["label"][row]
+            values: list[Any] = [columns["node_id"][row]]
+            for name in LABEL_PROPS[label]:
+                value = columns[name][row]
+                if name == "arm_group_types":
+                    value = ARRAY_DELIMITER.join(value) or None
+                values.append(value)
+            values.append(label)
+            node_writers[label].writerow(values)
+            result.node_counts[label] += 1
+    finally:
+        for f in files:
+            f.close()
+
+    return result
+
+
+def write_graphml(trials: TrialSource, path: PathLike) -> tuple[int, int]:
+    """
+    Stream the property graph of the trials into a GraphML file and return the
+    number of nodes and edges written.
+
+    Node elements are identified by node_id and carry `label` and the
+    NODE_PROPS that are set; arm_group_types is ARRAY_DELIMITER-joined, as
+    GraphML has no list type. Edges carry their `rel`. As with
+    write_neo4j_import(), edges are written as the trials are consumed and the
+    nodes after them, which GraphML allows.
+    """
+    builder = PropertyGraphBuilder(incremental=False)
+    node_id = builder.node_id
+    n_edges = 0
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        for name in ("label", *NODE_PROPS, "arm_group_types"):
+            f.write(f'  <key id="{name}" for="node" attr.name="{name}" attr.type="string"/>\n')
+        f.write('  <key id="rel" for="edge" attr.name="rel" attr.type="string"/>\n')
+        f.write('  <graph id="ctgforge" edgedefault="directed">\n')
+
+        for trial in _as_trials(trials):
+            for src, rel, dst in builder.index_trial(trial):
+                f.write(
+                    f"    <edge source={quoteattr(node_id(src))} target={quoteattr(node_id(dst))}>"
+                    f'<data key="rel">{rel}</data></edge>\n'
+                )
+                n_edges += 1
+
+        columns = builder.node_columns()
+        for row in range(len(builder)):
+            data = [("label", columns["label"][row])]
+            data += [(name, columns[name][row]) for name in NODE_PROPS]
+            data.append(("arm_group_types", ARRAY_DELIMITER.join(columns["arm_group_types"][row])))
+            f.write(
+                f"    <node id={quoteattr(columns['node_id'][row])}>"
+                + "".join(
+                    f'<data key="{key}">{escape(value)}</data>' for key, value in data if value
+                )
+                + "</node>\n"
+            )
+
+        f.write("  </graph>\n</graphml>\n")
+
+    return len(builder), n_edges
+
+
+def _csv_writer(path: str, files: list[TextIO]) -> Any:
+    f = open(path, "w", encoding="utf-8", newline="")
+    files.append(f)
+    return csv.writer(f)
@@ -0,0 +1,139 @@
+from collections.abc import Iterable
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from ..models.core import TrialCore
+from .graph import to_property_graph
+
+TRIAL = "Trial"
+
+
+class SparseGraph:
+    """
+    Sparse-matrix view of a property graph, for analytics.
+
+    Every label gets a stable index map: its nodes sorted by `node_id`, so two
+    exports of the same graph line up whatever order the trials came in.
+    `index[label]` is a pandas Index giving each node's row/column position.
+
+    Matrices are scipy CSR:
+      - incidence(label): trials x label, 1 where a trial links to the node
+      - cooccurrence(a, b): a x b, number of trials linked to both nodes,
+        computed as incidence(a).T @ incidence(b)
+      - adjacency(): all nodes x all nodes, e.g. for centrality
+    """
+
+    def __init__(self, nodes: pd.DataFrame, edges: pd.DataFrame) -> None:
+        ids = nodes["id"].to_numpy()
+        labels = nodes["label"].astype(str).to_numpy()
+        node_ids = nodes["node_id"].to_numpy()
+        size = int(ids.max()) + 1 if len(ids) else 0
+
+        self.index: dict[str, pd.Index] = {}
+        self._label_of = np.empty(size, dtype=object)
+        self._label_of[ids] = labels
+        self._pos = np.full(size, -1, dtype=np.int64)  # graph node ID -> position in its label
+        for label in sorted(set(labels)):
+            mask = labels == label
+            order = np.argsort(node_ids[mask], kind="stable")
+            self.index[label] = pd.Index(node_ids[mask][order], name=label)
+            self._pos[ids[mask][order]] = np.arange(mask.sum())
+        self.index.setdefault(TRIAL, pd.Index([], name=TRIAL))
+
+        self._src = edges["src"].to_numpy(dtype=np.int64)
+        self._dst = edges["dst"].to_numpy(dtype=np.int64)
+        self._rel = edges["rel"].astype(str).to_numpy()
+
+    @classmethod
+    def from_trials(cls, trials: Iterable[TrialCore]) -> "SparseGraph":
+        return cls(*to_property_graph(trials))
+
+    @property
+    def labels(self) -> list[str]:
+        return list(self.index)
+
+    def incidence(self, label: str, rels: Optional[Iterable[str]] = None) -> sp.csr_matrix:
+        """
+        Trials x `label` matrix with 1 where a trial links to the node, through
+        any relationship or only those in `rels` (e.g. {"SPONSORED_BY"}).
+        """
+        if label not in self.index:
+            raise KeyError(f"Unknown label: {label!r}")
+        mask = (self._label_of[self._dst] == label) & (self._label_of[self._src] == TRIAL)
+        if rels is not None:
+            mask &= np.isin(self._rel, list(rels))
+
+        rows, cols = self._pos[self._src[mask]], self._pos[self._dst[mask]]
+        matrix = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.index[TRIAL]), len(self.index[label])),
+        )
+        # a trial may reach a node through several relationships
+        matrix.data[:] = 1
+        return matrix
+
+    def cooccurrence(
+        self,
+        a: str,
+        b: str,
+        *,
+        rels_a: Optional[Iterable[str]] = None,
+        rels_b: Optional[Iterable[str]] = None,
+    ) -> sp.csr_matrix:
+        """
+        `a` x `b` matrix of the number of trials linked to both nodes (the
+        bipartite projection through trials). With a == b the diagonal holds
+        each node's trial count.
+        """
+        ia = self.incidence(a, rels_a)
+        ib = ia if b == a and rels_b == rels_a else self.incidence(b, rels_b)
+        return (ia.T @ ib).tocsr()
+
+    def cooccurrence_frame(self, a: str, b: str, *, min_count: int = 1) -> pd.DataFrame:
+        """Non-zero cooccurrence(a, b) counts as a long table, most frequent pairs first."""
+        coo = self.cooccurrence(a, b).tocoo()
+        keep = coo.data >= min_count
+        if a == b:
+            keep &= coo.row < coo.col  # each unordered pair once, without the diagonal
+        left, right = (a, b) if a != b else (f"{a}_a", f"{b}_b")
+        frame = pd.DataFrame(
+            {
+                left: self.index[a][coo.row[keep]],
+                right: self.index[b][coo.col[keep]],
+                "trials": coo.data[keep],
+            }
+        )
+        return frame.sort_values(
+            ["trials", left, right], ascending=[False, True, True], ignore_index=True
+        )
+
+    def adjacency(self, *, symmetric: bool = True) -> tuple[sp.csr_matrix, pd.Index]:
+        """
+        Adjacency matrix over every node, with the node_ids of its rows/columns
+        (label blocks in `labels` order, each in its index order). Directed from
+        trials to the other nodes unless `symmetric`.
+        """
+        offset_of = np.zeros(len(self._label_of), dtype=np.int64)
+        start = 0
+        for label, index in self.index.items():
+            offset_of[self._label_of == label] = start
+            start += len(index)
+
+        rows = offset_of[self._src] + self._pos[self._src]
+        cols = offset_of[self._dst] + self._pos[self._dst]
+        if symmetric:
+            rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        matrix = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(start, start)
+        )
+        matrix.data[:] = 1
+        node_ids = pd.Index(np.concatenate([index.to_numpy() for index in self.index.values()]))
+        return matrix, node_ids
+
+
+def to_sparse_graph(nodes: pd.DataFrame, edges: pd.DataFrame) -> SparseGraph:
+    """Sparse-matrix view of to_property_graph() (or PropertyGraphBuilder) frames."""
+    return SparseGraph(nodes, edges)
@@ -0,0 +1,239 @@
+import os
+from collections.abc import Iterator
+from typing import Any, Optional, Union
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from ..flatten.arrow import TRIAL_SCHEMA, TrialBatchBuilder
+from ..flatten.core import _extract
+from ..models.core import TrialCore
+from .graph import PropertyGraphBuilder, TrialSource, _as_trials
+
+PathLike = Union[str, os.PathLike]
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Arrow counterparts of the to_property_graph() frames
+NODE_SCHEMA = pa.schema(
+    [
+        ("id", pa.int32()),
+        ("node_id", pa.string()),
+        ("label", _CATEGORY),
+        ("title", pa.string()),
+        ("study_type", _CATEGORY),
+        ("overall_status", _CATEGORY),
+        ("mesh_uid", pa.string()),
+        ("type", _CATEGORY),
+        ("arm_group_types", pa.list_(pa.string())),
+    ]
+)
+EDGE_SCHEMA = pa.schema(
+    [
+        ("src", pa.int32()),
+        ("rel", _CATEGORY),
+        ("dst", pa.int32()),
+    ]
+)
+
+_FORMATS = {".parquet": "parquet", ".pq": "parquet", ".arrow": "ipc", ".ipc": "ipc"}
+
+
+def write_trials(
+    trials: TrialSource,
+    path: PathLike,
+    *,
+    format: Optional[str] = None,
+    batch_size: int = 10_000,
+    compression: Optional[str] = "zstd",
+) -> int:
+    """
+    Stream trials to a Parquet or Arrow IPC file of TRIAL_SCHEMA, one row group
+    (or record batch) per `batch_size` trials, and return the number written.
+
+    `trials` may mix TrialCore models and raw v2 studies, and is consumed
+    lazily: only one batch is held in memory at a time, so a generator over the
+    whole registry can be exported with flat memory.
+
+    Args:
+        trials: TrialCore models and/or raw studies as returned by the API
+        path: output file
+        format: "parquet" or "ipc"; inferred from the file extension if omitted
+        batch_size: rows per row group / record batch
+        compression: codec passed to the writer, or None
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    builder = TrialBatchBuilder()
+    rows = 0
+    with _TableWriter(path, TRIAL_SCHEMA, format=format, compression=compression) as writer:
+        for trial in _trial_dicts(trials):
+            builder.append(trial)
+            if len(builder) >= batch_size:
+                rows += writer.write(builder.flush())
+        batch = builder.flush()
+        if batch is not None:
+            rows += writer.write(batch)
+    return rows
+
+
+def write_property_graph(
+    trials: TrialSource,
+    nodes_path: PathLike,
+    edges_path: PathLike,
+    *,
+    format: Optional[str] = None,
+    batch_size: int = 50_000,
+    compression: Optional[str] = "zstd",
+) -> tuple[int, int]:
+    """
+    Streaming counterpart of to_property_graph(): write the node and edge tables
+    to Parquet or Arrow IPC files (NODE_SCHEMA / EDGE_SCHEMA) and return the
+    number of nodes and edges written.
+
+    Edges are written as the trials are consumed. Nodes go through a
+    PropertyGraphBuilder so that their properties can be merged across trials,
+    and are written at the end; they grow with the number of distinct trials,
+    conditions, interventions and sponsors, not with the number of mentions.
+    Edges are deduplicated within each trial, which makes them unique as long as
+    no trial occurs twice in the input.
+
+    Args: as for write_trials(), batch_size counting rows of each table.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    builder = PropertyGraphBuilder(incremental=False)
+    edges = _RowBuilder(EDGE_SCHEMA)
+    n_nodes = n_edges = 0
+
+    with _TableWriter(edges_path, EDGE_SCHEMA, format=format, compression=compression) as ew:
+        for trial in _as_trials(trials):
+            for src, rel, dst in builder.index_trial(trial):
+                edges.append(src=src, rel=rel, dst=dst)
+            if len(edges) >= batch_size:
+                n_edges += ew.write(edges.flush())
+        if len(edges):
+            n_edges += ew.write(edges.flush())
+
+    columns = builder.node_columns()
+    with _TableWriter(nodes_path, NODE_SCHEMA, format=format, compression=compression) as nw:
+        for start in range(0, len(builder), batch_size):
+            batch = pa.RecordBatch.from_arrays(
+                [
+                    pa.array(columns[f.name][start : start + batch_size], type=f.type)
+                    for f in NODE_SCHEMA
+                ],
+                schema=NODE_SCHEMA,
+            )
+            n_nodes += nw.write(batch)
+
+    return n_nodes, n_edges
+
+
+def _trial_dicts(trials: TrialSource) -> Iterator[dict[str, Any]]:
+    """Trial-shaped dicts, as flatten_core extracts them, from models or raw studies."""
+    for item in trials:
+        if isinstance(item, TrialCore):
+            yield item.model_dump()
+        else:
+            yield _extract(item)
+
+
+class _RowBuilder:
+    """Accumulates rows of `schema` column by column; missing values are null."""
+
+    def __init__(self, schema: pa.Schema) -> None:
+        self.schema = schema
+        self._columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+
+    def __len__(self) -> int:
+        return len(self._columns[self.schema.names[0]])
+
+    def append(self, **values: Any) -> None:
+        for name, col in self._columns.items():
+            col.append(values.get(name))
+
+    def flush(self) -> pa.RecordBatch:
+        arrays = [pa.array(self._columns[f.name], type=f.type) for f in self.schema]
+        self._columns = {name: [] for name in self.schema.names}
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+class _StableDictionaries:
+    """
+    Re-encodes the dictionary columns of successive batches against one
+    append-only dictionary per column.
+
+    Each batch built with pa.array() carries its own dictionary, which the IPC
+    file format rejects (it allows a single dictionary per field, extended only
+    by deltas). With a growing shared dictionary the writer can emit deltas.
+    """
+
+    def __init__(self, schema: pa.Schema) -> None:
+        self._dicts: dict[int, tuple[list[str], dict[str, int]]] = {
+            i: ([], {}) for i, f in enumerate(schema) if pa.types.is_dictionary(f.type)
+        }
+
+    def __call__(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        if not self._dicts:
+            return batch
+        columns = list(batch.columns)
+        for i, (values, index) in self._dicts.items():
+            col = columns[i]
+            remap = []
+            for value in col.dictionary.to_pylist():
+                if value not in index:
+                    index[value] = len(values)
+                    values.append(value)
+                remap.append(index[value])
+            indices = pa.array(remap, type=col.type.index_type).take(col.indices)
+            columns[i] = pa.DictionaryArray.from_arrays(
+                indices, pa.array(values, type=col.type.value_type)
+            )
+        return pa.RecordBatch.from_arrays(columns, schema=batch.schema)
+
+
+class _TableWriter:
+    """A Parquet or Arrow IPC file writer taking RecordBatches of a fixed schema."""
+
+    def __init__(
+        self,
+        path: PathLike,
+        schema: pa.Schema,
+        *,
+        format: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> None:
+        if format is None:
+            ext = os.path.splitext(os.fspath(path))[1].lower()
+            if ext not in _FORMATS:
+                raise ValueError(f"Cannot infer the format of {os.fspath(path)!r}; pass format=")
+            format = _FORMATS[ext]
+
+        if format == "parquet":
+            self._writer = pq.ParquetWriter(path, schema, compression=compression or "none")
+            self._encode = None
+        elif format == "ipc":
+            options = ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+            self._writer = ipc.new_file(path, schema, options=options)
+            self._encode = _StableDictionaries(schema)
+        else:
+            raise ValueError(f"Unknown format: {format!r} (expected 'parquet' or 'ipc')")
+
+    def write(self, batch: pa.RecordBatch) -> int:
+        if self._encode is not None:
+            batch = self._encode(batch)
+        self._writer.write_batch(batch)
+        return batch.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def __enter__(self) -> "_TableWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,119 @@
+from collections.abc import Iterable
+from typing import Any
+
+import pandas as pd
+
+from ..models.core import TrialCore
+from .dataframe import DATE_COLUMNS, _categorize, _date, _parse_dates
+
+# table name -> columns; every table is keyed by nct_id
+TABLES: dict[str, tuple[str, ...]] = {
+    "trial": (
+        "nct_id",
+        "brief_title",
+        "official_title",
+        "brief_summary",
+        "detailed_description",
+        "study_type",
+        "overall_status",
+        "lead_sponsor",
+        "lead_sponsor_type",
+        *DATE_COLUMNS,
+        "has_results",
+    ),
+    "phase": ("nct_id", "phase"),
+    "condition": ("nct_id", "name", "mesh_uid"),
+    "intervention": ("nct_id", "name", "type", "mesh_uid", "description", "other_names"),
+    "arm_group": ("nct_id", "label", "type", "description"),
+    "arm_intervention": ("nct_id", "arm_group_label", "intervention_name"),
+    "collaborator": ("nct_id", "name", "type"),
+}
+
+_CATEGORIES: dict[str, tuple[str, ...]] = {
+    "trial": ("study_type", "overall_status", "lead_sponsor", "lead_sponsor_type"),
+    "phase": ("phase",),
+    "intervention": ("type",),
+    "arm_group": ("type",),
+    "collaborator": ("type",),
+}
+
+
+def to_tables(trials: Iterable[TrialCore]) -> dict[str, pd.DataFrame]:
+    """
+    Normalized long-format tables keyed by `nct_id`, built in one pass:
+
+      - trial: one row per trial, with the scalar fields
+      - phase, condition, collaborator: one row per item of the trial's list
+      - intervention, arm_group: one row per item, with their type and description
+      - arm_intervention: which arm group receives which intervention, taken from
+        the interventions' arm group labels
+
+    Child rows keep the order of the source lists. Categorical and date columns
+    are typed as in to_dataframe().
+    """
+    cols: dict[str, dict[str, list[Any]]] = {
+        table: {name: [] for name in names} for table, names in TABLES.items()
+    }
+    trial = cols["trial"]
+    phase = cols["phase"]
+    condition = cols["condition"]
+    intervention = cols["intervention"]
+    arm_group = cols["arm_group"]
+    arm_intervention = cols["arm_intervention"]
+    collaborator = cols["collaborator"]
+
+    for t in trials:
+        nct_id = t.nct_id
+        trial["nct_id"].append(nct_id)
+        trial["brief_title"].append(t.brief_title)
+        trial["official_title"].append(t.official_title)
+        trial["brief_summary"].append(t.brief_summary)
+        trial["detailed_description"].append(t.detailed_description)
+        trial["study_type"].append(t.study_type)
+        trial["overall_status"].append(t.overall_status)
+        trial["lead_sponsor"].append(t.lead_sponsor.name if t.lead_sponsor else None)
+        trial["lead_sponsor_type"].append(t.lead_sponsor.type if t.lead_sponsor else None)
+        trial["start_date"].append(_date(t.start_date))
+        trial["primary_completion_date"].append(_date(t.primary_completion_date))
+        trial["completion_date"].append(_date(t.completion_date))
+        trial["last_update_post_date"].append(_date(t.last_update_post_date))
+        trial["has_results"].append(t.has_results)
+
+        for p in t.phases:
+            phase["nct_id"].append(nct_id)
+            phase["phase"].append(p)
+
+        for c in t.conditions:
+            condition["nct_id"].append(nct_id)
+            condition["name"].append(c.name)
+            condition["mesh_uid"].append(c.mesh_uid)
+
+        for i in t.interventions:
+            intervention["nct_id"].append(nct_id)
+            intervention["name"].append(i.name)
+            intervention["type"].append(i.type)
+            intervention["mesh_uid"].append(i.mesh_uid)
+            intervention["description"].append(i.description)
+            intervention["other_names"].append(list(i.other_names))
+            for label in i.arm_group_labels:
+                arm_intervention["nct_id"].append(nct_id)
+                arm_intervention["arm_group_label"].append(label)
+                arm_intervention["intervention_name"].append(i.name)
+
+        for ag in t.arm_groups:
+            arm_group["nct_id"].append(nct_id)
+            arm_group["label"].append(ag.label)
+            arm_group["type"].append(ag.type)
+            arm_group["description"].append(ag.description)
+
+        for collab in t.collaborators:
+            collaborator["nct_id"].append(nct_id)
+            collaborator["name"].append(collab.name)
+            collaborator["type"].append(collab.type)
+
+    tables = {table: pd.DataFrame(columns) for table, columns in cols.items()}
+    for table, names in _CATEGORIES.items():
+        _categorize(tables[table], names)
+    _parse_dates(tables["trial"], DATE_COLUMNS)
+    tables["trial"]["has_results"] = tables["trial"]["has_results"].astype(bool)
+    return tables
@@ -1,3 +1,12 @@
 from .core import flatten_core
+from .parallel import FlattenError, FlattenRun, flatten_many
+from .projection import projection_fields, reads
 
-__all__ = ["flatten_core"]
+__all__ = [
+    "flatten_core",
+    "flatten_many",
+    "FlattenError",
+    "FlattenRun",
+    "projection_fields",
+    "reads",
+]
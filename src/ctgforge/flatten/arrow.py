@@ -0,0 +1,137 @@
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+import pyarrow as pa
+
+from .core import _extract
+
+_STRING_LIST = pa.list_(pa.string())
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Columnar layout of the fields flatten_core extracts, one row per trial.
+TRIAL_SCHEMA = pa.schema(
+    [
+        ("nct_id", pa.string()),
+        ("brief_title", pa.string()),
+        ("official_title", pa.string()),
+        ("brief_summary", pa.string()),
+        ("detailed_description", pa.string()),
+        ("study_type", _CATEGORY),
+        ("overall_status", _CATEGORY),
+        ("phases", _STRING_LIST),
+        ("lead_sponsor", pa.string()),
+        ("lead_sponsor_type", _CATEGORY),
+        ("collaborators", _STRING_LIST),
+        ("collaborator_types", _STRING_LIST),
+        ("conditions", _STRING_LIST),
+        ("condition_mesh_uids", _STRING_LIST),
+        ("arm_groups", _STRING_LIST),
+        ("arm_group_types", _STRING_LIST),
+        ("interventions", _STRING_LIST),
+        ("intervention_types", _STRING_LIST),
+        ("intervention_mesh_uids", _STRING_LIST),
+        ("start_date", pa.string()),
+        ("primary_completion_date", pa.string()),
+        ("completion_date", pa.string()),
+        ("last_update_post_date", pa.string()),
+        ("has_results", pa.bool_()),
+    ]
+)
+
+_DATE_FIELDS = ("start_date", "primary_completion_date", "completion_date", "last_update_post_date")
+
+
+class TrialBatchBuilder:
+    """
+    Accumulates trials column by column and emits them as RecordBatches of
+    TRIAL_SCHEMA. Rows are trial-shaped dicts, i.e. what flatten_core extracts
+    from a raw study (or `TrialCore.model_dump()`).
+    """
+
+    def __init__(self) -> None:
+        self._columns: dict[str, list[Any]] = {name: [] for name in TRIAL_SCHEMA.names}
+
+    def __len__(self) -> int:
+        return len(self._columns["nct_id"])
+
+    def append(self, trial: dict[str, Any]) -> None:
+        cols = self._columns
+        for key in (
+            "nct_id",
+            "brief_title",
+            "official_title",
+            "brief_summary",
+            "detailed_description",
+            "study_type",
+            "overall_status",
+            "has_results",
+        ):
+            cols[key].append(trial[key])
+        cols["phases"].append(trial["phases"])
+
+        lead = trial["lead_sponsor"]
+        cols["lead_sponsor"].append(lead["name"] if lead else None)
+        cols["lead_sponsor_type"].append(lead["type"] if lead else None)
+
+        collabs = trial["collaborators"]
+        cols["collaborators"].append([c["name"] for c in collabs])
+        cols["collaborator_types"].append([c["type"] for c in collabs])
+
+        conds = trial["conditions"]
+        cols["conditions"].append([c["name"] for c in conds])
+        cols["condition_mesh_uids"].append([c["mesh_uid"] for c in conds])
+
+        arms = trial["arm_groups"]
+        cols["arm_groups"].append([ag["label"] for ag in arms])
+        cols["arm_group_types"].append([ag["type"] for ag in arms])
+
+        intrs = trial["interventions"]
+        cols["interventions"].append([i["name"] for i in intrs])
+        cols["intervention_types"].append([i["type"] for i in intrs])
+        cols["intervention_mesh_uids"].append([i["mesh_uid"] for i in intrs])
+
+        for key in _DATE_FIELDS:
+            ds = trial[key]
+            cols[key].append(ds["date"] if ds else None)
+
+    def flush(self) -> Optional[pa.RecordBatch]:
+        """Emit the accumulated rows as a RecordBatch (None if empty) and reset."""
+        if not len(self):
+            return None
+        arrays = [pa.array(self._columns[f.name], type=f.type) for f in TRIAL_SCHEMA]
+        self._columns = {name: [] for name in TRIAL_SCHEMA.names}
+        return pa.RecordBatch.from_arrays(arrays, schema=TRIAL_SCHEMA)
+
+
+def flatten_to_arrow(
+    raws: Iterable[dict[str, Any]],
+    *,
+    batch_size: int = 10_000,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Flatten raw v2 studies straight into Arrow RecordBatches of TRIAL_SCHEMA,
+    without building TrialCore models. Values are not validated.
+
+    Args:
+        raws: raw studies as returned by the API
+        batch_size: number of rows per RecordBatch
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    builder = TrialBatchBuilder()
+    for raw in raws:
+        builder.append(_extract(raw))
+        if len(builder) >= batch_size:
+            yield builder.flush()
+
+    batch = builder.flush()
+    if batch is not None:
+        yield batch
+
+
+def flatten_to_table(raws: Iterable[dict[str, Any]], *, batch_size: int = 10_000) -> pa.Table:
+    """Flatten raw studies into a single Arrow Table; see flatten_to_arrow()."""
+    return pa.Table.from_batches(
+        list(flatten_to_arrow(raws, batch_size=batch_size)), schema=TRIAL_SCHEMA
+    )
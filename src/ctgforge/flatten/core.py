@@ -1,14 +1,68 @@
-from ..models.core import (
-    Agency,
-    ArmGroup,
-    Condition,
-    DateStruct,
-    Intervention,
-    TrialCore,
-)
+from typing import Any, Optional
+
+from ..models.core import TrialCore
+from .projection import reads
 
 
+# Everything _extract() reads; keep in sync with it.
+@reads(
+    "protocolSection.identificationModule.nctId",
+    "protocolSection.identificationModule.briefTitle",
+    "protocolSection.identificationModule.officialTitle",
+    "protocolSection.descriptionModule.briefSummary",
+    "protocolSection.descriptionModule.detailedDescription",
+    "protocolSection.designModule.studyType",
+    "protocolSection.designModule.phases",
+    "protocolSection.statusModule.overallStatus",
+    "protocolSection.statusModule.startDateStruct",
+    "protocolSection.statusModule.completionDateStruct",
+    "protocolSection.statusModule.primaryCompletionDateStruct",
+    "protocolSection.statusModule.lastUpdatePostDateStruct",
+    "protocolSection.sponsorCollaboratorsModule.leadSponsor",
+    "protocolSection.sponsorCollaboratorsModule.collaborators",
+    "protocolSection.conditionsModule.conditions",
+    "protocolSection.armsInterventionsModule.armGroups",
+    "protocolSection.armsInterventionsModule.interventions",
+    "derivedSection.conditionBrowseModule.meshes",
+    "derivedSection.interventionBrowseModule.meshes",
+    "hasResults",
+)
 def flatten_core(raw: dict) -> TrialCore:
+    """
+    Flatten a raw v2 study into a TrialCore.
+
+    The fields are extracted into plain nested dicts and validated with a single
+    TrialCore.model_validate() call, which runs entirely in pydantic-core; that is
+    cheaper than building the nested models one by one, even without validation.
+
+    The v2 fields it reads are declared, so searches can request only those with
+    `CTG.search(..., project=flatten_core)`.
+    """
+    return TrialCore.model_validate(_extract(raw))
+
+
+def _date(struct: Optional[dict]) -> Optional[dict[str, Any]]:
+    if not struct:
+        return None
+    return {"date": struct.get("date"), "type": struct.get("type")}
+
+
+def _mesh_index(browse: dict) -> dict[str, str]:
+    """
+    Lower-cased MeSH term -> MeSH id for one browse module, built once per study
+    so that matching conditions/interventions is a dict lookup. The first
+    occurrence of a term wins, as with a linear scan of `meshes`.
+    """
+    index: dict[str, str] = {}
+    for mesh in browse.get("meshes", []):
+        term = mesh.get("term")
+        if term:
+            index.setdefault(term.lower(), mesh.get("id"))
+    return index
+
+
+def _extract(raw: dict) -> dict[str, Any]:
+    """Pick the TrialCore fields out of a raw study as plain, nested dicts."""
     p = raw.get("protocolSection", {})
     d = raw.get("derivedSection", {})
 
@@ -20,10 +74,10 @@ def flatten_core(raw: dict) -> TrialCore:
     sponsor = p.get("sponsorCollaboratorsModule", {})
     desc = p.get("descriptionModule", {})
 
-    cond_browse = d.get("conditionBrowseModule", {})
-    intr_browse = d.get("interventionBrowseModule", {})
+    cond_mesh = _mesh_index(d.get("conditionBrowseModule", {}))
+    intr_mesh = _mesh_index(d.get("interventionBrowseModule", {}))
 
-    trial = TrialCore(
+    return dict(
         nct_id=ident.get("nctId"),
         brief_title=ident.get("briefTitle"),
         official_title=ident.get("officialTitle"),
@@ -32,59 +86,30 @@ def flatten_core(raw: dict) -> TrialCore:
         study_type=design.get("studyType"),
         overall_status=status.get("overallStatus"),
         phases=design.get("phases", []),
-        start_date=DateStruct(
-            date=status.get("startDateStruct").get("date"),
-            type=status.get("startDateStruct").get("type"),
-        )
-        if status.get("startDateStruct")
-        else None,
-        completion_date=DateStruct(
-            date=status.get("completionDateStruct").get("date"),
-            type=status.get("completionDateStruct").get("type"),
-        )
-        if status.get("completionDateStruct")
-        else None,
-        primary_completion_date=DateStruct(
-            date=status.get("primaryCompletionDateStruct").get("date"),
-            type=status.get("primaryCompletionDateStruct").get("type"),
-        )
-        if status.get("primaryCompletionDateStruct")
-        else None,
-        last_update_post_date=DateStruct(
-            date=status.get("lastUpdatePostDateStruct").get("date"),
-            type=status.get("lastUpdatePostDateStruct").get("type"),
-        )
-        if status.get("lastUpdatePostDateStruct")
-        else None,
-        lead_sponsor=Agency(
+        start_date=_date(status.get("startDateStruct")),
+        completion_date=_date(status.get("completionDateStruct")),
+        primary_completion_date=_date(status.get("primaryCompletionDateStruct")),
+        last_update_post_date=_date(status.get("lastUpdatePostDateStruct")),
+        lead_sponsor=dict(
             name=sponsor.get("leadSponsor", {}).get("name"),
             type=sponsor.get("leadSponsor", {}).get("class"),
         ),
         collaborators=[
-            Agency(
+            dict(
                 name=collab.get("name"),
                 type=collab.get("class"),
             )
             for collab in sponsor.get("collaborators", [])
         ],
         conditions=[
-            Condition(
+            dict(
                 name=c,
-                mesh_uid=next(
-                    iter(
-                        [
-                            mesh
-                            for mesh in cond_browse.get("meshes", [])
-                            if mesh.get("term").lower() == c.lower()
-                        ]
-                    ),
-                    {},
-                ).get("id"),
+                mesh_uid=cond_mesh.get(c.lower()),
             )
             for c in conds.get("conditions", [])
         ],
         arm_groups=[
-            ArmGroup(
+            dict(
                 label=ag.get("label"),
                 type=ag.get("type"),
                 description=ag.get("description"),
@@ -93,26 +118,15 @@ def flatten_core(raw: dict) -> TrialCore:
             for ag in arms.get("armGroups", [])
         ],
         interventions=[
-            Intervention(
+            dict(
                 name=intr.get("name"),
                 type=intr.get("type"),
                 description=intr.get("description"),
                 other_names=intr.get("otherNames", []),
                 arm_group_labels=intr.get("armGroupLabels", []),
-                mesh_uid=next(
-                    iter(
-                        [
-                            mesh
-                            for mesh in intr_browse.get("meshes", [])
-                            if mesh.get("term").lower() == intr.get("name").lower()
-                        ]
-                    ),
-                    {},
-                ).get("id"),
+                mesh_uid=intr_mesh.get((intr.get("name") or "").lower()),
             )
             for intr in arms.get("interventions", [])
         ],
         has_results=raw.get("hasResults", False),
     )
-
-    return trial
@@ -0,0 +1,152 @@
+import json
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Optional, Union
+
+from ..models.core import TrialCore
+from .core import flatten_core
+
+RawStudy = Union[dict[str, Any], bytes, str]
+
+
+@dataclass(frozen=True)
+class FlattenError:
+    """A record that could not be flattened."""
+
+    index: int  # position in the input iterable
+    nct_id: Optional[str]
+    error: str  # "ExceptionType: message"; exceptions themselves may not pickle
+
+
+_Chunk = list[tuple[int, RawStudy]]
+_ChunkResult = tuple[list[TrialCore], list[FlattenError]]
+
+
+def _flatten_chunk(chunk: _Chunk) -> _ChunkResult:
+    trials: list[TrialCore] = []
+    errors: list[FlattenError] = []
+    for index, item in chunk:
+        raw: Any = item
+        try:
+            if isinstance(raw, (bytes, str)):
+                raw = json.loads(raw)
+            trials.append(flatten_core(raw))
+        except Exception as e:
+            nct_id = None
+            if isinstance(raw, dict):
+                ident = raw.get("protocolSection", {}).get("identificationModule", {})
+                nct_id = ident.get("nctId") if isinstance(ident, dict) else None
+            errors.append(FlattenError(index, nct_id, f"{type(e).__name__}: {e}"))
+    return trials, errors
+
+
+class FlattenRun(Iterator[TrialCore]):
+    """
+    Iterator over the trials of a flatten_many() call. Records that failed are
+    skipped and collected in `errors` as the run progresses.
+    """
+
+    def __init__(self, trials: Iterator[TrialCore], errors: list[FlattenError]) -> None:
+        self._trials = trials
+        self.errors = errors
+
+    def __iter__(self) -> "FlattenRun":
+        return self
+
+    def __next__(self) -> TrialCore:
+        return next(self._trials)
+
+
+def flatten_many(
+    raws: Iterable[RawStudy],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    ordered: bool = True,
+) -> FlattenRun:
+    """
+    Flatten many raw studies on a process pool, streaming trials back.
+
+    Studies given as JSON bytes/str (e.g. straight from a response body or a
+    local store) are shipped to the workers as is and decoded there, which is
+    cheaper than pickling the equivalent dicts. The input is consumed lazily,
+    with at most two chunks per worker in flight, so memory stays bounded on
+    arbitrarily long inputs. A malformed study does not abort the batch: it is
+    recorded in the returned run's `errors` instead.
+
+    Args:
+        raws: raw studies, as dicts or JSON documents
+        workers: number of worker processes (default: CPU count); 0 or 1
+            flattens in the calling process
+        chunksize: number of studies sent to a worker at once
+        ordered: yield trials in input order; otherwise as chunks complete
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+
+    errors: list[FlattenError] = []
+    chunks = _chunks(raws, chunksize)
+    if workers is not None and workers <= 1:
+        trials = _flatten_serial(chunks, errors)
+    else:
+        trials = _flatten_pool(chunks, errors, workers, ordered)
+    return FlattenRun(trials, errors)
+
+
+def _chunks(raws: Iterable[RawStudy], chunksize: int) -> Iterator[_Chunk]:
+    it = enumerate(raws)
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _flatten_serial(chunks: Iterator[_Chunk], errors: list[FlattenError]) -> Iterator[TrialCore]:
+    for chunk in chunks:
+        trials, errs = _flatten_chunk(chunk)
+        errors.extend(errs)
+        yield from trials
+
+
+def _flatten_pool(
+    chunks: Iterator[_Chunk],
+    errors: list[FlattenError],
+    workers: Optional[int],
+    ordered: bool,
+) -> Iterator[TrialCore]:
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future] = deque()
+
+        def submit_more() -> None:
+            while len(pending) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                pending.append(pool.submit(_flatten_chunk, chunk))
+
+        try:
+            submit_more()
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [f for f in pending if f in finished]
+                    for f in done:
+                        pending.remove(f)
+
+                for fut in done:
+                    trials, errs = fut.result()
+                    errors.extend(errs)
+                    submit_more()
+                    yield from trials
+        finally:
+            for fut in pending:
+                fut.cancel()
@@ -0,0 +1,55 @@
+from collections.abc import Iterable
+from typing import Any, Callable, TypeVar, Union
+
+FN = TypeVar("FN", bound=Callable[..., Any])
+Flattener = Callable[..., Any]
+
+
+def reads(*paths: str) -> Callable[[FN], FN]:
+    """
+    Declare the v2 field paths a flattener reads, e.g.
+    "protocolSection.statusModule.overallStatus", so that searches made for it
+    can request only those (`CTG.search(..., project=flattener)`).
+
+    A path selects its whole subtree. Declare every path the flattener reads:
+    fields outside the projection are missing from the documents it gets.
+    """
+
+    def declare(fn: FN) -> FN:
+        fn.v2_fields = tuple(paths)  # type: ignore[attr-defined]
+        return fn
+
+    return declare
+
+
+def declared_fields(flattener: Flattener) -> tuple[str, ...]:
+    """The field paths declared by @reads on `flattener`."""
+    fields = getattr(flattener, "v2_fields", None)
+    if fields is None:
+        name = getattr(flattener, "__qualname__", repr(flattener))
+        raise ValueError(
+            f"{name} does not declare the v2 fields it reads; decorate it with @reads(...)"
+        )
+    return fields
+
+
+def projection_fields(
+    flatteners: Union[Flattener, Iterable[Flattener]],
+    fields: Iterable[str] = (),
+) -> list[str]:
+    """
+    Smallest `fields` list covering what `flatteners` read, plus `fields`: no
+    duplicates and no path inside another requested one. Sorted, so the same
+    flatteners always give the same request (and response cache key).
+    """
+    if callable(flatteners):
+        flatteners = [flatteners]
+    paths = set(fields)
+    for flattener in flatteners:
+        paths.update(declared_fields(flattener))
+
+    def covered(path: str) -> bool:
+        parts = path.split(".")
+        return any(".".join(parts[:i]) in paths for i in range(1, len(parts)))
+
+    return sorted(path for path in paths if not covered(path))
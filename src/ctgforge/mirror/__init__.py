@@ -0,0 +1,5 @@
+from .local import LocalCTG
+from .store import StudyStore
+from .sync import SyncReport, sync_mirror
+
+__all__ = ["LocalCTG", "StudyStore", "SyncReport", "sync_mirror"]
@@ -0,0 +1,94 @@
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+from ..client.ctg_client import FetchResult
+from ..query.expr import Expr
+from ..query.local import LocalIndex
+from .store import StudyStore
+
+# sort field -> default direction, as in the v2 API (dates descend, others ascend)
+_SORT_FIELDS = {"LastUpdatePostDate": "desc", "NCTId": "asc"}
+
+
+class LocalCTG:
+    """
+    Offline counterpart of CTG answering `get`/`count`/`search` from a StudyStore.
+
+    DSL expressions are evaluated against a LocalIndex built from the store, so
+    queries take milliseconds and may OR across fields. Raw `extra` params cannot
+    be evaluated locally and are rejected. `fields` and `project` are accepted
+    for signature compatibility; full study documents are always returned.
+    """
+
+    def __init__(self, store: StudyStore, index: Optional[LocalIndex] = None) -> None:
+        self.store = store
+        self.index = index if index is not None else LocalIndex.from_studies(store.studies())
+
+    def close(self) -> None:
+        self.store.close()
+
+    def refresh(self, nct_ids: Iterable[str]) -> None:
+        """Re-index studies that changed in the store, e.g. `SyncReport.changed`."""
+        for nct_id in nct_ids:
+            raw = self.store.get(nct_id)
+            if raw is None:
+                self.index.remove(nct_id)
+            else:
+                self.index.add(raw)
+
+    def get(self, nct_id: str) -> dict[str, Any]:
+        raw = self.store.get(nct_id)
+        if raw is None:
+            raise KeyError(nct_id)
+        return raw
+
+    def get_many(self, nct_ids: Iterable[str], **_: Any) -> Iterator[FetchResult]:
+        for nct_id in dict.fromkeys(n.strip().upper() for n in nct_ids):
+            raw = self.store.get(nct_id)
+            if raw is None:
+                yield FetchResult(nct_id, error=KeyError(nct_id))
+            else:
+                yield FetchResult(nct_id, study=raw)
+
+    def count(
+        self,
+        expr: Optional[Expr] = None,
+        extra: Optional[dict[str, Any]] = None,
+    ) -> int:
+        _reject_extra(extra)
+        return len(self.index.evaluate(expr))
+
+    def search(
+        self,
+        expr: Optional[Expr] = None,
+        *,
+        fields: Optional[list[str]] = None,
+        project: Any = None,
+        offset: int = 0,
+        limit: Optional[int] = 100,
+        sort: str = "LastUpdatePostDate",
+        extra: Optional[dict[str, Any]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        _reject_extra(extra)
+        ids = self._sorted(self.index.evaluate(expr), sort)
+        end = None if limit is None else offset + limit
+        return (self.store.get(nct_id) for nct_id in ids[offset:end])
+
+    def _sorted(self, ids: set[str], sort: str) -> list[str]:
+        field, _, direction = sort.partition(":")
+        if field not in _SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field for local search: {field}")
+        reverse = (direction or _SORT_FIELDS[field]) == "desc"
+
+        if field == "NCTId":
+            return sorted(ids, reverse=reverse)
+        dates = self.index.last_update
+        # stable tie-break on NCT ID regardless of direction
+        ordered = sorted(ids)
+        ordered.sort(key=lambda nct_id: dates.get(nct_id, ""), reverse=reverse)
+        return ordered
+
+
+def _reject_extra(extra: Optional[dict[str, Any]]) -> None:
+    if extra:
+        raise ValueError("Raw `extra` params cannot be evaluated against the local mirror")
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal, Optional, Union
+
+UpsertStatus = Literal["inserted", "updated", "unchanged"]
+
+
+def study_nct_id(raw: dict[str, Any]) -> Optional[str]:
+    return raw.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+
+
+def study_last_update(raw: dict[str, Any]) -> Optional[str]:
+    """`lastUpdatePostDateStruct.date` of a raw study, e.g. "2025-03-14"."""
+    status = raw.get("protocolSection", {}).get("statusModule", {})
+    return (status.get("lastUpdatePostDateStruct") or {}).get("date")
+
+
+class StudyStore:
+    """
+    Local copy of raw v2 study documents in a single SQLite file.
+
+    Studies are keyed by NCT ID and stored as zlib-compressed JSON together with
+    their last update date and a content digest, so that re-upserting an
+    unchanged study is detected without rewriting it. The file also keeps the
+    high-water mark of the last successful sync.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike] = "ctgforge-mirror.sqlite") -> None:
+        self.path = os.fspath(path)
+        self._conn = sqlite3.connect(self.path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS studies ("
+                " nct_id TEXT PRIMARY KEY,"
+                " last_update TEXT,"
+                " digest TEXT NOT NULL,"
+                " payload BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "StudyStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM studies").fetchone()[0]
+
+    def __contains__(self, nct_id: object) -> bool:
+        row = self._conn.execute("SELECT 1 FROM studies WHERE nct_id = ?", (nct_id,)).fetchone()
+        return row is not None
+
+    # ------ studies ------
+
+    def get(self, nct_id: str) -> Optional[dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT payload FROM studies WHERE nct_id = ?", (nct_id,)
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def nct_ids(self) -> list[str]:
+        return [r[0] for r in self._conn.execute("SELECT nct_id FROM studies ORDER BY nct_id")]
+
+    def studies(self) -> Iterator[dict[str, Any]]:
+        """Iterate over every stored study, ordered by NCT ID."""
+        cur = self._conn.execute("SELECT payload FROM studies ORDER BY nct_id")
+        for (payload,) in cur:
+            yield _decode(payload)
+
+    def upsert(self, raw: dict[str, Any]) -> UpsertStatus:
+        """Insert or update one study and commit."""
+        with self._conn:
+            return self._upsert(raw)
+
+    def upsert_many(
+        self,
+        studies: Iterable[dict[str, Any]],
+        *,
+        batch_size: int = 500,
+    ) -> Iterator[tuple[str, UpsertStatus]]:
+        """Insert or update studies, committing every `batch_size` records."""
+        pending = 0
+        try:
+            for raw in studies:
+                status = self._upsert(raw)
+                pending += 1
+                if pending >= batch_size:
+                    self._conn.commit()
+                    pending = 0
+                yield study_nct_id(raw), status
+        finally:
+            self._conn.commit()
+
+    def delete(self, nct_id: str) -> bool:
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM studies WHERE nct_id = ?", (nct_id,))
+        return cur.rowcount > 0
+
+    # ------ sync metadata ------
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Latest `lastUpdatePostDate` covered by a completed sync, if any."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'high_water_mark'").fetchone()
+        return row[0] if row else None
+
+    @high_water_mark.setter
+    def high_water_mark(self, value: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('high_water_mark', ?)", (value,)
+            )
+
+    def max_last_update(self) -> Optional[str]:
+        return self._conn.execute("SELECT MAX(last_update) FROM studies").fetchone()[0]
+
+    # ------ internal helpers ------
+
+    def _upsert(self, raw: dict[str, Any]) -> UpsertStatus:
+        nct_id = study_nct_id(raw)
+        if not nct_id:
+            raise ValueError("Study has no protocolSection.identificationModule.nctId")
+
+        encoded = json.dumps(raw, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha1(encoded).hexdigest()
+
+        row = self._conn.execute(
+            "SELECT digest FROM studies WHERE nct_id = ?", (nct_id,)
+        ).fetchone()
+        if row is not None and row[0] == digest:
+            return "unchanged"
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO studies (nct_id, last_update, digest, payload)"
+            " VALUES (?, ?, ?, ?)",
+            (nct_id, study_last_update(raw), digest, zlib.compress(encoded)),
+        )
+        return "inserted" if row is None else "updated"
+
+
+def _decode(payload: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(payload))
@@ -0,0 +1,93 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from ..ctg import CTG
+from ..query.expr import Expr
+from .store import StudyStore, study_last_update
+
+
+@dataclass
+class SyncReport:
+    """What a sync run changed in the local store."""
+
+    since: Optional[str]  # high-water mark the run started from, None for a full load
+    high_water_mark: Optional[str]  # high-water mark after the run
+    inserted: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def fetched(self) -> int:
+        return len(self.inserted) + len(self.updated) + self.unchanged
+
+    @property
+    def changed(self) -> list[str]:
+        return self.inserted + self.updated
+
+
+def last_update_range(since: str) -> str:
+    """Essie expression matching studies updated on or after `since` (YYYY-MM-DD)."""
+    return f"AREA[LastUpdatePostDate]RANGE[{since},MAX]"
+
+
+def sync_mirror(
+    ctg: CTG,
+    store: StudyStore,
+    expr: Optional[Expr] = None,
+    *,
+    since: Optional[str] = None,
+    extra: Optional[dict[str, Any]] = None,
+    batch_size: int = 500,
+) -> SyncReport:
+    """
+    Bring `store` up to date with ClinicalTrials.gov.
+
+    Only studies whose LastUpdatePostDate is on or after the store's high-water mark
+    (or `since`, if given) are requested; the first run without either loads every
+    study matching `expr`. The range is inclusive, so studies posted later on the
+    high-water-mark day are picked up too and re-fetched ones that did not change
+    are reported as unchanged. The high-water mark only moves once the whole run
+    succeeded, so an interrupted sync is simply re-run.
+
+    Args:
+        ctg: client facade to fetch studies with
+        store: local study store to update
+        expr: optional DSL expression restricting the mirrored studies
+        since: override the stored high-water mark (YYYY-MM-DD)
+        extra: additional raw query params, as for CTG.search()
+        batch_size: number of upserts per store transaction
+    """
+    start = since or store.high_water_mark
+    params = dict(extra or {})
+    if start:
+        term = last_update_range(start)
+        params["query.term"] = (
+            f"({params['query.term']})+AND+{term}" if params.get("query.term") else term
+        )
+
+    report = SyncReport(since=start, high_water_mark=start)
+
+    raw = ctg.search(expr, limit=None, extra=params)
+    for nct_id, status in store.upsert_many(_track_latest(raw, report), batch_size=batch_size):
+        if status == "inserted":
+            report.inserted.append(nct_id)
+        elif status == "updated":
+            report.updated.append(nct_id)
+        else:
+            report.unchanged += 1
+
+    stored = store.high_water_mark
+    if report.high_water_mark and (stored is None or report.high_water_mark > stored):
+        store.high_water_mark = report.high_water_mark
+    return report
+
+
+def _track_latest(
+    studies: Iterable[dict[str, Any]], report: SyncReport
+) -> Iterator[dict[str, Any]]:
+    for raw in studies:
+        date = study_last_update(raw)
+        if date and (report.high_water_mark is None or date > report.high_water_mark):
+            report.high_water_mark = date
+        yield raw
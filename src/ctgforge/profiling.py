@@ -0,0 +1,309 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar, Union
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_MIB = 2**20
+
+
+@dataclass
+class StageStats:
+    """Totals of one pipeline stage, with one entry in `batches` per `batch_size` records."""
+
+    name: str
+    batch_size: int
+    records: int = 0
+    seconds: float = 0.0  # own time, excluding the profiled stages it pulls from
+    rss_peak: Optional[int] = None  # largest RSS sampled at the end of a batch, in bytes
+    traced_peak: Optional[int] = None  # largest tracemalloc peak while the stage ran
+    batches: list[dict[str, Any]] = field(default_factory=list)
+    _batch_records: int = 0
+    _batch_seconds: float = 0.0
+    _batch_traced: Optional[int] = None
+
+    @property
+    def records_per_s(self) -> Optional[float]:
+        return self.records / self.seconds if self.seconds > 0 else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "records": self.records,
+            "seconds": self.seconds,
+            "records_per_s": self.records_per_s,
+            "rss_peak_mib": _mib(self.rss_peak),
+            "traced_peak_mib": _mib(self.traced_peak),
+            "batches": list(self.batches),
+        }
+
+    def _close_batch(self) -> None:
+        if not self._batch_records and not self._batch_seconds:
+            return
+        rss = _rss()
+        if rss is not None:
+            self.rss_peak = rss if self.rss_peak is None else max(self.rss_peak, rss)
+        self.batches.append(
+            {
+                "records": self._batch_records,
+                "seconds": self._batch_seconds,
+                "records_per_s": (
+                    self._batch_records / self._batch_seconds if self._batch_seconds > 0 else None
+                ),
+                "rss_mib": _mib(rss),
+                "traced_peak_mib": _mib(self._batch_traced),
+            }
+        )
+        self._batch_records = 0
+        self._batch_seconds = 0.0
+        self._batch_traced = None
+
+
+@dataclass
+class _Frame:
+    stage: StageStats
+    start: float
+    child_seconds: float = 0.0
+    traced_peak: int = 0
+
+
+class PipelineProfiler:
+    """
+    Opt-in profiler for the stages of a pipeline, e.g. search -> flatten -> export.
+
+    Usage:
+        with PipelineProfiler(memory=True) as profiler:
+            raws = profiler.wrap("search", client.search(query, limit=None))
+            trials = profiler.map("flatten_core", flatten_core, raws)
+            with profiler.stage("to_dataframe") as stage:
+                df = to_dataframe(trials)
+                stage.records += len(df)
+        print(profiler.report())
+        profiler.write_json("profile.json")
+
+    Stages may be lazy and chained: a stage's time excludes the time spent in the
+    profiled stages it pulls records from, so above, to_dataframe is charged for
+    building the frame only, and flatten_core for flattening only. Unprofiled work
+    done inside a stage (a plain generator it consumes) is charged to that stage.
+
+    Each stage is split into batches of `batch_size` records, each with its own
+    records/s and, sampled at its end, the process RSS. With `memory`, tracemalloc
+    is started (if it is not tracing already) and the peak of traced memory is
+    recorded per stage and batch; this slows Python allocations down considerably,
+    so compare records/s between runs with the same setting.
+
+    With `enabled=False` every method passes its input through untouched, so
+    production jobs can keep the calls and turn profiling on by configuration.
+    Not thread-safe: profile one pipeline per profiler.
+    """
+
+    def __init__(self, *, enabled: bool = True, memory: bool = False, batch_size: int = 1000):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.batch_size = batch_size
+        self.stages: dict[str, StageStats] = {}
+        self.wall_seconds = 0.0
+        self._stack: list[_Frame] = []
+        self._started: Optional[float] = None
+        self._owns_tracemalloc = False
+
+    def __enter__(self) -> "PipelineProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if not self.enabled or self._started is not None:
+            return
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._started is None:
+            return
+        self.wall_seconds += time.perf_counter() - self._started
+        self._started = None
+        for stats in self.stages.values():
+            stats._close_batch()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    # ------ instrumentation ------
+
+    def wrap(
+        self, name: str, items: Iterable[T], *, batch_size: Optional[int] = None
+    ) -> Iterator[T]:
+        """Profile producing the items of `items` as stage `name`, one record per item."""
+        if not self.enabled:
+            return iter(items)
+        return self._wrap(self._stage(name, batch_size), items)
+
+    def map(
+        self,
+        name: str,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        *,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[R]:
+        """Lazily apply `fn` to each item as stage `name`."""
+        return self.wrap(name, map(fn, items), batch_size=batch_size)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        """
+        Profile the block as one batch of stage `name`. Add the number of records
+        it handled to `records` of the yielded StageStats.
+        """
+        if not self.enabled:
+            yield StageStats(name, self.batch_size)
+            return
+        stats = self._stage(name, None)
+        before = stats.records
+        self._enter(stats)
+        try:
+            yield stats
+        finally:
+            self._exit()
+            stats._batch_records += stats.records - before
+            stats._close_batch()
+
+    # ------ reporting ------
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-stage totals and batches as plain data, e.g. for JSON."""
+        wall = self.wall_seconds
+        if self._started is not None:
+            wall += time.perf_counter() - self._started
+        profiled = sum(stats.seconds for stats in self.stages.values())
+        return {
+            "wall_seconds": wall,
+            "unprofiled_seconds": max(0.0, wall - profiled),
+            "max_rss_mib": _mib(_max_rss()),
+            "memory": self.memory,
+            "stages": [stats.to_dict() for stats in self.stages.values()],
+        }
+
+    def report(self) -> str:
+        """Human-readable table of the stages."""
+        snap = self.snapshot()
+        lines = [
+            f"{'stage':<24}{'records':>10}{'seconds':>10}{'records/s':>12}{'batches':>9}"
+            f"{'min rec/s':>11}{'rss MiB':>10}{'traced MiB':>12}"
+        ]
+        for stage in snap["stages"]:
+            rates = [b["records_per_s"] for b in stage["batches"] if b["records_per_s"]]
+            lines.append(
+                f"{stage['name']:<24}{stage['records']:>10,}{stage['seconds']:>10.2f}"
+                f"{_fmt(stage['records_per_s'], ',.0f'):>12}{len(stage['batches']):>9}"
+                f"{_fmt(min(rates) if rates else None, ',.0f'):>11}"
+                f"{_fmt(stage['rss_peak_mib'], '.1f'):>10}"
+                f"{_fmt(stage['traced_peak_mib'], '.1f'):>12}"
+            )
+        lines.append(f"{'(outside stages)':<24}{'':>10}{snap['unprofiled_seconds']:>10.2f}")
+        lines.append(
+            f"wall {snap['wall_seconds']:.2f} s, max RSS {_fmt(snap['max_rss_mib'], '.1f')} MiB"
+        )
+        return "\n".join(lines)
+
+    def write_json(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+            f.write("\n")
+
+    # ------ internal helpers ------
+
+    def _stage(self, name: str, batch_size: Optional[int]) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name, batch_size or self.batch_size)
+        return stats
+
+    def _wrap(self, stats: StageStats, items: Iterable[T]) -> Iterator[T]:
+        iterator = iter(items)
+        while True:
+            self._enter(stats)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._exit()
+                stats._close_batch()
+                return
+            except BaseException:
+                self._exit()
+                raise
+            self._exit()
+            stats.records += 1
+            stats._batch_records += 1
+            if stats._batch_records >= stats.batch_size:
+                stats._close_batch()
+            yield item
+
+    def _enter(self, stats: StageStats) -> None:
+        if self._started is None:
+            self.start()
+        if self.memory and tracemalloc.is_tracing():
+            if self._stack:
+                parent = self._stack[-1]
+                parent.traced_peak = max(parent.traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append(_Frame(stats, time.perf_counter()))
+
+    def _exit(self) -> None:
+        frame = self._stack.pop()
+        elapsed = time.perf_counter() - frame.start
+        own = elapsed - frame.child_seconds
+        stats = frame.stage
+        stats.seconds += own
+        stats._batch_seconds += own
+        if self._stack:
+            self._stack[-1].child_seconds += elapsed
+
+        if self.memory and tracemalloc.is_tracing():
+            peak = max(frame.traced_peak, tracemalloc.get_traced_memory()[1])
+            stats.traced_peak = max(stats.traced_peak or 0, peak)
+            stats._batch_traced = max(stats._batch_traced or 0, peak)
+            tracemalloc.reset_peak()
+
+
+def _rss() -> Optional[int]:
+    """Current resident set size in bytes, or the peak where the current one is unknown."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return _max_rss()
+
+
+def _max_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def _mib(n: Optional[int]) -> Optional[float]:
+    return None if n is None else round(n / _MIB, 1)
+
+
+def _fmt(value: Optional[float], spec: str) -> str:
+    return "-" if value is None else format(value, spec)
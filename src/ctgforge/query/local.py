@@ -0,0 +1,202 @@
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any, Callable, Optional
+
+from .compiler import QueryCompilerError
+from .expr import And, Expr, Not, Or, Term
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _names(items: Iterable[dict[str, Any]], key: str) -> list[str]:
+    return [item[key] for item in items if item.get(key)]
+
+
+def _condition_texts(raw: dict[str, Any]) -> list[str]:
+    p = raw.get("protocolSection", {})
+    conds = p.get("conditionsModule", {})
+    browse = raw.get("derivedSection", {}).get("conditionBrowseModule", {})
+    return (
+        conds.get("conditions", [])
+        + conds.get("keywords", [])
+        + _names(browse.get("meshes", []), "term")
+    )
+
+
+def _sponsor_texts(raw: dict[str, Any]) -> list[str]:
+    sponsor = raw.get("protocolSection", {}).get("sponsorCollaboratorsModule", {})
+    return _names([sponsor.get("leadSponsor", {})], "name") + _names(
+        sponsor.get("collaborators", []), "name"
+    )
+
+
+def _intervention_texts(raw: dict[str, Any]) -> list[str]:
+    arms = raw.get("protocolSection", {}).get("armsInterventionsModule", {})
+    browse = raw.get("derivedSection", {}).get("interventionBrowseModule", {})
+    texts = []
+    for intr in arms.get("interventions", []):
+        texts += _names([intr], "name") + intr.get("otherNames", [])
+    return texts + _names(browse.get("meshes", []), "term")
+
+
+def _title_texts(raw: dict[str, Any]) -> list[str]:
+    ident = raw.get("protocolSection", {}).get("identificationModule", {})
+    return [ident[k] for k in ("briefTitle", "officialTitle", "acronym") if ident.get(k)]
+
+
+def _status_values(raw: dict[str, Any]) -> list[str]:
+    status = raw.get("protocolSection", {}).get("statusModule", {}).get("overallStatus")
+    return [status] if status else []
+
+
+def _phase_values(raw: dict[str, Any]) -> list[str]:
+    return raw.get("protocolSection", {}).get("designModule", {}).get("phases", [])
+
+
+# DSL field key -> where its values live in a raw v2 study. "query" fields are
+# matched as free text, the others by exact value (like their filter.* params).
+TEXT_FIELDS: dict[str, Callable[[dict[str, Any]], list[str]]] = {
+    "condition": _condition_texts,
+    "sponsor": _sponsor_texts,
+    "intervention": _intervention_texts,
+    "title": _title_texts,
+}
+VALUE_FIELDS: dict[str, Callable[[dict[str, Any]], list[str]]] = {
+    "status": _status_values,
+    "phase": _phase_values,
+}
+
+
+class LocalIndex:
+    """
+    In-memory inverted indexes over raw v2 studies, the local counterpart of
+    compile_to_params(): `evaluate(expr)` answers a DSL expression with a set of
+    NCT IDs without any HTTP request.
+
+    Matching approximates the remote search areas:
+      - eq(v): the phrase `v` occurs in the field (case-insensitive)
+      - contains(v): every word of `v` occurs in the field
+      - in_([...]): any of the phrases occurs
+    Status and phase match values exactly. Unlike the remote compiler, OR and NOT
+    work across fields.
+    """
+
+    def __init__(self) -> None:
+        self.nct_ids: set[str] = set()
+        self.last_update: dict[str, str] = {}
+
+        # field -> token -> NCT IDs, for text fields
+        self._postings: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+        # field -> NCT ID -> normalized texts, to verify phrase matches
+        self._texts: dict[str, dict[str, list[str]]] = defaultdict(dict)
+        # field -> value -> NCT IDs, for exact-value fields
+        self._values: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+
+    @classmethod
+    def from_studies(cls, studies: Iterable[dict[str, Any]]) -> "LocalIndex":
+        index = cls()
+        for raw in studies:
+            index.add(raw)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.nct_ids)
+
+    def add(self, raw: dict[str, Any]) -> None:
+        """Index one raw study; re-adding an NCT ID replaces its previous entry."""
+        p = raw.get("protocolSection", {})
+        nct_id = p.get("identificationModule", {}).get("nctId")
+        if not nct_id:
+            raise ValueError("Study has no protocolSection.identificationModule.nctId")
+        if nct_id in self.nct_ids:
+            self.remove(nct_id)
+
+        self.nct_ids.add(nct_id)
+        date = (p.get("statusModule", {}).get("lastUpdatePostDateStruct") or {}).get("date")
+        if date:
+            self.last_update[nct_id] = date
+
+        for key, extract in TEXT_FIELDS.items():
+            texts = [" ".join(_tokens(t)) for t in extract(raw)]
+            self._texts[key][nct_id] = texts
+            postings = self._postings[key]
+            for text in texts:
+                for token in text.split():
+                    postings[token].add(nct_id)
+
+        for key, extract in VALUE_FIELDS.items():
+            for value in extract(raw):
+                self._values[key][value.upper()].add(nct_id)
+
+    def remove(self, nct_id: str) -> None:
+        if nct_id not in self.nct_ids:
+            return
+        self.nct_ids.discard(nct_id)
+        self.last_update.pop(nct_id, None)
+
+        for key, texts in self._texts.items():
+            postings = self._postings[key]
+            for text in texts.pop(nct_id, []):
+                for token in text.split():
+                    postings[token].discard(nct_id)
+        for values in self._values.values():
+            for ids in values.values():
+                ids.discard(nct_id)
+
+    def evaluate(self, expr: Optional[Expr]) -> set[str]:
+        """NCT IDs of the indexed studies matching `expr` (all of them for None)."""
+        if expr is None:
+            return set(self.nct_ids)
+        if isinstance(expr, Term):
+            return self._match_term(expr)
+        if isinstance(expr, And):
+            return self.evaluate(expr.left) & self.evaluate(expr.right)
+        if isinstance(expr, Or):
+            return self.evaluate(expr.left) | self.evaluate(expr.right)
+        if isinstance(expr, Not):
+            return self.nct_ids - self.evaluate(expr.expr)
+        raise TypeError(expr)
+
+    # ------ internal helpers ------
+
+    def _match_term(self, t: Term) -> set[str]:
+        key = t.field.key
+        if key in VALUE_FIELDS:
+            values = self._values[key]
+            if t.op == "eq":
+                return set(values.get(str(t.value).upper(), ()))
+            if t.op == "in":
+                return set().union(*(values.get(str(v).upper(), ()) for v in t.value))
+            raise QueryCompilerError(f"Unsupported op for {key}: {t.op}")
+
+        if key not in TEXT_FIELDS:
+            raise QueryCompilerError(f"Field {key!r} is not indexed locally")
+        if t.op == "eq":
+            return self._match_phrase(key, str(t.value))
+        if t.op == "contains":
+            return self._match_words(key, str(t.value))
+        if t.op == "in":
+            return set().union(*(self._match_phrase(key, str(v)) for v in t.value))
+        raise QueryCompilerError(f"Unsupported op: {t.op}")
+
+    def _match_words(self, key: str, value: str) -> set[str]:
+        postings = self._postings[key]
+        tokens = _tokens(value)
+        if not tokens:
+            return set()
+        # intersect the rarest posting lists first
+        lists = sorted((postings.get(token, set()) for token in tokens), key=len)
+        return set(lists[0]).intersection(*lists[1:])
+
+    def _match_phrase(self, key: str, value: str) -> set[str]:
+        candidates = self._match_words(key, value)
+        phrase = f" {' '.join(_tokens(value))} "
+        texts = self._texts[key]
+        return {
+            nct_id for nct_id in candidates if any(phrase in f" {text} " for text in texts[nct_id])
+        }
@@ -0,0 +1,12 @@
+from .corpus import CorpusConfig, SyntheticCorpus, synthetic_queries, synthetic_studies
+from .server import FakeCTGServer, Faults, ServedRequest
+
+__all__ = [
+    "CorpusConfig",
+    "FakeCTGServer",
+    "Faults",
+    "ServedRequest",
+    "SyntheticCorpus",
+    "synthetic_queries",
+    "synthetic_studies",
+]
@@ -0,0 +1,493 @@
+import random
+import zlib
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Optional
+
+from ..query.expr import Expr
+from ..query.fields import F
+
+_CONDITIONS = (
+    "Breast Cancer",
+    "Non-small Cell Lung Cancer",
+    "Type 2 Diabetes Mellitus",
+    "Hypertension",
+    "Major Depressive Disorder",
+    "Asthma",
+    "Obesity",
+    "Alzheimer Disease",
+    "HIV Infections",
+    "Rheumatoid Arthritis",
+    "Prostate Cancer",
+    "Heart Failure",
+    "Multiple Sclerosis",
+    "Chronic Kidney Disease",
+    "COVID-19",
+    "Parkinson Disease",
+    "Schizophrenia",
+    "Psoriasis",
+    "Stroke",
+    "Colorectal Neoplasms",
+)
+_INTERVENTIONS = (
+    "Pembrolizumab",
+    "Metformin",
+    "Placebo",
+    "Carboplatin",
+    "Nivolumab",
+    "Cognitive Behavioral Therapy",
+    "Adalimumab",
+    "Semaglutide",
+    "Aspirin",
+    "Exercise Training",
+    "Radiotherapy",
+    "Dexamethasone",
+    "Tocilizumab",
+    "Insulin Glargine",
+    "Atorvastatin",
+)
+_INTERVENTION_TYPES = (
+    "DRUG",
+    "DRUG",
+    "DRUG",
+    "BIOLOGICAL",
+    "DEVICE",
+    "PROCEDURE",
+    "BEHAVIORAL",
+    "RADIATION",
+    "DIETARY_SUPPLEMENT",
+    "OTHER",
+)
+_SPONSORS = (
+    "National Cancer Institute",
+    "Pfizer",
+    "Merck Sharp & Dohme LLC",
+    "Assiut University",
+    "Mayo Clinic",
+    "AstraZeneca",
+    "Novartis Pharmaceuticals",
+    "M.D. Anderson Cancer Center",
+    "Cairo University",
+    "Massachusetts General Hospital",
+    "GlaxoSmithKline",
+    "Sanofi",
+)
+_SPONSOR_CLASSES = ("OTHER", "OTHER", "INDUSTRY", "INDUSTRY", "NIH", "OTHER_GOV", "NETWORK")
+_STATUSES = (
+    ("COMPLETED", 45),
+    ("RECRUITING", 15),
+    ("UNKNOWN", 14),
+    ("ACTIVE_NOT_RECRUITING", 6),
+    ("TERMINATED", 6),
+    ("NOT_YET_RECRUITING", 5),
+    ("WITHDRAWN", 4),
+    ("ENROLLING_BY_INVITATION", 3),
+    ("SUSPENDED", 2),
+)
+_STUDY_TYPES = (("INTERVENTIONAL", 77), ("OBSERVATIONAL", 22), ("EXPANDED_ACCESS", 1))
+_PHASES = ("EARLY_PHASE1", "PHASE1", "PHASE2", "PHASE3", "PHASE4", "NA")
+_ARM_TYPES = ("EXPERIMENTAL", "ACTIVE_COMPARATOR", "PLACEBO_COMPARATOR", "NO_INTERVENTION", "OTHER")
+_WORDS = (
+    "patients participants randomized study trial treatment dose safety efficacy "
+    "primary secondary outcome endpoint baseline placebo group weeks months daily "
+    "response survival progression adverse events cohort open-label double-blind "
+    "assess evaluate compare investigate improve reduce risk quality life clinical"
+).split()
+_TEXT_WORDS = 1 << 16
+
+
+@dataclass(frozen=True)
+class CorpusConfig:
+    """
+    Shape of a synthetic corpus. List sizes are inclusive (min, max) ranges drawn
+    uniformly per study; condition, intervention and sponsor names are drawn from
+    vocabularies of `vocabulary` entries with Zipf(`skew`) popularity, so a few
+    of them recur across many studies, as in the registry (0 is uniform).
+    """
+
+    conditions: tuple[int, int] = (1, 4)
+    interventions: tuple[int, int] = (1, 4)
+    arm_groups: tuple[int, int] = (1, 3)
+    collaborators: tuple[int, int] = (0, 2)
+    phases: tuple[int, int] = (1, 2)
+    other_names: tuple[int, int] = (0, 2)
+    summary_words: tuple[int, int] = (30, 120)
+    description_words: tuple[int, int] = (0, 400)
+    vocabulary: int = 5_000
+    skew: float = 1.1
+    mesh_rate: float = 0.7  # fraction of conditions/interventions with a MeSH term
+    results_rate: float = 0.3
+    # also generate the modules flatten_core does not read (eligibility, locations,
+    # outcomes, MeSH trees, and results and documents for studies with results)
+    full_documents: bool = False
+
+
+class SyntheticCorpus:
+    """
+    Deterministic generator of realistic v2 study documents.
+
+    Study `i` has NCT ID `NCT{i:08d}` and depends only on `seed` and `i`, so a
+    corpus can be streamed in order with studies() or accessed at random with
+    study(), e.g. by a fake server, without materializing it.
+
+    Usage:
+        corpus = SyntheticCorpus(seed=1, config=CorpusConfig(conditions=(1, 10)))
+        for raw in corpus.studies(100_000):
+            ...
+    """
+
+    def __init__(self, *, seed: int = 0, config: Optional[CorpusConfig] = None) -> None:
+        self.seed = seed
+        self.config = config or CorpusConfig()
+        self._rng = random.Random()
+        size = self.config.vocabulary
+        self._vocab = range(size)
+        self._cum_weights = list(
+            accumulate(1.0 / (rank + 1) ** self.config.skew for rank in range(size))
+        )
+        self._statuses, self._status_weights = _split(_STATUSES)
+        self._types, self._type_weights = _split(_STUDY_TYPES)
+
+        # free text is cut out of one long random word sequence
+        words = random.Random(seed).choices(_WORDS, k=_TEXT_WORDS)
+        self._text_pool = " ".join(words) + " "
+        self._word_starts = list(accumulate((len(w) + 1 for w in words), initial=0))
+
+    def studies(self, n: int, *, start: int = 0) -> Iterator[dict[str, Any]]:
+        """Studies start .. start + n - 1, generated lazily."""
+        for i in range(start, start + n):
+            yield self.study(i)
+
+    def study(self, i: int) -> dict[str, Any]:
+        """The i-th study of the corpus."""
+        rng = self._rng
+        rng.seed(self.seed * 1_000_003 + i)
+        cfg = self.config
+
+        conditions = [(_name(_CONDITIONS, k), k) for k in self._draw(cfg.conditions)]
+        interventions = [
+            (_name(_INTERVENTIONS, k), _INTERVENTION_TYPES[k % len(_INTERVENTION_TYPES)], k)
+            for k in self._draw(cfg.interventions)
+        ]
+        labels = [f"Arm {chr(65 + j)}" for j in range(self._between(*cfg.arm_groups))]
+        arm_of = [rng.sample(labels, self._between(1, len(labels))) for _ in interventions]
+        lead, *collaborators = self._draw((1 + cfg.collaborators[0], 1 + cfg.collaborators[1]))
+
+        study_type = rng.choices(self._types, self._type_weights)[0]
+        phases = (
+            sorted(rng.sample(_PHASES, self._between(*cfg.phases)), key=_PHASES.index)
+            if study_type == "INTERVENTIONAL"
+            else []
+        )
+        year, month = 1999 + self._below(27), 1 + self._below(12)
+        done = year + 1 + self._below(6)
+        updated = f"{2015 + self._below(11)}-{1 + self._below(12):02d}-{1 + self._below(28):02d}"
+
+        study = {
+            "protocolSection": {
+                "identificationModule": {
+                    "nctId": f"NCT{i:08d}",
+                    "briefTitle": f"A Study of {interventions[0][0]} in {conditions[0][0]}",
+                    "officialTitle": self._text(12, 12).capitalize(),
+                },
+                "statusModule": {
+                    "overallStatus": rng.choices(self._statuses, self._status_weights)[0],
+                    "startDateStruct": {"date": f"{year}-{month:02d}", "type": "ACTUAL"},
+                    "primaryCompletionDateStruct": {
+                        "date": f"{done}-{month:02d}-15",
+                        "type": "ESTIMATED",
+                    },
+                    "completionDateStruct": {"date": f"{done}-{month:02d}-28", "type": "ACTUAL"},
+                    "lastUpdatePostDateStruct": {"date": updated, "type": "ACTUAL"},
+                },
+                "sponsorCollaboratorsModule": {
+                    "leadSponsor": _sponsor(lead),
+                    "collaborators": [_sponsor(k) for k in collaborators],
+                },
+                "descriptionModule": {
+                    "briefSummary": self._text(*cfg.summary_words),
+                    "detailedDescription": self._text(*cfg.description_words),
+                },
+                "conditionsModule": {"conditions": [name for name, _ in conditions]},
+                "designModule": {"studyType": study_type, "phases": phases},
+                "armsInterventionsModule": {
+                    "armGroups": [
+                        {
+                            "label": label,
+                            "type": _ARM_TYPES[j % len(_ARM_TYPES)],
+                            "description": self._text(5, 20),
+                            "interventionNames": [
+                                f"{kind.title()}: {name}"
+                                for (name, kind, _), arms in zip(interventions, arm_of)
+                                if label in arms
+                            ],
+                        }
+                        for j, label in enumerate(labels)
+                    ],
+                    "interventions": [
+                        {
+                            "type": kind,
+                            "name": name,
+                            "description": self._text(5, 30),
+                            "otherNames": [
+                                f"{name[:3].upper()}-{k}{j}"
+                                for j in range(self._between(*cfg.other_names))
+                            ],
+                            "armGroupLabels": arms,
+                        }
+                        for (name, kind, k), arms in zip(interventions, arm_of)
+                    ],
+                },
+            },
+            "derivedSection": {
+                "conditionBrowseModule": {
+                    "meshes": [
+                        {"id": f"D{k:06d}", "term": name}
+                        for name, k in conditions
+                        if self._has_mesh(name)
+                    ],
+                },
+                "interventionBrowseModule": {
+                    "meshes": [
+                        {"id": f"C{k:06d}", "term": name}
+                        for name, _, k in interventions
+                        if self._has_mesh(name)
+                    ],
+                },
+            },
+            "hasResults": rng.random() < cfg.results_rate,
+        }
+        if cfg.full_documents:
+            # drawn after everything else, so the other fields match the lean documents
+            self._add_full_sections(study, [name for name, _ in conditions], labels)
+        return study
+
+    def _add_full_sections(
+        self, study: dict[str, Any], conditions: list[str], labels: list[str]
+    ) -> None:
+        """The rest of a registry record, with sizes in the range of real ones."""
+        protocol, derived = study["protocolSection"], study["derivedSection"]
+        outcomes = [
+            {
+                "measure": self._text(3, 12),
+                "description": self._text(10, 50),
+                "timeFrame": "Week 24",
+            }
+            for _ in range(self._between(1, 12))
+        ]
+        protocol["eligibilityModule"] = {
+            "eligibilityCriteria": self._text(80, 600),
+            "healthyVolunteers": self._below(4) == 0,
+            "sex": ("ALL", "FEMALE", "MALE")[self._below(3)],
+            "minimumAge": f"{18 + self._below(10)} Years",
+            "stdAges": ["ADULT", "OLDER_ADULT"],
+        }
+        protocol["contactsLocationsModule"] = {
+            "overallOfficials": [{"name": self._text(2, 2).title(), "role": "STUDY_CHAIR"}],
+            "locations": [
+                {
+                    "facility": f"{self._text(2, 4).title()} Hospital",
+                    "status": "RECRUITING",
+                    "city": self._text(1, 2).title(),
+                    "zip": f"{self._below(100_000):05d}",
+                    "country": "United States",
+                    "geoPoint": {
+                        "lat": self._rng.uniform(-60, 70),
+                        "lon": self._rng.uniform(-180, 180),
+                    },
+                }
+                for _ in range(self._between(1, 25))
+            ],
+        }
+        protocol["outcomesModule"] = {
+            "primaryOutcomes": outcomes[:1],
+            "secondaryOutcomes": outcomes[1:],
+        }
+        for module in ("conditionBrowseModule", "interventionBrowseModule"):
+            derived[module]["ancestors"] = [
+                {"id": f"D{self._below(1_000_000):06d}", "term": self._text(1, 3).title()}
+                for _ in range(self._between(2, 10))
+            ]
+            derived[module]["browseLeaves"] = [
+                {
+                    "id": f"M{self._below(1_000_000)}",
+                    "name": self._text(1, 3).title(),
+                    "asFound": self._text(1, 2),
+                    "relevance": ("HIGH", "LOW")[self._below(2)],
+                }
+                for _ in range(self._between(5, 30))
+            ]
+            derived[module]["browseBranches"] = [
+                {"abbrev": f"BC{self._below(30):02d}", "name": self._text(2, 5).title()}
+                for _ in range(self._between(1, 5))
+            ]
+        derived["miscInfoModule"] = {"versionHolder": "2026-10-15"}
+        if not study["hasResults"]:
+            return
+
+        groups = [{"id": f"EG{j:03d}", "title": label} for j, label in enumerate(labels)]
+        study["resultsSection"] = {
+            "participantFlowModule": {
+                "groups": [{**g, "description": self._text(5, 30)} for g in groups],
+                "periods": [
+                    {
+                        "title": "Overall Study",
+                        "milestones": [
+                            {
+                                "type": kind,
+                                "achievements": [
+                                    {"groupId": g["id"], "numSubjects": str(self._below(500))}
+                                    for g in groups
+                                ],
+                            }
+                            for kind in ("STARTED", "COMPLETED", "NOT COMPLETED")
+                        ],
+                    }
+                ],
+            },
+            "baselineCharacteristicsModule": {
+                "measures": [self._measure(groups) for _ in range(self._between(3, 10))],
+            },
+            "outcomeMeasuresModule": {
+                "outcomeMeasures": [
+                    {
+                        **outcome,
+                        "type": "PRIMARY" if j == 0 else "SECONDARY",
+                        **self._measure(groups),
+                    }
+                    for j, outcome in enumerate(outcomes)
+                ],
+            },
+            "adverseEventsModule": {
+                "frequencyThreshold": "5",
+                "timeFrame": "Up to 2 years",
+                "seriousEvents": self._events(groups),
+                "otherEvents": self._events(groups),
+            },
+        }
+        study["documentSection"] = {
+            "largeDocumentModule": {
+                "largeDocs": [
+                    {
+                        "typeAbbrev": kind,
+                        "hasProtocol": kind == "Prot",
+                        "hasSap": kind == "SAP",
+                        "date": "2020-01-15",
+                        "uploadDate": "2021-03-02T10:15",
+                        "filename": f"{kind}_{self._below(1000):03d}.pdf",
+                        "size": self._below(5_000_000),
+                    }
+                    for kind in ("Prot", "SAP")[: self._between(1, 2)]
+                ],
+            },
+        }
+
+    def _measure(self, groups: list[dict[str, str]]) -> dict[str, Any]:
+        return {
+            "title": self._text(2, 8),
+            "paramType": "MEAN",
+            "dispersionType": "STANDARD_DEVIATION",
+            "unitOfMeasure": "units",
+            "classes": [
+                {
+                    "categories": [
+                        {
+                            "measurements": [
+                                {
+                                    "groupId": g["id"],
+                                    "value": f"{self._rng.uniform(0, 100):.1f}",
+                                    "spread": f"{self._rng.uniform(0, 20):.2f}",
+                                }
+                                for g in groups
+                            ]
+                        }
+                    ]
+                }
+            ],
+        }
+
+    def _events(self, groups: list[dict[str, str]]) -> list[dict[str, Any]]:
+        return [
+            {
+                "term": self._text(1, 4).title(),
+                "organSystem": self._text(2, 5).title(),
+                "sourceVocabulary": "MedDRA 23.0",
+                "assessmentType": "SYSTEMATIC_ASSESSMENT",
+                "stats": [
+                    {
+                        "groupId": g["id"],
+                        "numEvents": self._below(20),
+                        "numAffected": self._below(20),
+                        "numAtRisk": 100 + self._below(400),
+                    }
+                    for g in groups
+                ],
+            }
+            for _ in range(self._between(5, 40))
+        ]
+
+    def _draw(self, size: tuple[int, int]) -> list[int]:
+        """Distinct vocabulary entries, as many as a draw from `size`."""
+        k = min(self._between(*size), len(self._vocab))
+        picked: dict[int, None] = {}
+        while len(picked) < k:
+            picked.update(
+                dict.fromkeys(
+                    self._rng.choices(self._vocab, cum_weights=self._cum_weights, k=k - len(picked))
+                )
+            )
+        return list(picked)
+
+    def _below(self, n: int) -> int:
+        # cheaper than randrange() and good enough here
+        return int(self._rng.random() * n)
+
+    def _between(self, lo: int, hi: int) -> int:
+        return lo + int(self._rng.random() * (hi - lo + 1))
+
+    def _text(self, lo: int, hi: int) -> str:
+        k = self._between(lo, hi)
+        first = self._below(_TEXT_WORDS - k + 1)
+        return self._text_pool[self._word_starts[first] : self._word_starts[first + k] - 1]
+
+    def _has_mesh(self, name: str) -> bool:
+        # stable per name, so a term has a MeSH ID in every study or in none
+        return zlib.crc32(name.encode()) % 1000 < self.config.mesh_rate * 1000
+
+
+def synthetic_studies(
+    n: int, *, seed: int = 0, config: Optional[CorpusConfig] = None
+) -> Iterator[dict[str, Any]]:
+    """`n` synthetic studies, generated lazily; see SyntheticCorpus."""
+    return SyntheticCorpus(seed=seed, config=config).studies(n)
+
+
+def synthetic_queries(n: int, *, seed: int = 0) -> Iterator[Expr]:
+    """`n` F expressions of one to five terms, as compile_to_params() takes them."""
+    rng = random.Random(seed)
+    statuses = [status for status, _ in _STATUSES]
+    for _ in range(n):
+        expr: Expr = F.condition.contains(rng.choice(_CONDITIONS))
+        if rng.random() < 0.5:
+            expr = expr | F.condition.eq(rng.choice(_CONDITIONS))
+        if rng.random() < 0.5:
+            expr = expr & F.intervention.contains(rng.choice(_INTERVENTIONS))
+        if rng.random() < 0.5:
+            expr = expr & F.status.in_(rng.sample(statuses, rng.randint(1, 3)))
+        if rng.random() < 0.5:
+            expr = expr & F.phase.in_(rng.sample(_PHASES[:5], rng.randint(1, 2)))
+        yield expr
+
+
+def _name(base: Sequence[str], k: int) -> str:
+    name = base[k % len(base)]
+    return name if k < len(base) else f"{name} {k // len(base) + 1}"
+
+
+def _sponsor(k: int) -> dict[str, str]:
+    return {"name": _name(_SPONSORS, k), "class": _SPONSOR_CLASSES[k % len(_SPONSOR_CLASSES)]}
+
+
+def _split(weighted: Sequence[tuple[str, int]]) -> tuple[list[str], list[int]]:
+    return [value for value, _ in weighted], [weight for _, weight in weighted]
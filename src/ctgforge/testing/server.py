@@ -0,0 +1,357 @@
+import base64
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from .corpus import CorpusConfig, SyntheticCorpus
+
+API_PREFIX = "/api/v2"
+MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = 10
+
+# `fields` entries other than dotted paths; the real API knows many more piece names
+_PIECES = {"NCTId": "protocolSection.identificationModule.nctId"}
+_ROOTS = {"protocolSection", "derivedSection", "resultsSection", "documentSection", "hasResults"}
+# params that don't change which studies match, so pageTokens stay valid across them
+_PAGING_PARAMS = {"pageToken", "pageSize", "fields", "countTotal", "format"}
+
+
+@dataclass
+class Faults:
+    """
+    Failures injected by FakeCTGServer. Random errors are drawn from a generator
+    seeded with `seed`, so a run is reproducible for a given request order.
+    """
+
+    latency: float = 0.0  # seconds added to every response
+    error_rate: float = 0.0  # fraction of requests answered with `error_status`
+    error_status: int = 503
+    rate_limit: Optional[float] = None  # requests per second before 429s
+    burst: Optional[float] = None  # requests allowed at once; defaults to `rate_limit`
+    retry_after: Optional[float] = None  # Retry-After sent with 429s; None: time to next token
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class ServedRequest:
+    """One request as the server saw it."""
+
+    path: str
+    params: dict[str, str]
+    status: int
+    time: float  # time.monotonic() at arrival
+
+
+class FakeCTGServer:
+    """
+    Loopback HTTP stand-in for the ClinicalTrials.gov v2 API, for offline
+    transport tests and load tests.
+
+    Serves `/api/v2/studies` and `/api/v2/studies/{nct_id}` from a fixture corpus
+    (a list of raw studies, or the first `n_studies` of a SyntheticCorpus shaped
+    by `config`) with the API's paging: opaque pageTokens bound to the query,
+    pageSize up to 1000, countTotal, `fields` projection (dotted paths, plus
+    `NCTId`) and `filter.ids`. Other query parameters are accepted but do not
+    filter. Latency, errors and rate limits are injected through `faults` or
+    fail_next(), and every request is logged in `requests`.
+
+    Usage:
+        with FakeCTGServer(n_studies=5_000, faults=Faults(rate_limit=50)) as server:
+            client = CTG(client=CTGHttpxClient(base_url=server.url))
+            ...
+        print(server.statuses())
+    """
+
+    def __init__(
+        self,
+        studies: Optional[Sequence[dict[str, Any]]] = None,
+        *,
+        n_studies: int = 1_000,
+        seed: int = 0,
+        config: Optional[CorpusConfig] = None,
+        faults: Optional[Faults] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if studies is not None:
+            self._studies: Union[Sequence[dict[str, Any]], SyntheticCorpus] = studies
+            self._size = len(studies)
+            self._index = {
+                s["protocolSection"]["identificationModule"]["nctId"]: i
+                for i, s in enumerate(studies)
+            }
+        else:
+            self._studies = SyntheticCorpus(seed=seed, config=config)
+            self._size = n_studies
+            self._index = None
+
+        self.faults = faults or Faults()
+        self.requests: list[ServedRequest] = []
+
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self._scripted: deque[tuple[int, Optional[float]]] = deque()
+        self._tokens = self.faults.burst or self.faults.rate_limit or 0.0
+        self._refilled = time.monotonic()
+        self._encoded: dict[tuple[int, str], bytes] = {}
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as a client's `base_url`."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "FakeCTGServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, args=(0.05,), daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeCTGServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def fail_next(
+        self, n: int = 1, *, status: int = 503, retry_after: Optional[float] = None
+    ) -> None:
+        """Answer the next `n` requests with `status` (and a Retry-After header if given)."""
+        with self._lock:
+            self._scripted.extend([(status, retry_after)] * n)
+
+    def reset(self) -> None:
+        """Forget logged requests and pending fail_next() answers."""
+        with self._lock:
+            self.requests.clear()
+            self._scripted.clear()
+
+    def statuses(self) -> list[int]:
+        """Status codes sent so far, in order."""
+        return [r.status for r in self.requests]
+
+    # ------ request handling ------
+
+    def respond(self, path: str, query: str) -> tuple[int, dict[str, str], bytes]:
+        """Status, headers and body for one request."""
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        if self.faults.latency:
+            time.sleep(self.faults.latency)
+
+        fault = self._fault()
+        if fault is not None:
+            status, headers = fault
+            body = _message(f"injected {status}")
+        else:
+            try:
+                status, headers, body = 200, {}, self._route(path, params)
+            except _HTTPError as e:
+                status, headers, body = e.status, {}, _message(str(e))
+
+        with self._lock:
+            self.requests.append(ServedRequest(path, params, status, time.monotonic()))
+        return status, headers, body
+
+    def _fault(self) -> Optional[tuple[int, dict[str, str]]]:
+        faults = self.faults
+        with self._lock:
+            if self._scripted:
+                status, retry_after = self._scripted.popleft()
+                return status, {} if retry_after is None else {"Retry-After": f"{retry_after:g}"}
+
+            if faults.rate_limit is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    faults.burst or faults.rate_limit,
+                    self._tokens + (now - self._refilled) * faults.rate_limit,
+                )
+                self._refilled = now
+                if self._tokens < 1:
+                    wait = faults.retry_after
+                    if wait is None:
+                        wait = math.ceil((1 - self._tokens) / faults.rate_limit)
+                    return 429, {"Retry-After": f"{wait:g}"}
+                self._tokens -= 1
+
+            if faults.error_rate and self._rng.random() < faults.error_rate:
+                return faults.error_status, {}
+        return None
+
+    def _route(self, path: str, params: dict[str, str]) -> bytes:
+        if not path.startswith(API_PREFIX + "/studies"):
+            raise _HTTPError(404, f"no route for {path}")
+        rest = path[len(API_PREFIX + "/studies") :]
+        fields = params.get("fields", "")
+        projection = _projection(fields)
+
+        if rest.startswith("/") and len(rest) > 1:
+            i = self._position(rest[1:])
+            if i is None:
+                raise _HTTPError(404, f"study {rest[1:]} not found")
+            return self._encode(i, fields, projection)
+        if rest not in ("", "/"):
+            raise _HTTPError(404, f"no route for {path}")
+        return self._search(params, fields, projection)
+
+    def _search(self, params: dict[str, str], fields: str, projection: Optional[dict]) -> bytes:
+        if "filter.ids" in params:
+            positions = [self._position(x) for x in params["filter.ids"].split(",") if x]
+            matches: Sequence[int] = [i for i in positions if i is not None]
+        else:
+            matches = range(self._size)
+
+        try:
+            size = int(params.get("pageSize", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise _HTTPError(400, "pageSize must be an integer") from None
+        if not 0 < size <= MAX_PAGE_SIZE:
+            raise _HTTPError(400, f"pageSize must be between 1 and {MAX_PAGE_SIZE}")
+
+        query_key = _query_key(params)
+        start = 0
+        if "pageToken" in params:
+            start = _read_token(params["pageToken"], query_key)
+        end = min(start + size, len(matches))
+
+        parts = [b'{"studies":[']
+        parts.append(
+            b",".join(self._encode(matches[k], fields, projection) for k in range(start, end))
+        )
+        parts.append(b"]")
+        if params.get("countTotal") == "true":
+            parts.append(b',"totalCount":' + str(len(matches)).encode())
+        if end < len(matches):
+            parts.append(b',"nextPageToken":"' + _make_token(end, query_key).encode() + b'"')
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def _position(self, nct_id: str) -> Optional[int]:
+        if self._index is not None:
+            return self._index.get(nct_id)
+        if len(nct_id) == 11 and nct_id.startswith("NCT") and nct_id[3:].isdigit():
+            i = int(nct_id[3:])
+            return i if i < self._size else None
+        return None
+
+    def _encode(self, i: int, fields: str, projection: Optional[dict]) -> bytes:
+        # encoded studies are kept, so serving costs little next to the client under test
+        key = (i, fields)
+        body = self._encoded.get(key)
+        if body is None:
+            if isinstance(self._studies, SyntheticCorpus):
+                with self._lock:  # the corpus reuses one random generator
+                    study = self._studies.study(i)
+            else:
+                study = self._studies[i]
+            if projection is not None:
+                study = _select(study, projection) or {}
+            body = json.dumps(study, separators=(",", ":"), ensure_ascii=False).encode()
+            self._encoded[key] = body
+        return body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as clients pool connections
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        status, headers, body = self.server.fake.respond(url.path, url.query)  # type: ignore[attr-defined]
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _message(text: str) -> bytes:
+    return json.dumps({"message": text}).encode()
+
+
+def _query_key(params: dict[str, str]) -> str:
+    query = sorted((k, v) for k, v in params.items() if k not in _PAGING_PARAMS)
+    return format(zlib.crc32(repr(query).encode()), "08x")
+
+
+def _make_token(offset: int, query_key: str) -> str:
+    return base64.urlsafe_b64encode(f"{query_key}:{offset}".encode()).decode().rstrip("=")
+
+
+def _read_token(token: str, query_key: str) -> int:
+    try:
+        key, offset = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode().split(":")
+        if key == query_key:
+            return int(offset)
+    except ValueError:
+        pass
+    raise _HTTPError(400, f"invalid pageToken {token!r} for this query")
+
+
+def _projection(fields: str) -> Optional[dict]:
+    """Tree of the requested field paths; None leaves select whole subtrees."""
+    if not fields:
+        return None
+    tree: dict = {}
+    for field in fields.split(","):
+        path = _PIECES.get(field, field).split(".")
+        if path[0] not in _ROOTS:
+            raise _HTTPError(400, f"unknown field {field!r}")
+        node = tree
+        for part in path[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:  # an enclosing path is already selected
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def _select(value: Any, tree: Optional[dict]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [item for item in (_select(v, tree) for v in value) if item not in (None, {})]
+    if not isinstance(value, dict):
+        return None
+    out = {}
+    for key, sub in tree.items():
+        if key in value:
+            picked = _select(value[key], sub)
+            if picked not in (None, {}, []):
+                out[key] = picked
+    return out
@@ -0,0 +1,156 @@
+from typing import Any, Optional
+
+import httpx
+import pytest
+
+from ctgforge.client.ctg_client import CTGClient
+
+
+def make_study(i: int, fields: Optional[str] = None) -> dict:
+    ident = {"nctId": f"NCT{i:08d}"}
+    if fields == "NCTId":
+        return {"protocolSection": {"identificationModule": ident}}
+    return {
+        "protocolSection": {
+            "identificationModule": {**ident, "briefTitle": f"Study {i}"},
+            "descriptionModule": {"briefSummary": "lorem ipsum " * 50},
+        }
+    }
+
+
+def make_raw_study(nct_id: str = "NCT01234567", **overrides: Any) -> dict:
+    """A realistic v2 study document covering every module flatten_core reads."""
+    raw = {
+        "protocolSection": {
+            "identificationModule": {
+                "nctId": nct_id,
+                "briefTitle": "Pembrolizumab Plus Chemotherapy in Lung Cancer",
+                "officialTitle": "A Phase 3 Study of Pembrolizumab Plus Chemotherapy",
+            },
+            "statusModule": {
+                "overallStatus": "RECRUITING",
+                "startDateStruct": {"date": "2021-03", "type": "ACTUAL"},
+                "primaryCompletionDateStruct": {"date": "2025-06-30", "type": "ESTIMATED"},
+                "completionDateStruct": {"date": "2026-12-31", "type": "ESTIMATED"},
+                "lastUpdatePostDateStruct": {"date": "2025-02-14", "type": "ACTUAL"},
+            },
+            "sponsorCollaboratorsModule": {
+                "leadSponsor": {"name": "Merck Sharp & Dohme LLC", "class": "INDUSTRY"},
+                "collaborators": [{"name": "National Cancer Institute", "class": "NIH"}],
+            },
+            "descriptionModule": {
+                "briefSummary": "This study compares pembrolizumab plus chemotherapy.",
+                "detailedDescription": "Participants are randomized 2:1.",
+            },
+            "conditionsModule": {
+                "conditions": ["Non-small Cell Lung Cancer", "Lung Neoplasms"],
+                "keywords": ["NSCLC"],
+            },
+            "designModule": {"studyType": "INTERVENTIONAL", "phases": ["PHASE3"]},
+            "armsInterventionsModule": {
+                "armGroups": [
+                    {
+                        "label": "Pembrolizumab + Chemo",
+                        "type": "EXPERIMENTAL",
+                        "description": "Pembrolizumab 200 mg Q3W plus chemotherapy",
+                        "interventionNames": ["Drug: Pembrolizumab", "Drug: Carboplatin"],
+                    },
+                    {
+                        "label": "Placebo + Chemo",
+                        "type": "PLACEBO_COMPARATOR",
+                        "interventionNames": ["Drug: Placebo", "Drug: Carboplatin"],
+                    },
+                ],
+                "interventions": [
+                    {
+                        "type": "DRUG",
+                        "name": "Pembrolizumab",
+                        "otherNames": ["MK-3475", "KEYTRUDA"],
+                        "armGroupLabels": ["Pembrolizumab + Chemo"],
+                    },
+                    {
+                        "type": "DRUG",
+                        "name": "Carboplatin",
+                        "armGroupLabels": ["Pembrolizumab + Chemo", "Placebo + Chemo"],
+                    },
+                    {"type": "DRUG", "name": "Placebo", "armGroupLabels": ["Placebo + Chemo"]},
+                ],
+            },
+        },
+        "derivedSection": {
+            "conditionBrowseModule": {
+                "meshes": [
+                    {"id": "D002289", "term": "Carcinoma, Non-Small-Cell Lung"},
+                    {"id": "D008175", "term": "Lung Neoplasms"},
+                ],
+                "ancestors": [{"id": "D012142", "term": "Respiratory Tract Neoplasms"}],
+                "browseLeaves": [
+                    {"id": "M4816", "name": "Non-small Cell Lung Cancer", "relevance": "HIGH"},
+                ],
+            },
+            "interventionBrowseModule": {
+                "meshes": [
+                    {"id": "C582435", "term": "pembrolizumab"},
+                    {"id": "D016190", "term": "Carboplatin"},
+                ],
+                "ancestors": [{"id": "D000970", "term": "Antineoplastic Agents"}],
+            },
+        },
+        "hasResults": False,
+    }
+    raw.update(overrides)
+    return raw
+
+
+class MockCTGApi:
+    """In-memory stand-in for the v2 `/studies` endpoints, served via httpx.MockTransport."""
+
+    def __init__(self, n_studies: int = 250) -> None:
+        self.n_studies = n_studies
+        self.calls: list[httpx.Request] = []
+        self.fail_tokens: set[str] = set()  # pageTokens answered with 503
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        path = request.url.path
+        if path.startswith("/api/v2/studies/"):
+            i = int(path.rsplit("NCT", 1)[1])
+            if i >= self.n_studies:
+                return httpx.Response(404, text="not found")
+            return httpx.Response(200, json=make_study(i))
+
+        params = request.url.params
+        if "filter.ids" in params:
+            ids = [int(x[3:]) for x in params["filter.ids"].split(",")]
+            return httpx.Response(
+                200, json={"studies": [make_study(i) for i in ids if i < self.n_studies]}
+            )
+
+        if params.get("pageToken") in self.fail_tokens:
+            return httpx.Response(503, text="unavailable")
+
+        size = int(params.get("pageSize", 10))
+        start = int(params.get("pageToken", 0))
+        end = min(start + size, self.n_studies)
+        fields = params.get("fields")
+        payload = {"studies": [make_study(i, fields) for i in range(start, end)]}
+        if params.get("countTotal") == "true":
+            payload["totalCount"] = self.n_studies
+        if end < self.n_studies:
+            payload["nextPageToken"] = str(end)
+        return httpx.Response(200, json=payload)
+
+    def client(self) -> httpx.Client:
+        return httpx.Client(
+            base_url=CTGClient.BASE_URL, transport=httpx.MockTransport(self.handler)
+        )
+
+    def async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=CTGClient.BASE_URL, transport=httpx.MockTransport(self.handler)
+        )
+
+
+@pytest.fixture
+def mock_api() -> MockCTGApi:
+    return MockCTGApi()
@@ -0,0 +1,99 @@
+import re
+from typing import Any, Optional
+
+from ctgforge import CTG
+from ctgforge.client.ctg_client import CTGClient
+from ctgforge.mirror import StudyStore, sync_mirror
+
+
+def _study(nct_id: str, updated: str, title: str = "A study") -> dict:
+    return {
+        "protocolSection": {
+            "identificationModule": {"nctId": nct_id, "briefTitle": title},
+            "statusModule": {"lastUpdatePostDateStruct": {"date": updated, "type": "ACTUAL"}},
+        }
+    }
+
+
+class InMemoryClient(CTGClient):
+    """Serves searches from a dict of studies, honoring LastUpdatePostDate ranges."""
+
+    def __init__(self, studies: dict[str, dict]) -> None:
+        super().__init__()
+        self.studies = studies
+        self.queries: list[dict[str, Any]] = []
+
+    def close(self) -> None:
+        pass
+
+    def _request_json(
+        self, method: str, path: str, *, params: Optional[dict[str, Any]] = None, **_: Any
+    ) -> dict[str, Any]:
+        params = params or {}
+        self.queries.append(params)
+        rows = sorted(
+            self.studies.values(),
+            key=lambda s: s["protocolSection"]["statusModule"]["lastUpdatePostDateStruct"]["date"],
+        )
+        m = re.search(r"RANGE\[([\d-]+),MAX\]", params.get("query.term", ""))
+        if m:
+            rows = [
+                s
+                for s in rows
+                if s["protocolSection"]["statusModule"]["lastUpdatePostDateStruct"]["date"]
+                >= m.group(1)
+            ]
+        start = int(params.get("pageToken", 0))
+        end = start + int(params["pageSize"])
+        payload = {"studies": rows[start:end]}
+        if end < len(rows):
+            payload["nextPageToken"] = str(end)
+        return payload
+
+
+def test_sync_mirror_is_incremental(tmp_path):
+    remote = {
+        "NCT1": _study("NCT1", "2025-01-10"),
+        "NCT2": _study("NCT2", "2025-02-01"),
+        "NCT3": _study("NCT3", "2025-03-05"),
+    }
+    client = InMemoryClient(remote)
+    ctg = CTG(client=client)
+
+    with StudyStore(tmp_path / "mirror.sqlite") as store:
+        report = sync_mirror(ctg, store)
+        assert report.since is None
+        assert sorted(report.inserted) == ["NCT1", "NCT2", "NCT3"]
+        assert report.high_water_mark == "2025-03-05"
+        assert store.high_water_mark == "2025-03-05"
+        assert "query.term" not in client.queries[-1]
+
+        remote["NCT2"] = _study("NCT2", "2025-03-20", title="Amended")
+        remote["NCT4"] = _study("NCT4", "2025-03-21")
+
+        report = sync_mirror(ctg, store)
+        assert client.queries[-1]["query.term"] == "AREA[LastUpdatePostDate]RANGE[2025-03-05,MAX]"
+        assert report.inserted == ["NCT4"]
+        assert report.updated == ["NCT2"]
+        assert report.unchanged == 1  # NCT3 is re-fetched on the boundary day
+        assert store.high_water_mark == "2025-03-21"
+
+    with StudyStore(tmp_path / "mirror.sqlite") as store:
+        assert store.nct_ids() == ["NCT1", "NCT2", "NCT3", "NCT4"]
+        assert (
+            store.get("NCT2")["protocolSection"]["identificationModule"]["briefTitle"] == "Amended"
+        )
+        assert sync_mirror(ctg, store).changed == []
+
+
+def test_sync_mirror_combines_user_query_term(tmp_path):
+    client = InMemoryClient({"NCT1": _study("NCT1", "2025-01-10")})
+    with StudyStore(tmp_path / "mirror.sqlite") as store:
+        store.high_water_mark = "2025-01-01"
+        sync_mirror(
+            CTG(client=client), store, extra={"query.term": "AREA[StudyType]INTERVENTIONAL"}
+        )
+
+    assert client.queries[-1]["query.term"] == (
+        "(AREA[StudyType]INTERVENTIONAL)+AND+AREA[LastUpdatePostDate]RANGE[2025-01-01,MAX]"
+    )
@@ -0,0 +1,110 @@
+import pytest
+
+from ctgforge import F
+from ctgforge.mirror import LocalCTG, StudyStore
+from ctgforge.query.compiler import QueryCompilerError, compile_to_params
+from ctgforge.query.local import LocalIndex
+
+
+def _study(nct_id, updated, conditions, sponsor, interventions=(), status="RECRUITING", phases=()):
+    return {
+        "protocolSection": {
+            "identificationModule": {"nctId": nct_id, "briefTitle": f"Trial {nct_id}"},
+            "statusModule": {
+                "overallStatus": status,
+                "lastUpdatePostDateStruct": {"date": updated},
+            },
+            "designModule": {"phases": list(phases)},
+            "conditionsModule": {"conditions": list(conditions)},
+            "sponsorCollaboratorsModule": {"leadSponsor": {"name": sponsor}},
+            "armsInterventionsModule": {
+                "interventions": [{"name": n, "type": "DRUG"} for n in interventions]
+            },
+        }
+    }
+
+
+STUDIES = [
+    _study(
+        "NCT1",
+        "2025-01-01",
+        ["Type 2 Diabetes"],
+        "Acme Pharma",
+        ["Metformin"],
+        "COMPLETED",
+        ["PHASE3"],
+    ),
+    _study(
+        "NCT2",
+        "2025-02-01",
+        ["Non-Small Cell Lung Cancer"],
+        "Pfizer",
+        ["Pembrolizumab"],
+        phases=["PHASE2", "PHASE3"],
+    ),
+    _study(
+        "NCT3", "2025-03-01", ["Lung Cancer", "Diabetes"], "Acme Pharma", ["Drug A"], "WITHDRAWN"
+    ),
+    _study("NCT4", "2025-04-01", ["Asthma"], "NIH", phases=["PHASE1"]),
+]
+
+
+@pytest.fixture
+def index():
+    return LocalIndex.from_studies(STUDIES)
+
+
+def test_local_text_matching(index):
+    assert index.evaluate(F.condition.eq("diabetes")) == {"NCT1", "NCT3"}
+    assert index.evaluate(F.condition.eq("lung cancer")) == {"NCT2", "NCT3"}
+    assert index.evaluate(F.condition.eq("cancer lung")) == set()
+    assert index.evaluate(F.condition.contains("cancer lung")) == {"NCT2", "NCT3"}
+    assert index.evaluate(F.sponsor.in_(["pfizer", "NIH"])) == {"NCT2", "NCT4"}
+    assert index.evaluate(F.intervention.eq("drug a")) == {"NCT3"}
+
+
+def test_local_filters_and_boolean_logic(index):
+    assert index.evaluate(F.status.in_(["COMPLETED", "WITHDRAWN"])) == {"NCT1", "NCT3"}
+    assert index.evaluate(F.phase.eq("PHASE3")) == {"NCT1", "NCT2"}
+    assert index.evaluate(F.condition.eq("diabetes") & ~F.status.eq("WITHDRAWN")) == {"NCT1"}
+    assert index.evaluate(None) == {"NCT1", "NCT2", "NCT3", "NCT4"}
+
+
+def test_local_or_across_fields(index):
+    expr = F.condition.eq("asthma") | F.sponsor.eq("Acme Pharma")
+    with pytest.raises(QueryCompilerError):
+        compile_to_params(expr)
+    assert index.evaluate(expr) == {"NCT1", "NCT3", "NCT4"}
+
+
+def test_index_replaces_and_removes_studies(index):
+    index.add(_study("NCT1", "2025-05-01", ["Asthma"], "NIH"))
+    assert index.evaluate(F.condition.eq("diabetes")) == {"NCT3"}
+    assert index.evaluate(F.sponsor.eq("nih")) == {"NCT1", "NCT4"}
+
+    index.remove("NCT4")
+    assert index.evaluate(F.condition.eq("asthma")) == {"NCT1"}
+    assert len(index) == 3
+
+
+def test_local_ctg_search_and_count(tmp_path):
+    with StudyStore(tmp_path / "mirror.sqlite") as store:
+        for raw in STUDIES:
+            store.upsert(raw)
+        local = LocalCTG(store)
+
+        assert local.count(F.condition.eq("diabetes") | F.phase.eq("PHASE1")) == 3
+        ids = [
+            s["protocolSection"]["identificationModule"]["nctId"]
+            for s in local.search(F.sponsor.eq("acme pharma") | F.sponsor.eq("nih"), limit=None)
+        ]
+        assert ids == ["NCT4", "NCT3", "NCT1"]
+
+        ids = [
+            s["protocolSection"]["identificationModule"]["nctId"]
+            for s in local.search(None, offset=1, limit=2, sort="NCTId")
+        ]
+        assert ids == ["NCT2", "NCT3"]
+
+        with pytest.raises(ValueError):
+            local.count(None, extra={"query.term": "x"})
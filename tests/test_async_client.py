@@ -0,0 +1,56 @@
+import asyncio
+
+from ctgforge import AsyncCTG, F
+from ctgforge.client.async_client import CTGAsyncClient
+
+
+def _nct(study: dict) -> str:
+    return study["protocolSection"]["identificationModule"]["nctId"]
+
+
+def test_async_search_count_get(mock_api):
+    async def run():
+        async with AsyncCTG(client=CTGAsyncClient(client=mock_api.async_client())) as ctg:
+            total = await ctg.count(F.condition.eq("diabetes"))
+            raw = [s async for s in ctg.search(F.condition.eq("diabetes"), offset=120, limit=40)]
+            one = await ctg.get("NCT00000007")
+        return total, raw, one
+
+    total, raw, one = asyncio.run(run())
+
+    assert total == mock_api.n_studies
+    assert [_nct(s) for s in raw] == [f"NCT{i:08d}" for i in range(120, 160)]
+    assert _nct(one) == "NCT00000007"
+
+    # count + 2 search pages (no prefetch past the requested window) + 1 get
+    assert len(mock_api.calls) == 4
+
+
+def test_async_get_many(mock_api):
+    ids = [f"NCT{i:08d}" for i in (3, 1, 999, 3, 42)]
+
+    async def run():
+        async with AsyncCTG(client=CTGAsyncClient(client=mock_api.async_client())) as ctg:
+            return [r async for r in ctg.get_many(ids, batch_size=2)]
+
+    results = {r.nct_id: r for r in asyncio.run(run())}
+
+    assert set(results) == {"NCT00000003", "NCT00000001", "NCT00000999", "NCT00000042"}
+    assert _nct(results["NCT00000042"].study) == "NCT00000042"
+    assert not results["NCT00000999"].ok
+
+
+def test_async_fan_out_multiple_queries(mock_api):
+    async def run():
+        async with AsyncCTG(client=CTGAsyncClient(client=mock_api.async_client())) as ctg:
+
+            async def collect(expr):
+                return [s async for s in ctg.search(expr, limit=250)]
+
+            return await asyncio.gather(
+                collect(F.condition.eq("asthma")), collect(F.sponsor.eq("acme"))
+            )
+
+    a, b = asyncio.run(run())
+    assert len(a) == len(b) == 250
+    assert [_nct(s) for s in a] == [_nct(s) for s in b]
@@ -0,0 +1,79 @@
+import os
+import time
+
+from ctgforge import CTG, F
+from ctgforge.client.cache import SQLiteCache, cache_key
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.testing import FakeCTGServer
+
+
+def test_cache_key_is_canonical():
+    assert cache_key("get", "/studies", {"a": 1, "b": "x"}) == cache_key(
+        "GET", "/studies", {"b": "x", "a": "1"}
+    )
+    assert cache_key("GET", "/studies", {"a": 1}) != cache_key("GET", "/studies", {"a": 2})
+
+
+def test_cache_key_separates_servers():
+    key = cache_key("GET", "/studies", base_url="https://Example.org/api/v2/")
+    assert key == cache_key("GET", "/studies", base_url="https://example.org/api/v2")
+    assert key != cache_key("GET", "/studies", base_url="http://localhost:8080/api/v2")
+
+
+def test_shared_cache_does_not_mix_servers(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    with FakeCTGServer(n_studies=3) as a, FakeCTGServer(n_studies=3, seed=1) as b:
+        first = CTGHttpxClient(base_url=a.url, cache=cache).get("NCT00000001")
+        second = CTGHttpxClient(base_url=b.url, cache=cache).get("NCT00000001")
+        assert len(b.requests) == 1
+    assert first != second and (cache.hits, cache.misses) == (0, 2)
+    cache.close()
+
+
+def test_client_serves_repeated_calls_from_cache(mock_api, tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    client = CTG(client=CTGHttpxClient(client=mock_api.client(), cache=cache))
+
+    first = list(client.search(F.condition.eq("asthma"), limit=30))
+    assert client.count(F.condition.eq("asthma")) == mock_api.n_studies
+    assert client.get("NCT00000001")
+    calls = len(mock_api.calls)
+
+    assert list(client.search(F.condition.eq("asthma"), limit=30)) == first
+    assert client.count(F.condition.eq("asthma")) == mock_api.n_studies
+    assert client.get("NCT00000001")
+    client.close()
+
+    assert len(mock_api.calls) == calls
+    assert (cache.hits, cache.misses) == (3, 3)
+
+    # the cache survives the process
+    cache.close()
+    reopened = SQLiteCache(tmp_path / "cache.sqlite")
+    assert len(reopened) == 3
+    reopened.close()
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", ttl=0.05)
+    cache.set("k", {"v": 1})
+    assert cache.get("k") == {"v": 1}
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+    blob = {"text": os.urandom(1500).hex()}
+    probe = SQLiteCache(tmp_path / "probe.sqlite")
+    probe.set("x", {**blob, "k": "x"})
+    entry_size = probe.size_bytes
+
+    cache = SQLiteCache(tmp_path / "lru.sqlite", ttl=None, max_bytes=entry_size * 5 // 2)
+    cache.set("a", {**blob, "k": "a"})
+    cache.set("b", {**blob, "k": "b"})
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.set("c", {**blob, "k": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size_bytes <= cache.max_bytes
+    assert cache.evictions == 1
@@ -0,0 +1,66 @@
+from collections import Counter
+
+from ctgforge.flatten import flatten_core
+from ctgforge.query.compiler import compile_to_params
+from ctgforge.testing import CorpusConfig, SyntheticCorpus, synthetic_queries, synthetic_studies
+
+
+def test_corpus_is_deterministic_and_randomly_accessible():
+    corpus = SyntheticCorpus(seed=3)
+    studies = list(corpus.studies(20))
+
+    assert studies == list(synthetic_studies(20, seed=3))
+    assert corpus.study(7) == studies[7]
+    assert list(corpus.studies(5, start=10)) == studies[10:15]
+    assert SyntheticCorpus(seed=4).study(7) != studies[7]
+    assert [s["protocolSection"]["identificationModule"]["nctId"] for s in studies[:2]] == [
+        "NCT00000000",
+        "NCT00000001",
+    ]
+
+
+def test_corpus_studies_flatten():
+    for raw in SyntheticCorpus().studies(300):
+        trial = flatten_core(raw)
+        assert trial.conditions and trial.interventions and trial.lead_sponsor
+
+
+def test_corpus_list_sizes_follow_config():
+    config = CorpusConfig(conditions=(5, 8), interventions=(2, 2), collaborators=(0, 0))
+    for raw in SyntheticCorpus(config=config).studies(200):
+        protocol = raw["protocolSection"]
+        assert 5 <= len(protocol["conditionsModule"]["conditions"]) <= 8
+        assert len(protocol["armsInterventionsModule"]["interventions"]) == 2
+        assert protocol["sponsorCollaboratorsModule"]["collaborators"] == []
+
+
+def test_corpus_skew():
+    def top_share(skew):
+        corpus = SyntheticCorpus(config=CorpusConfig(skew=skew))
+        counts = Counter(
+            c
+            for raw in corpus.studies(1000)
+            for c in raw["protocolSection"]["conditionsModule"]["conditions"]
+        )
+        return counts.most_common(1)[0][1] / 1000
+
+    assert top_share(1.5) > 0.3
+    assert top_share(0) < 0.05
+
+
+def test_synthetic_queries_compile():
+    queries = list(synthetic_queries(200, seed=1))
+    assert len(queries) == 200
+    for expr in queries:
+        assert compile_to_params(expr).params["query.cond"]
+
+
+def test_full_documents_add_sections_around_the_same_core():
+    lean = SyntheticCorpus()
+    full = SyntheticCorpus(config=CorpusConfig(full_documents=True))
+    for i in range(50):
+        raw = full.study(i)
+        assert flatten_core(raw) == flatten_core(lean.study(i))
+        assert "eligibilityModule" in raw["protocolSection"]
+        assert "browseLeaves" in raw["derivedSection"]["conditionBrowseModule"]
+        assert ("resultsSection" in raw) == raw["hasResults"]
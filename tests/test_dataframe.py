@@ -0,0 +1,52 @@
+import pandas as pd
+from conftest import make_raw_study
+
+from ctgforge.export import to_dataframe
+from ctgforge.flatten import flatten_core
+
+
+def _trials():
+    a = make_raw_study("NCT00000001")
+    b = make_raw_study("NCT00000002")
+    b["protocolSection"]["statusModule"]["overallStatus"] = "COMPLETED"
+    b["protocolSection"]["statusModule"]["startDateStruct"] = {"date": "2019-11-20"}
+    b["protocolSection"]["sponsorCollaboratorsModule"]["collaborators"] = []
+    return [flatten_core(a), flatten_core(b)]
+
+
+def test_to_dataframe_dtypes():
+    df = to_dataframe(_trials())
+
+    assert list(df.columns[:3]) == ["nct_id", "brief_title", "official_title"]
+    for name in ("study_type", "overall_status", "lead_sponsor"):
+        assert isinstance(df[name].dtype, pd.CategoricalDtype)
+    assert set(df["overall_status"].cat.categories) == {"RECRUITING", "COMPLETED"}
+    for name in ("start_date", "primary_completion_date", "completion_date"):
+        assert pd.api.types.is_datetime64_any_dtype(df[name])
+    assert df["has_results"].dtype == bool
+
+
+def test_to_dataframe_partial_dates():
+    df = to_dataframe(_trials())
+
+    # "2021-03" falls on the first of the month
+    assert df["start_date"].tolist() == [pd.Timestamp("2021-03-01"), pd.Timestamp("2019-11-20")]
+
+
+def test_to_dataframe_joined_and_list_columns():
+    trials = _trials()
+    joined = to_dataframe(trials)
+    lists = to_dataframe(trials, list_columns=True)
+
+    assert joined["conditions"][0] == "; ".join(c.name for c in trials[0].conditions)
+    assert lists["conditions"][0] == [c.name for c in trials[0].conditions]
+    assert lists["interventions"][0] == [i.name for i in trials[0].interventions]
+    assert joined["collaborators"][1] is None
+    assert lists["collaborators"][1] == []
+    assert lists["phases"][0] == trials[0].phases
+
+
+def test_to_dataframe_empty():
+    df = to_dataframe([])
+    assert df.empty
+    assert "nct_id" in df.columns
@@ -0,0 +1,123 @@
+import json
+
+import httpx
+import pytest
+from conftest import MockCTGApi, make_raw_study
+
+from ctgforge import CTG
+from ctgforge.client.ctg_client import CTGClient, CTGTransportError, RetryConfig
+from ctgforge.client.decode import StudyStream, available_decoders, get_decoder
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.pagination import SearchCursor
+
+
+def _nct(study: dict) -> str:
+    return study["protocolSection"]["identificationModule"]["nctId"]
+
+
+def _page(n: int) -> tuple[list[dict], bytes]:
+    studies = [make_raw_study(f"NCT{i:08d}") for i in range(n)]
+    # brackets, quotes and backslashes inside strings must not confuse the scanner
+    studies[1]["protocolSection"]["identificationModule"]["briefTitle"] = (
+        'a ]}"studies": [{ \\" é \\\\'
+    )
+    doc = {"totalCount": 42, "studies": studies, "nextPageToken": "tok]en"}
+    return studies, json.dumps(doc, ensure_ascii=False).encode()
+
+
+@pytest.mark.parametrize("decoder", available_decoders())
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_study_stream_matches_full_decode(decoder, chunk_size):
+    studies, body = _page(4)
+
+    stream = StudyStream(decoder)
+    out = []
+    for i in range(0, len(body), chunk_size):
+        out.extend(stream.feed(body[i : i + chunk_size]))
+
+    assert out == studies
+    assert stream.close() == {"totalCount": 42, "studies": [], "nextPageToken": "tok]en"}
+
+
+def test_study_stream_yields_studies_before_the_body_ends():
+    studies, body = _page(3)
+    stream = StudyStream()
+
+    assert stream.feed(body[: len(body) // 2]) == studies[:1]
+    with pytest.raises(ValueError):
+        stream.close()
+
+
+def test_study_stream_ignores_nested_studies_keys():
+    stream = StudyStream()
+    body = b'{"meta": {"studies": [{"x": 1}]}, "studies" :\n [ {"a": [1]} , {"b": {}} ]}'
+
+    assert stream.feed(body) == [{"a": [1]}, {"b": {}}]
+    assert stream.close() == {"meta": {"studies": [{"x": 1}]}, "studies": []}
+
+
+def test_get_decoder():
+    assert available_decoders()[-1] == "json"
+    assert get_decoder("json")(b'{"a": 1}') == {"a": 1}
+    assert get_decoder(len) is len
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
+    for name in available_decoders():
+        with pytest.raises(ValueError):
+            get_decoder(name)(b'{"a": ')
+
+
+def test_streamed_search_matches_buffered_search():
+    api = MockCTGApi(n_studies=2500)
+    buffered = CTG(client=CTGHttpxClient(client=api.client()))
+    streamed = CTG(client=CTGHttpxClient(client=api.client(), stream_pages=True))
+
+    for offset, limit in [(0, None), (200, 10), (999, 1002)]:
+        expected = [_nct(s) for s in buffered.search(None, offset=offset, limit=limit)]
+        assert [_nct(s) for s in streamed.search(None, offset=offset, limit=limit)] == expected
+
+    stats = streamed.client.stats
+    assert stats.records_yielded == 2500 + 10 + 1002
+    assert stats.records_received == stats.records_yielded
+    assert stats.bytes_received == buffered.client.stats.bytes_received
+
+
+def test_streamed_search_yields_while_page_downloads():
+    _, body = _page(50)
+    sent = []
+
+    def chunks():
+        for i in range(0, len(body), 1024):
+            sent.append(i)
+            yield body[i : i + 1024]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks())
+
+    http = httpx.Client(base_url=CTGClient.BASE_URL, transport=httpx.MockTransport(handler))
+    client = CTGHttpxClient(client=http, stream_pages=True)
+    results = client.search(limit=50)
+
+    next(results)
+    assert 0 < len(sent) < len(body) / 1024 / 2
+    assert len(list(results)) == 49
+
+
+def test_streamed_search_resumes_after_transport_error():
+    api = MockCTGApi(n_studies=2500)
+    api.fail_tokens.add("1000")
+    client = CTGHttpxClient(
+        client=api.client(), retry=RetryConfig(max_retries=0), stream_pages=True
+    )
+
+    cursor = SearchCursor.start(limit=None)
+    seen = []
+    with pytest.raises(CTGTransportError):
+        for s in client.resume(cursor):
+            seen.append(_nct(s))
+    assert len(seen) == 1000 and cursor.page_token == "1000" and cursor.page_offset == 0
+
+    api.fail_tokens.clear()
+    seen += [_nct(s) for s in client.resume(cursor)]
+    assert seen == [f"NCT{i:08d}" for i in range(2500)]
+    assert cursor.exhausted
@@ -0,0 +1,101 @@
+import pytest
+from conftest import make_raw_study
+
+from ctgforge.export import to_dataframe, to_property_graph
+from ctgforge.flatten import flatten_core
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from pyarrow import ipc  # noqa: E402
+
+from ctgforge.export.stream import write_property_graph, write_trials  # noqa: E402
+from ctgforge.flatten.arrow import TRIAL_SCHEMA  # noqa: E402
+
+
+def _raws(n):
+    statuses = ["RECRUITING", "COMPLETED", "TERMINATED"]
+    for i in range(n):
+        raw = make_raw_study(f"NCT{i:08d}")
+        raw["protocolSection"]["statusModule"]["overallStatus"] = statuses[i % len(statuses)]
+        yield raw
+
+
+def test_write_trials_parquet_row_groups(tmp_path):
+    path = tmp_path / "trials.parquet"
+
+    assert write_trials(_raws(25), path, batch_size=10) == 25
+
+    f = pq.ParquetFile(path)
+    assert f.metadata.num_row_groups == 3
+    table = f.read()
+    assert table.schema == TRIAL_SCHEMA
+    assert table.column("nct_id").to_pylist()[-1] == "NCT00000024"
+
+    df = table.to_pandas()
+    assert df["overall_status"].dtype == "category"
+    assert df["overall_status"].tolist()[:4] == [
+        "RECRUITING",
+        "COMPLETED",
+        "TERMINATED",
+        "RECRUITING",
+    ]
+
+
+def test_write_trials_ipc_shares_dictionaries_across_batches(tmp_path):
+    path = tmp_path / "trials.arrow"
+
+    # each batch sees the statuses in a different order
+    assert write_trials(_raws(7), path, batch_size=2) == 7
+
+    with ipc.open_file(path) as reader:
+        assert reader.num_record_batches == 4
+        table = reader.read_all()
+    assert table.column("overall_status").to_pylist() == [
+        "RECRUITING",
+        "COMPLETED",
+        "TERMINATED",
+        "RECRUITING",
+        "COMPLETED",
+        "TERMINATED",
+        "RECRUITING",
+    ]
+
+
+def test_write_trials_accepts_models_and_raw_studies(tmp_path):
+    raws = list(_raws(4))
+    mixed = [flatten_core(r) for r in raws[:2]] + raws[2:]
+
+    write_trials(mixed, tmp_path / "a.parquet")
+    write_trials(raws, tmp_path / "b.parquet")
+
+    assert pq.read_table(tmp_path / "a.parquet").equals(pq.read_table(tmp_path / "b.parquet"))
+    row = pq.read_table(tmp_path / "a.parquet").to_pylist()[0]
+    expected = to_dataframe([flatten_core(raws[0])]).iloc[0]
+    assert row["brief_title"] == expected["brief_title"]
+    assert "; ".join(row["conditions"]) == expected["conditions"]
+
+
+def test_write_trials_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        write_trials([], tmp_path / "trials.csv")
+
+
+def test_write_property_graph_matches_to_property_graph(tmp_path):
+    raws = list(_raws(12))
+    nodes_path, edges_path = tmp_path / "nodes.arrow", tmp_path / "edges.arrow"
+
+    n_nodes, n_edges = write_property_graph(raws, nodes_path, edges_path, batch_size=5)
+
+    nodes_df, edges_df = to_property_graph([flatten_core(r) for r in raws])
+    assert (n_nodes, n_edges) == (len(nodes_df), len(edges_df))
+
+    with ipc.open_file(nodes_path) as reader:
+        nodes = reader.read_all().to_pandas()
+    with ipc.open_file(edges_path) as reader:
+        edges = reader.read_all().to_pandas()
+
+    for name in ("id", "node_id", "label", "type", "mesh_uid", "overall_status"):
+        assert nodes[name].tolist() == nodes_df[name].tolist()
+    assert [list(t) for t in nodes["arm_group_types"]] == nodes_df["arm_group_types"].tolist()
+    assert edges.astype(str).equals(edges_df.astype(str))
@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from conftest import make_raw_study
+
+from ctgforge import CTG, AsyncCTG
+from ctgforge.client.async_client import CTGAsyncClient
+from ctgforge.client.ctg_client import CTGTransportError, RetryConfig
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.requests_client import CTGRequestsClient
+from ctgforge.testing import FakeCTGServer, Faults, SyntheticCorpus
+
+FAST_RETRY = RetryConfig(max_retries=3, backoff_base=0.01, jitter=0.0)
+TRANSPORTS = [
+    pytest.param(CTGHttpxClient, False, id="httpx"),
+    pytest.param(CTGHttpxClient, True, id="httpx-stream"),
+    pytest.param(CTGRequestsClient, False, id="requests"),
+    pytest.param(CTGRequestsClient, True, id="requests-stream"),
+]
+
+
+def _nct(study: dict) -> str:
+    return study["protocolSection"]["identificationModule"]["nctId"]
+
+
+@pytest.fixture(scope="module")
+def shared_server():
+    with FakeCTGServer(n_studies=1200) as server:
+        yield server
+
+
+@pytest.fixture
+def server(shared_server):
+    shared_server.reset()
+    return shared_server
+
+
+@pytest.mark.parametrize("transport, stream_pages", TRANSPORTS)
+def test_clients_page_through_fake_server(server, transport, stream_pages):
+    client = CTG(client=transport(base_url=server.url, stream_pages=stream_pages))
+
+    assert [_nct(s) for s in client.search(None, limit=None)] == [
+        f"NCT{i:08d}" for i in range(1200)
+    ]
+    assert [_nct(s) for s in client.search(None, offset=1100, limit=5)] == [
+        f"NCT{i:08d}" for i in range(1100, 1105)
+    ]
+    assert client.count(None) == 1200
+    assert client.get("NCT00000042") == SyntheticCorpus().study(42)
+
+    results = list(client.client.get_many(["NCT00000007", "NCT00001199", "NCT00005000"]))
+    assert sorted(r.nct_id for r in results if r.ok) == ["NCT00000007", "NCT00001199"]
+    assert [r.nct_id for r in results if not r.ok] == ["NCT00005000"]
+
+
+def test_page_tokens_are_bound_to_the_query(server):
+    http = httpx.Client(base_url=server.url)
+    first = http.get("/studies", params={"query.cond": "asthma", "pageSize": 10}).json()
+    token = first["nextPageToken"]
+
+    # paging params may change between pages, the query may not
+    params = {"query.cond": "asthma", "pageSize": 3, "fields": "NCTId", "pageToken": token}
+    second = http.get("/studies", params=params).json()
+    assert second["studies"] == [
+        {"protocolSection": {"identificationModule": {"nctId": f"NCT{i:08d}"}}}
+        for i in range(10, 13)
+    ]
+    assert http.get("/studies", params={"pageToken": token}).status_code == 400
+    assert http.get("/studies", params={"pageToken": "10"}).status_code == 400
+
+
+def test_fields_projection():
+    server = FakeCTGServer([make_raw_study("NCT00000001"), make_raw_study("NCT00000002")])
+    with server, httpx.Client(base_url=server.url) as http:
+        fields = (
+            "NCTId,protocolSection.armsInterventionsModule.interventions.name,"
+            "derivedSection.conditionBrowseModule,hasResults"
+        )
+        study = http.get("/studies/NCT00000002", params={"fields": fields}).json()
+        raw = make_raw_study("NCT00000002")
+
+        assert study == {
+            "protocolSection": {
+                "identificationModule": {"nctId": "NCT00000002"},
+                "armsInterventionsModule": {
+                    "interventions": [
+                        {"name": "Pembrolizumab"},
+                        {"name": "Carboplatin"},
+                        {"name": "Placebo"},
+                    ]
+                },
+            },
+            "derivedSection": {
+                "conditionBrowseModule": raw["derivedSection"]["conditionBrowseModule"]
+            },
+            "hasResults": False,
+        }
+        assert http.get("/studies", params={"fields": "Nope"}).status_code == 400
+        assert http.get("/studies/NCT00000003").status_code == 404
+
+
+@pytest.mark.parametrize("transport, stream_pages", TRANSPORTS)
+def test_backoff_honors_retry_after(server, transport, stream_pages):
+    client = transport(base_url=server.url, retry=FAST_RETRY, stream_pages=stream_pages)
+    server.fail_next(2, status=429, retry_after=0.2)
+
+    assert len(list(client.search(limit=20))) == 20
+    assert server.statuses() == [429, 429, 200]
+    first, second, third = (r.time for r in server.requests)
+    assert second - first >= 0.2 and third - second >= 0.2
+
+
+def test_backoff_gives_up_after_max_retries(server):
+    client = CTGRequestsClient(base_url=server.url, retry=FAST_RETRY)
+    server.fail_next(10, status=503)
+
+    with pytest.raises(CTGTransportError, match="Exhausted retries"):
+        client.get("NCT00000001")
+    assert server.statuses() == [503] * (FAST_RETRY.max_retries + 1)
+
+
+def test_injected_faults_are_retried():
+    faults = Faults(error_rate=0.2, rate_limit=50, burst=5, retry_after=0.2, latency=0.005)
+    with FakeCTGServer(n_studies=500, faults=faults) as server:
+        client = CTGHttpxClient(base_url=server.url, retry=RetryConfig(backoff_base=0.01))
+        start = time.monotonic()
+        results = list(client.get_many((f"NCT{i:08d}" for i in range(50)), batch_size=1, workers=4))
+        elapsed = time.monotonic() - start
+
+    assert all(r.ok for r in results)
+    assert sorted(r.nct_id for r in results) == [f"NCT{i:08d}" for i in range(50)]
+    statuses = server.statuses()
+    assert statuses.count(200) == 50 and {429, 503} <= set(statuses)
+    assert elapsed >= 0.005 * len(statuses) / 4  # latency applies to every request
+
+
+def test_async_client_against_fake_server(server):
+    async def search():
+        async with AsyncCTG(client=CTGAsyncClient(base_url=server.url)) as client:
+            return [_nct(s) async for s in client.search(None, offset=995, limit=10)]
+
+    assert asyncio.run(search()) == [f"NCT{i:08d}" for i in range(995, 1005)]
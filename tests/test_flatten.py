@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from conftest import make_raw_study
+from pydantic import ValidationError
+
+from ctgforge.flatten import flatten_core, flatten_many
+
+
+def test_flatten_core_fields():
+    trial = flatten_core(make_raw_study())
+
+    assert trial.nct_id == "NCT01234567"
+    assert trial.phases == ["PHASE3"]
+    assert trial.start_date.date == "2021-03"
+    assert trial.lead_sponsor.type == "INDUSTRY"
+    assert [c.name for c in trial.collaborators] == ["National Cancer Institute"]
+    assert [(c.name, c.mesh_uid) for c in trial.conditions] == [
+        ("Non-small Cell Lung Cancer", None),
+        ("Lung Neoplasms", "D008175"),
+    ]
+    assert [(i.name, i.mesh_uid) for i in trial.interventions] == [
+        ("Pembrolizumab", "C582435"),
+        ("Carboplatin", "D016190"),
+        ("Placebo", None),
+    ]
+    assert trial.arm_groups[1].intervention_names == ["Drug: Placebo", "Drug: Carboplatin"]
+
+
+def test_flatten_core_validates():
+    raw = make_raw_study()
+    raw["protocolSection"]["statusModule"]["overallStatus"] = "NOT_A_STATUS"
+
+    with pytest.raises(ValidationError):
+        flatten_core(raw)
+
+
+def test_mesh_matching_is_case_insensitive_and_first_match_wins():
+    raw = make_raw_study()
+    raw["protocolSection"]["conditionsModule"]["conditions"] = ["LUNG NEOPLASMS", "Asthma"]
+    raw["derivedSection"]["conditionBrowseModule"]["meshes"] = [
+        {"id": "D008175", "term": "Lung Neoplasms"},
+        {"id": "D999999", "term": "lung neoplasms"},
+        {"id": "D001249", "term": "Asthma"},
+    ]
+
+    trial = flatten_core(raw)
+    assert [c.mesh_uid for c in trial.conditions] == ["D008175", "D001249"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_flatten_many_collects_errors_and_keeps_order(workers):
+    raws = [make_raw_study(f"NCT{i:08d}") for i in range(50)]
+    raws[7]["protocolSection"]["designModule"]["studyType"] = "BOGUS"
+    raws[30] = json.dumps(raws[30]).encode()  # shipped to workers as bytes
+    raws[31] = "{not json"
+
+    run = flatten_many(raws, workers=workers, chunksize=8)
+    trials = list(run)
+
+    expected = [f"NCT{i:08d}" for i in range(50) if i not in (7, 31)]
+    assert [t.nct_id for t in trials] == expected
+    assert [(e.index, e.nct_id) for e in run.errors] == [(7, "NCT00000007"), (31, None)]
+    assert run.errors[0].error.startswith("ValidationError")
+
+
+def test_flatten_many_unordered():
+    raws = (make_raw_study(f"NCT{i:08d}") for i in range(40))
+    trials = list(flatten_many(raws, workers=2, chunksize=5, ordered=False))
+    assert sorted(t.nct_id for t in trials) == [f"NCT{i:08d}" for i in range(40)]
@@ -0,0 +1,41 @@
+import pytest
+from conftest import make_raw_study
+
+from ctgforge.flatten import flatten_core
+
+pa = pytest.importorskip("pyarrow")
+
+from ctgforge.flatten.arrow import TRIAL_SCHEMA, flatten_to_arrow, flatten_to_table  # noqa: E402
+
+
+def test_flatten_to_arrow_batches():
+    raws = [make_raw_study(f"NCT{i:08d}") for i in range(25)]
+    batches = list(flatten_to_arrow(raws, batch_size=10))
+
+    assert [b.num_rows for b in batches] == [10, 10, 5]
+    assert all(b.schema == TRIAL_SCHEMA for b in batches)
+
+
+def test_flatten_to_table_matches_flatten_core():
+    raw = make_raw_study()
+    trial = flatten_core(raw)
+    row = flatten_to_table([raw]).to_pylist()[0]
+
+    assert row["nct_id"] == trial.nct_id
+    assert row["overall_status"] == trial.overall_status
+    assert row["phases"] == trial.phases
+    assert row["lead_sponsor"] == trial.lead_sponsor.name
+    assert row["collaborators"] == [c.name for c in trial.collaborators]
+    assert row["conditions"] == [c.name for c in trial.conditions]
+    assert row["condition_mesh_uids"] == [c.mesh_uid for c in trial.conditions]
+    assert row["interventions"] == [i.name for i in trial.interventions]
+    assert row["intervention_types"] == ["DRUG", "DRUG", "DRUG"]
+    assert row["arm_group_types"] == ["EXPERIMENTAL", "PLACEBO_COMPARATOR"]
+    assert row["start_date"] == "2021-03"
+    assert row["has_results"] is False
+
+
+def test_flatten_to_table_empty():
+    table = flatten_to_table([])
+    assert table.num_rows == 0
+    assert table.schema == TRIAL_SCHEMA
@@ -0,0 +1,55 @@
+import asyncio
+
+from ctgforge import CTG
+from ctgforge.client.async_client import CTGAsyncClient
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.pagination import MAX_PAGE_SIZE
+from ctgforge.testing import FakeCTGServer
+
+
+def test_get_many_batches_and_falls_back(mock_api):
+    client = CTG(client=CTGHttpxClient(client=mock_api.client()))
+    ids = [f"NCT{i:08d}" for i in range(0, 200, 2)] + ["nct00000004", "NCT00000999"]
+
+    results = list(client.get_many(ids, batch_size=25, workers=4))
+    client.close()
+
+    by_id = {r.nct_id: r for r in results}
+    assert len(results) == 101
+    assert all(by_id[f"NCT{i:08d}"].ok for i in range(0, 200, 2))
+    assert not by_id["NCT00000999"].ok
+    assert by_id["NCT00000999"].study is None
+
+    # 5 batch searches, plus one STUDY_PATH request for the ID no batch returned
+    assert len(mock_api.calls) == 6
+
+
+def test_get_many_without_batching(mock_api):
+    client = CTG(client=CTGHttpxClient(client=mock_api.client()))
+    results = list(client.get_many(["NCT00000001", "NCT00000002"], batch_size=1))
+    client.close()
+
+    assert sorted(r.nct_id for r in results) == ["NCT00000001", "NCT00000002"]
+    assert all(r.ok for r in results)
+    assert all("/studies/NCT" in str(c.url) for c in mock_api.calls)
+
+
+def test_get_many_caps_batches_at_max_page_size():
+    ids = [f"NCT{i:08d}" for i in range(1500)]
+    with FakeCTGServer(n_studies=1500) as server:
+        client = CTGHttpxClient(base_url=server.url)
+        results = list(client.get_many(ids, batch_size=5000))
+        client.close()
+        sync_sizes = sorted(int(r.params["pageSize"]) for r in server.requests)
+        server.reset()
+
+        async def run():
+            async with CTGAsyncClient(base_url=server.url) as client:
+                return [r async for r in client.get_many(ids, batch_size=5000)]
+
+        async_results = asyncio.run(run())
+        async_sizes = sorted(int(r.params["pageSize"]) for r in server.requests)
+
+    assert all(r.ok for r in results + async_results) and len(results) == 1500
+    # two batch searches, no 400 and no per-ID fallback
+    assert sync_sizes == async_sizes == [500, MAX_PAGE_SIZE]
@@ -0,0 +1,272 @@
+import random
+
+import pytest
+from conftest import make_raw_study
+
+from ctgforge.export import to_property_graph
+from ctgforge.export.graph import PropertyGraphBuilder
+from ctgforge.flatten import flatten_core
+
+
+def _trial(nct_id, **overrides):
+    return flatten_core(make_raw_study(nct_id, **overrides))
+
+
+def test_nodes_are_deduplicated_with_dense_ids():
+    trials = [_trial("NCT00000001"), _trial("NCT00000002")]
+    nodes, edges = to_property_graph(trials)
+
+    assert nodes["id"].tolist() == list(range(len(nodes)))
+    assert nodes["node_id"].is_unique
+    assert str(nodes["id"].dtype) == "int32"
+    assert str(nodes["label"].dtype) == "category"
+    assert "props" not in nodes.columns
+
+    # both trials share every condition, intervention and sponsor
+    t = trials[0]
+    shared = len(nodes) - 2
+    assert shared == len({c.name.lower() for c in t.conditions}) + len(
+        {i.name.lower() for i in t.interventions}
+    ) + len({t.lead_sponsor.name.lower()} | {c.name.lower() for c in t.collaborators})
+
+    assert set(edges.columns) == {"src", "rel", "dst"}
+    assert edges["src"].max() < len(nodes) and edges["dst"].max() < len(nodes)
+
+
+def test_edges_are_deduplicated():
+    raw = make_raw_study("NCT00000001")
+    conds = raw["protocolSection"]["conditionsModule"]["conditions"]
+    conds.append(conds[0])
+
+    builder = PropertyGraphBuilder(incremental=False)
+    builder.add(flatten_core(raw))
+    builder.add(flatten_core(raw))  # the same trial again
+
+    _, edges = builder.to_frames()
+    assert not edges.duplicated().any()
+    assert builder.num_edges == len(edges)
+
+
+def test_props_are_merged_deterministically():
+    a = make_raw_study("NCT00000001")
+    b = make_raw_study("NCT00000002")
+    for arm in b["protocolSection"]["armsInterventionsModule"]["armGroups"]:
+        arm["type"] = "ACTIVE_COMPARATOR"
+    b["derivedSection"]["interventionBrowseModule"]["meshes"] = []
+    a["derivedSection"]["interventionBrowseModule"]["meshes"] = []
+
+    builder = PropertyGraphBuilder()
+    builder.add(flatten_core(a))
+    builder.add(flatten_core(b))
+    nodes, _ = builder.to_frames()
+
+    intr = flatten_core(a).interventions[0]
+    row = nodes.set_index("node_id").loc[f"Intervention:{intr.name.lower()}"]
+    assert "ACTIVE_COMPARATOR" in row["arm_group_types"]
+    assert row["arm_group_types"] == sorted(row["arm_group_types"])
+
+    # the union does not depend on the order trials are added in
+    reverse = PropertyGraphBuilder()
+    reverse.add(flatten_core(b))
+    reverse.add(flatten_core(a))
+    rev = reverse.to_frames()[0].set_index("node_id")
+    assert rev.loc[f"Intervention:{intr.name.lower()}"]["arm_group_types"] == row["arm_group_types"]
+
+
+def test_first_non_null_prop_wins():
+    a = make_raw_study("NCT00000001")
+    b = make_raw_study("NCT00000002")
+    a["derivedSection"]["conditionBrowseModule"]["meshes"] = []
+
+    nodes, _ = to_property_graph([flatten_core(a), flatten_core(b)])
+    cond = flatten_core(b).conditions[0]
+    row = nodes.set_index("node_id").loc[f"Condition:{cond.name.lower().replace(' ', '_')}"]
+    assert row["mesh_uid"] == cond.mesh_uid
+
+
+def test_empty_graph():
+    nodes, edges = to_property_graph([])
+    assert nodes.empty and edges.empty
+
+
+def _builder(*raws):
+    builder = PropertyGraphBuilder()
+    builder.add_many(flatten_core(r) for r in raws)
+    builder.pop_delta()
+    return builder
+
+
+def _only_in_b():
+    a = make_raw_study("NCT00000001")
+    b = make_raw_study("NCT00000002")
+    b["protocolSection"]["conditionsModule"]["conditions"].append("Rare Disease")
+    return a, b
+
+
+def test_first_delta_is_the_whole_graph():
+    builder = PropertyGraphBuilder()
+    builder.add(flatten_core(make_raw_study("NCT00000001")))
+    nodes, edges = builder.to_frames()
+
+    delta = builder.pop_delta()
+    assert delta.added_nodes["node_id"].tolist() == nodes["node_id"].tolist()
+    assert len(delta.added_edges) == len(edges)
+    assert builder.pop_delta().empty
+
+
+def test_remove_drops_orphaned_nodes():
+    a, b = _only_in_b()
+    builder = _builder(a, b)
+    assert builder.refcount("Condition:rare_disease") == 1
+    shared = f"Sponsor:{flatten_core(a).lead_sponsor.name.lower().replace(' ', '_')}"
+    assert builder.refcount(shared) == 2
+
+    rare = builder.node_index("Condition:rare_disease")
+    trial_b = builder.node_index("Trial:NCT00000002")
+    n_edges = builder.num_edges
+    builder.remove("NCT00000002")
+
+    assert "NCT00000002" not in builder
+    assert builder.node_index("Condition:rare_disease") is None
+    assert builder.refcount(shared) == 1
+
+    delta = builder.pop_delta()
+    assert set(delta.removed_nodes["id"]) == {rare, trial_b}
+    assert delta.added_nodes.empty and delta.added_edges.empty
+    assert len(delta.removed_edges) == n_edges - builder.num_edges
+    assert set(delta.removed_edges["src"]) == {trial_b}
+
+    nodes, edges = builder.to_frames()
+    assert set(nodes["node_id"]) == set(to_property_graph([flatten_core(a)])[0]["node_id"])
+    assert set(edges["src"]) | set(edges["dst"]) <= set(nodes["id"])
+
+
+def test_update_emits_net_changes_and_keeps_ids():
+    a, b = _only_in_b()
+    builder = _builder(a, b)
+    trial_b = builder.node_index("Trial:NCT00000002")
+
+    changed = make_raw_study("NCT00000002")
+    changed["protocolSection"]["statusModule"]["overallStatus"] = "COMPLETED"
+    changed["protocolSection"]["conditionsModule"]["conditions"].append("Other Disease")
+    builder.update(flatten_core(changed))
+
+    assert builder.node_index("Trial:NCT00000002") == trial_b
+    delta = builder.pop_delta()
+    assert delta.added_nodes["node_id"].tolist() == ["Condition:other_disease"]
+    assert delta.removed_nodes["node_id"].tolist() == ["Condition:rare_disease"]
+    assert delta.updated_nodes["node_id"].tolist() == ["Trial:NCT00000002"]
+    assert delta.updated_nodes["overall_status"].tolist() == ["COMPLETED"]
+    assert len(delta.added_edges) == len(delta.removed_edges) == 1
+
+    # an unchanged update is a no-op
+    builder.update(flatten_core(changed))
+    assert builder.pop_delta().empty
+
+
+def test_remove_re_merges_props():
+    a = make_raw_study("NCT00000001")
+    b = make_raw_study("NCT00000002")
+    for arm in b["protocolSection"]["armsInterventionsModule"]["armGroups"]:
+        arm["type"] = "ACTIVE_COMPARATOR"
+    builder = _builder(a, b)
+    intr = f"Intervention:{flatten_core(a).interventions[0].name.lower()}"
+
+    builder.remove("NCT00000002")
+
+    nodes = builder.to_frames()[0].set_index("node_id")
+    assert "ACTIVE_COMPARATOR" not in nodes.loc[intr]["arm_group_types"]
+    assert intr in builder.pop_delta().updated_nodes["node_id"].tolist()
+
+
+def test_incremental_add_rejects_duplicates():
+    builder = _builder(make_raw_study("NCT00000001"))
+    with pytest.raises(ValueError):
+        builder.add(flatten_core(make_raw_study("NCT00000001")))
+    builder.remove("NCT99999999")  # unknown IDs are ignored
+    assert builder.pop_delta().empty
+
+
+def test_add_only_builder_rejects_retraction():
+    builder = PropertyGraphBuilder(incremental=False)
+    with pytest.raises(RuntimeError):
+        builder.remove("NCT00000001")
+
+
+def _sponsored(nct_id, sponsor_class):
+    raw = make_raw_study(nct_id)
+    raw["protocolSection"]["sponsorCollaboratorsModule"]["leadSponsor"] = {
+        "name": "Acme",
+        "class": sponsor_class,
+    }
+    return raw
+
+
+def test_retraction_re_merges_a_prop_still_mentioned():
+    classes = ["INDUSTRY", "INDUSTRY", "OTHER", "OTHER"]
+    builder = _builder(*(_sponsored(f"NCT0000000{i}", c) for i, c in enumerate(classes)))
+    assert builder.to_frames()[0].set_index("node_id").loc["Sponsor:acme", "type"] == "INDUSTRY"
+
+    builder.remove("NCT00000000")
+
+    assert builder.to_frames()[0].set_index("node_id").loc["Sponsor:acme", "type"] == "OTHER"
+    updated = builder.pop_delta().updated_nodes.set_index("node_id")
+    assert updated.loc["Sponsor:acme", "type"] == "OTHER"
+
+
+def _random_study(rng, nct_id):
+    raw = make_raw_study(nct_id)
+    protocol = raw["protocolSection"]
+    protocol["statusModule"]["overallStatus"] = rng.choice(["RECRUITING", "COMPLETED"])
+    protocol["sponsorCollaboratorsModule"] = {
+        "leadSponsor": {"name": rng.choice("AB"), "class": rng.choice(["INDUSTRY", "OTHER"])},
+        "collaborators": [{"name": rng.choice("BC"), "class": rng.choice(["NIH", "OTHER"])}],
+    }
+    protocol["conditionsModule"]["conditions"] = rng.sample(["Asthma", "Lung Neoplasms", "COPD"], 2)
+    raw["derivedSection"]["conditionBrowseModule"]["meshes"] = [
+        {"id": rng.choice(["D1", "D2"]), "term": term} for term in ("Asthma", "COPD")
+    ]
+    arms = protocol["armsInterventionsModule"]
+    for arm in arms["armGroups"]:
+        arm["type"] = rng.choice(["EXPERIMENTAL", "ACTIVE_COMPARATOR"])
+    for intr in arms["interventions"]:
+        intr["type"] = rng.choice(["DRUG", "BIOLOGICAL"])
+    return raw
+
+
+def _node_props(nodes):
+    props = nodes.drop(columns="id").set_index("node_id").astype(object)
+    return props.where(props.notna(), None).to_dict("index")
+
+
+def _graph(nodes, edges):
+    node_ids = dict(zip(nodes["id"], nodes["node_id"]))
+    rels = {(node_ids[s], r, node_ids[d]) for s, r, d in edges[["src", "rel", "dst"]].values}
+    return _node_props(nodes), rels
+
+
+def test_incremental_changes_match_a_rebuild():
+    rng = random.Random(7)
+    builder = PropertyGraphBuilder()
+    trials = {}  # in the order they were last added or updated
+    store = {}  # a downstream copy of the nodes, kept up to date with deltas
+    for step in range(300):
+        nct_id = f"NCT{rng.randrange(12):08d}"
+        if nct_id in trials and rng.random() < 0.3:
+            builder.remove(nct_id)
+            del trials[nct_id]
+        else:
+            trials.pop(nct_id, None)
+            trials[nct_id] = flatten_core(_random_study(rng, nct_id))
+            builder.update(trials[nct_id])
+
+        if step % 10 == 0:
+            expected = _graph(*to_property_graph(trials.values()))
+            assert _graph(*builder.to_frames()) == expected
+
+            delta = builder.pop_delta()
+            for node_id in delta.removed_nodes["node_id"]:
+                del store[node_id]
+            for frame in (delta.added_nodes, delta.updated_nodes):
+                store.update(_node_props(frame))
+            assert store == expected[0]
@@ -0,0 +1,107 @@
+import csv
+import xml.etree.ElementTree as ET
+
+from conftest import make_raw_study
+
+from ctgforge.export import to_property_graph
+from ctgforge.export.graphdb import write_graphml, write_neo4j_import
+from ctgforge.flatten import flatten_core
+
+NS = {"g": "http://graphml.graphdrawing.org/xmlns"}
+
+
+def _raws(n):
+    for i in range(n):
+        yield make_raw_study(f"NCT{i:08d}")
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_neo4j_import_headers_and_id_spaces(tmp_path):
+    result = write_neo4j_import(_raws(3), tmp_path / "import")
+
+    assert set(result.nodes) == {"Trial", "Condition", "Intervention", "Sponsor"}
+    assert _read(result.nodes["Trial"])[0] == [
+        "node_id:ID(Trial)",
+        "title:string",
+        "study_type:string",
+        "overall_status:string",
+        ":LABEL",
+    ]
+    assert _read(result.nodes["Intervention"])[0] == [
+        "node_id:ID(Intervention)",
+        "mesh_uid:string",
+        "type:string",
+        "arm_group_types:string[]",
+        ":LABEL",
+    ]
+    assert _read(result.relationships["SPONSORED_BY"])[0] == [
+        ":START_ID(Trial)",
+        ":END_ID(Sponsor)",
+        ":TYPE",
+    ]
+
+    # every relationship end is a node of the ID space named in the header
+    ids = {label: {row[0] for row in _read(path)[1:]} for label, path in result.nodes.items()}
+    for rel, path in result.relationships.items():
+        header, *rows = _read(path)
+        end = header[1][len(":END_ID(") : -1]
+        assert rows or rel == "COLLABORATED_BY"
+        for start, stop, type_ in rows:
+            assert start in ids["Trial"] and stop in ids[end] and type_ == rel
+
+
+def test_neo4j_import_matches_property_graph(tmp_path):
+    raws = list(_raws(4))
+    nodes, edges = to_property_graph(flatten_core(raw) for raw in raws)
+
+    result = write_neo4j_import(raws, tmp_path)
+
+    assert sum(result.node_counts.values()) == len(nodes)
+    assert sum(result.relationship_counts.values()) == len(edges)
+    assert result.node_counts["Trial"] == 4
+    for label, path in result.nodes.items():
+        assert len(_read(path)) == result.node_counts[label] + 1
+
+    rows = {row[0]: row for row in _read(result.nodes["Intervention"])[1:]}
+    expected = nodes[nodes["label"] == "Intervention"].set_index("node_id")
+    for node_id, row in rows.items():
+        assert row[3] == ";".join(expected.loc[node_id, "arm_group_types"])
+        assert row[4] == "Intervention"
+
+
+def test_neo4j_import_command_and_empty_input(tmp_path):
+    result = write_neo4j_import([], tmp_path)
+
+    # files are created even without rows
+    assert all(len(_read(path)) == 1 for path in result.nodes.values())
+    assert all(count == 0 for count in result.relationship_counts.values())
+
+    command = result.command("trials")
+    assert command[:4] == ["neo4j-admin", "database", "import", "full"]
+    assert f"--nodes={result.nodes['Trial']}" in command
+    assert f"--relationships={result.relationships['HAS_CONDITION']}" in command
+    assert "--array-delimiter=;" in command
+    assert command[-1] == "trials"
+
+
+def test_graphml(tmp_path):
+    raws = list(_raws(3))
+    nodes, edges = to_property_graph(flatten_core(raw) for raw in raws)
+    path = tmp_path / "graph.graphml"
+
+    assert write_graphml(raws, path) == (len(nodes), len(edges))
+
+    graph = ET.parse(path).getroot().find("g:graph", NS)
+    node_ids = {n.get("id") for n in graph.findall("g:node", NS)}
+    assert node_ids == set(nodes["node_id"])
+    for e in graph.findall("g:edge", NS):
+        assert e.get("source") in node_ids and e.get("target") in node_ids
+
+    trial = graph.find("g:node[@id='Trial:NCT00000000']", NS)
+    data = {d.get("key"): d.text for d in trial.findall("g:data", NS)}
+    assert data["label"] == "Trial"
+    assert "mesh_uid" not in data  # unset properties are omitted
@@ -0,0 +1,146 @@
+import pytest
+
+from ctgforge.client.ctg_client import CTGTransportError, RetryConfig
+from ctgforge.client.hooks import ClientHooks, HookList, RequestEvent
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.metrics import Histogram, MetricsCollector
+from ctgforge.client.otel import OpenTelemetryHooks
+from ctgforge.client.requests_client import CTGRequestsClient
+from ctgforge.testing import FakeCTGServer
+
+FAST_RETRY = RetryConfig(backoff_base=0.01, backoff_cap=0.01)
+
+
+class Recorder(ClientHooks):
+    def __init__(self):
+        self.calls = []
+
+    def request_start(self, event):
+        self.calls.append(("start", event.attempt))
+
+    def request_end(self, event):
+        self.calls.append(("end", event.status))
+
+    def retry(self, event, delay):
+        self.calls.append(("retry", event.attempt))
+
+    def decoded(self, event):
+        self.calls.append(("decoded", event.studies))
+
+
+@pytest.fixture(scope="module")
+def shared_server():
+    with FakeCTGServer(n_studies=250) as server:
+        yield server
+
+
+@pytest.fixture
+def server(shared_server):
+    shared_server.reset()
+    return shared_server
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("transport", [CTGHttpxClient, CTGRequestsClient])
+def test_hooks_see_retries_and_pages(server, transport, stream):
+    recorder = Recorder()
+    client = transport(base_url=server.url, hooks=recorder, retry=FAST_RETRY, stream_pages=stream)
+    server.fail_next(1, status=503)
+
+    assert len(list(client.search(limit=100))) == 100
+    assert recorder.calls == [
+        ("start", 0),
+        ("end", 503),
+        ("retry", 0),
+        ("start", 1),
+        ("end", 200),
+        ("decoded", 100),
+    ]
+
+
+def test_metrics_collector(server):
+    metrics = MetricsCollector()
+    client = CTGHttpxClient(base_url=server.url, hooks=metrics, retry=FAST_RETRY)
+    server.fail_next(2, status=429, retry_after=0)
+
+    assert len(list(client.search(limit=None))) == 250
+    client.get("NCT00000001")
+
+    snap = metrics.snapshot()
+    assert snap["requests"] == 4 and snap["in_flight"] == 0
+    assert snap["statuses"] == {"200": 2, "429": 2} and snap["retries"] == 2
+    assert snap["studies_received"] == 250 and snap["bytes_received"] > 0
+    assert snap["page_sizes"]["count"] == 1 and snap["page_sizes"]["max"] == 250
+    assert snap["latency"]["count"] == 4 and snap["decode"]["count"] == 2
+    assert "studies per page" in metrics.report()
+
+    metrics.reset()
+    assert metrics.snapshot()["requests"] == 0
+
+
+def test_metrics_count_transport_errors():
+    metrics = MetricsCollector()
+    with FakeCTGServer(n_studies=1) as server:
+        url = server.url
+    client = CTGRequestsClient(base_url=url, hooks=metrics, retry=RetryConfig(max_retries=0))
+
+    with pytest.raises(CTGTransportError):
+        client.get("NCT00000000")
+    assert metrics.requests == 1 and metrics.in_flight == 0
+    assert sum(metrics.errors.values()) == 1 and not metrics.statuses
+
+
+def test_histogram_quantiles():
+    hist = Histogram((1, 2, 5, 10))
+    for value in range(1, 11):
+        hist.observe(value)
+
+    assert hist.count == 10 and hist.mean == 5.5
+    assert hist.quantile(0) == 1 and hist.quantile(1) == 10
+    assert hist.quantile(0.5) == 5
+    assert 5 < hist.quantile(0.9) <= 10
+    assert hist.to_dict()["buckets"] == {"1": 1, "2": 1, "5": 3, "10": 5, "+Inf": 0}
+    assert Histogram((1,)).quantile(0.5) is None
+    with pytest.raises(ValueError):
+        Histogram((2, 1))
+
+
+def test_hook_list_fans_out(server):
+    a, b = Recorder(), Recorder()
+    client = CTGRequestsClient(base_url=server.url, hooks=[a, b])
+    client.get("NCT00000001")
+
+    assert a.calls == b.calls == [("start", 0), ("end", 200), ("decoded", None)]
+    assert isinstance(client._hooks, HookList)
+
+
+def test_opentelemetry_spans(server):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    hooks = OpenTelemetryHooks(provider.get_tracer("test"))
+    client = CTGHttpxClient(base_url=server.url, hooks=hooks, retry=FAST_RETRY)
+    server.fail_next(1, status=500)
+
+    list(client.search(limit=10))
+    spans = exporter.get_finished_spans()
+    assert [s.name for s in spans] == ["GET /studies", "backoff", "GET /studies", "decode"]
+    assert [s.attributes.get("http.response.status_code") for s in spans[::2]] == [500, 200]
+    assert spans[3].attributes["ctgforge.studies"] == 10
+    assert not hooks._spans
+
+
+def test_opentelemetry_hooks_without_tracer_are_noop():
+    hooks = OpenTelemetryHooks()
+    hooks._tracer = None  # as without opentelemetry installed
+    event = RequestEvent("GET", "/studies", None, 0)
+    hooks.request_start(event)
+    hooks.retry(event, 0.1)
+    hooks.request_end(event)
+    hooks.decoded(event)
+    assert not hooks.enabled and not hooks._spans
@@ -0,0 +1,83 @@
+import pytest
+from conftest import MockCTGApi
+
+from ctgforge import CTG, F
+from ctgforge.client.ctg_client import CTGTransportError, RetryConfig
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.pagination import SearchCursor, SearchPager
+
+
+def _nct(study: dict) -> str:
+    return study["protocolSection"]["identificationModule"]["nctId"]
+
+
+def test_search_sizes_pages_from_limit_and_skips_with_ids_only(mock_api):
+    client = CTG(client=CTGHttpxClient(client=mock_api.client()))
+    raw = list(client.search(None, offset=200, limit=10))
+    stats = client.client.stats
+    client.close()
+
+    assert [_nct(s) for s in raw] == [f"NCT{i:08d}" for i in range(200, 210)]
+
+    skip, data = (c.url.params for c in mock_api.calls)
+    assert skip["fields"] == "NCTId" and skip["pageSize"] == "200"
+    assert "fields" not in data and data["pageSize"] == "10" and data["pageToken"] == "200"
+
+    assert stats.requests == 2
+    assert stats.records_received == stats.records_yielded == 10
+    assert stats.bytes_received > 0
+
+
+def test_pager_stops_when_results_run_out():
+    pager = SearchPager(SearchCursor.start(offset=5, limit=100))
+
+    assert pager.next_params()["pageSize"] == 5
+    assert pager.feed({"studies": [{}] * 5, "nextPageToken": "t1"}) == []
+
+    params = pager.next_params()
+    assert params["pageSize"] == 100 and params["pageToken"] == "t1"
+    assert len(pager.feed({"studies": [{}] * 42})) == 42
+    assert pager.next_params() is None
+
+
+def test_pager_zero_limit_sends_nothing():
+    assert SearchPager(SearchCursor.start(limit=0)).next_params() is None
+
+
+def test_unbounded_search_walks_every_page():
+    api = MockCTGApi(n_studies=2500)
+    client = CTG(client=CTGHttpxClient(client=api.client()))
+    raw = list(client.search(None, limit=None))
+    client.close()
+
+    assert len(raw) == 2500
+    assert [c.url.params["pageSize"] for c in api.calls] == ["1000", "1000", "1000"]
+
+
+def test_cursor_resumes_after_transport_error(tmp_path):
+    api = MockCTGApi(n_studies=2500)
+    api.fail_tokens.add("1500")
+    client = CTG(client=CTGHttpxClient(client=api.client(), retry=RetryConfig(max_retries=0)))
+
+    cursor = client.cursor(F.condition.eq("asthma"), offset=500)
+    seen = []
+    with pytest.raises(CTGTransportError):
+        for s in client.resume(cursor):
+            seen.append(_nct(s))
+            if len(seen) == 734:
+                cursor.save(tmp_path / "cursor.json")
+    assert len(seen) == 1000
+
+    api.fail_tokens.clear()
+    restored = SearchCursor.load(tmp_path / "cursor.json")
+    assert restored.yielded == 734 and restored.params["query.cond"] == '"asthma"'
+
+    calls_before = len(api.calls)
+    rest = [_nct(s) for s in client.resume(restored)]
+    client.close()
+
+    assert seen[:734] + rest == [f"NCT{i:08d}" for i in range(500, 2500)]
+    assert restored.exhausted and restored.yielded == 2000
+    # only the page being consumed is requested again, with its original size
+    assert api.calls[calls_before].url.params["pageToken"] == "500"
+    assert api.calls[calls_before].url.params["pageSize"] == "1000"
@@ -0,0 +1,87 @@
+import json
+import time
+
+import pytest
+
+from ctgforge import CTG
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.export.dataframe import to_dataframe
+from ctgforge.flatten.core import flatten_core
+from ctgforge.profiling import PipelineProfiler
+from ctgforge.testing import FakeCTGServer
+
+
+def _slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def test_profiles_search_flatten_export(tmp_path):
+    with FakeCTGServer(n_studies=120) as server:
+        ctg = CTG(client=CTGHttpxClient(base_url=server.url))
+        with PipelineProfiler(memory=True, batch_size=50) as profiler:
+            raws = profiler.wrap("search", ctg.search(limit=None))
+            trials = profiler.map("flatten_core", flatten_core, raws)
+            with profiler.stage("to_dataframe") as stage:
+                df = to_dataframe(trials)
+                stage.records += len(df)
+
+    assert len(df) == 120
+    snap = profiler.snapshot()
+    stages = {stage["name"]: stage for stage in snap["stages"]}
+    assert list(stages) == ["search", "flatten_core", "to_dataframe"]
+    assert [b["records"] for b in stages["search"]["batches"]] == [50, 50, 20]
+    assert [len(stage["batches"]) for stage in stages.values()] == [3, 3, 1]
+    for stage in stages.values():
+        assert stage["records"] == 120 and stage["seconds"] > 0
+        assert stage["traced_peak_mib"] is not None
+    assert sum(s["seconds"] for s in stages.values()) <= snap["wall_seconds"]
+
+    profiler.write_json(tmp_path / "profile.json")
+    assert json.loads((tmp_path / "profile.json").read_text())["stages"][2]["records"] == 120
+    assert "to_dataframe" in profiler.report()
+
+
+def test_chained_stages_are_charged_their_own_time():
+    with PipelineProfiler() as profiler:
+        source = profiler.wrap("source", _slow(range(5), 0.02))
+        doubled = profiler.map("double", lambda x: 2 * x, _slow(source, 0.01))
+        with profiler.stage("sum") as stage:
+            time.sleep(0.03)
+            assert sum(doubled) == 20
+            stage.records = 1
+
+    stages = profiler.stages
+    # sleeps only give lower bounds; upper bounds are loose for slow CI machines
+    assert 0.1 <= stages["source"].seconds < 1.0
+    assert 0.05 <= stages["double"].seconds < 1.0  # includes the unprofiled _slow()
+    assert 0.03 <= stages["sum"].seconds < 1.0
+    # each stage is charged its own time only, not that of the stages it pulls from
+    assert stages["sum"].seconds < stages["source"].seconds + stages["double"].seconds
+    assert stages["sum"].records == 1 and stages["source"].records == 5
+
+
+def test_disabled_profiler_passes_through():
+    profiler = PipelineProfiler(enabled=False, memory=True)
+    with profiler:
+        doubled = profiler.map("double", lambda x: 2 * x, profiler.wrap("src", [1, 2, 3]))
+        assert list(doubled) == [2, 4, 6]
+        with profiler.stage("noop") as stage:
+            stage.records += 1
+
+    assert not profiler.stages and profiler.snapshot()["wall_seconds"] == 0
+    with pytest.raises(ValueError):
+        PipelineProfiler(batch_size=0)
+
+
+def test_errors_unwind_the_stage_stack():
+    def broken():
+        yield 1
+        raise RuntimeError("boom")
+
+    profiler = PipelineProfiler()
+    with pytest.raises(RuntimeError):
+        with profiler:
+            list(profiler.wrap("broken", broken()))
+    assert not profiler._stack and profiler.stages["broken"].records == 1
@@ -0,0 +1,55 @@
+import pytest
+from conftest import make_raw_study
+
+from ctgforge import CTG
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.flatten import flatten_core, projection_fields, reads
+from ctgforge.testing import CorpusConfig, FakeCTGServer
+
+
+@reads("protocolSection.identificationModule.nctId", "protocolSection.conditionsModule")
+def conditions_of(raw):
+    protocol = raw["protocolSection"]
+    return protocol["identificationModule"]["nctId"], protocol["conditionsModule"]["conditions"]
+
+
+def test_projection_fields_are_minimal_and_stable():
+    fields = projection_fields([flatten_core, conditions_of], ["resultsSection", "hasResults"])
+
+    assert fields == sorted(fields) and len(set(fields)) == len(fields)
+    assert "protocolSection.conditionsModule" in fields
+    assert "protocolSection.conditionsModule.conditions" not in fields  # covered by the module
+    assert "resultsSection" in fields and fields.count("hasResults") == 1
+    assert projection_fields(flatten_core) == projection_fields([flatten_core])
+
+
+def test_undeclared_flattener_is_rejected():
+    with pytest.raises(ValueError, match="@reads"):
+        projection_fields(lambda raw: raw)
+
+
+def test_flatten_core_reads_only_its_declared_fields():
+    with FakeCTGServer([make_raw_study()]) as server:
+        ctg = CTG(client=CTGHttpxClient(base_url=server.url))
+        [projected] = ctg.search(project=flatten_core)
+        [full] = ctg.search()
+
+    assert flatten_core(projected) == flatten_core(full)
+    assert len(str(projected)) < len(str(full))
+
+
+def test_search_requests_the_projection():
+    config = CorpusConfig(full_documents=True)
+    with FakeCTGServer(n_studies=60, config=config) as server:
+        ctg = CTG(client=CTGHttpxClient(base_url=server.url))
+        projected = list(ctg.search(limit=None, project=[flatten_core, conditions_of]))
+        full = list(ctg.search(limit=None))
+        cursor = ctg.cursor(project=flatten_core)
+
+    assert [flatten_core(raw) for raw in projected] == [flatten_core(raw) for raw in full]
+    assert [conditions_of(raw) for raw in projected] == [conditions_of(raw) for raw in full]
+    assert not any("resultsSection" in raw for raw in projected)
+    assert server.requests[0].params["fields"] == ",".join(
+        projection_fields([flatten_core, conditions_of])
+    )
+    assert cursor.params["fields"] == ",".join(projection_fields(flatten_core))
@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from ctgforge.client.httpx_client import CTGHttpxClient
+from ctgforge.client.ratelimit import AdaptiveConcurrency, SQLiteTokenBucket, TokenBucket
+from ctgforge.client.requests_client import CTGRequestsClient
+from ctgforge.testing import FakeCTGServer, Faults
+
+
+def _timed(fn, n):
+    start = time.monotonic()
+    for _ in range(n):
+        fn()
+    return time.monotonic() - start
+
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(100, burst=5)
+
+    assert _timed(bucket.acquire, 5) < 0.02
+    assert _timed(bucket.acquire, 10) >= 0.09
+    assert bucket.acquired == 15 and bucket.waited >= 0.09
+
+    bucket.pause(0.1)
+    assert bucket.acquire() >= 0.09
+
+
+def test_token_bucket_is_shared_by_threads():
+    bucket = TokenBucket(200, burst=1)
+    threads = [threading.Thread(target=_timed, args=(bucket.acquire, 10)) for _ in range(4)]
+
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.monotonic() - start >= 39 / 200
+    assert bucket.acquired == 40
+
+
+def test_sqlite_token_bucket_is_shared_by_connections(tmp_path):
+    path = tmp_path / "rate.sqlite"
+    a = SQLiteTokenBucket(path, 20, burst=5)
+    b = SQLiteTokenBucket(path, 20, burst=5)
+    other = SQLiteTokenBucket(path, 20, burst=5, name="other")
+
+    assert _timed(a.acquire, 5) < 0.1
+    assert _timed(b.acquire, 5) >= 0.15  # a used the burst up
+    assert _timed(other.acquire, 5) < 0.1
+
+    b.pause(0.1)
+    assert a.acquire() >= 0.09
+    for bucket in (a, b, other):
+        bucket.close()
+
+
+def test_adaptive_concurrency_aimd():
+    limiter = AdaptiveConcurrency(4, max_limit=5)
+
+    tickets = [limiter.acquire() for _ in range(4)]
+    assert limiter.in_flight == 4
+    # a burst of failures from requests in flight together cuts the limit once
+    for ticket in tickets:
+        limiter.release(ticket, throttled=True)
+    assert limiter.limit == 2 and limiter.decreases == 1 and limiter.throttled == 4
+
+    for _ in range(20):
+        limiter.release(limiter.acquire(), throttled=False)
+    assert limiter.limit == 5
+
+    limiter.release(limiter.acquire(), throttled=True)
+    limiter.release(limiter.acquire(), throttled=True)
+    assert limiter.limit == 1.25
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(4, max_limit=2)
+
+
+def test_adaptive_concurrency_blocks_at_limit():
+    limiter = AdaptiveConcurrency(1)
+    ticket = limiter.acquire()
+    acquired = threading.Event()
+    t = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    t.start()
+
+    assert not acquired.wait(0.05)
+    limiter.release(ticket, throttled=False)
+    assert acquired.wait(1)
+    t.join()
+
+
+@pytest.mark.parametrize("transport", [CTGHttpxClient, CTGRequestsClient])
+def test_rate_limiter_avoids_429s(transport):
+    ids = [f"NCT{i:08d}" for i in range(30)]
+    faults = Faults(rate_limit=50, burst=5, retry_after=0.05)
+    with FakeCTGServer(n_studies=100, faults=faults) as server:
+        bucket = TokenBucket(35, burst=2)
+        client = transport(base_url=server.url, rate_limiter=bucket)
+        assert all(r.ok for r in client.get_many(ids, batch_size=1, workers=4))
+
+    assert server.statuses() == [200] * 30
+    assert bucket.acquired == 30
+
+
+def test_concurrency_backs_off_under_rate_limit():
+    ids = [f"NCT{i:08d}" for i in range(60)]
+    faults = Faults(rate_limit=40, burst=2, latency=0.05, retry_after=0.1)
+    with FakeCTGServer(n_studies=100, faults=faults) as server:
+        limiter = AdaptiveConcurrency(8)
+        client = CTGHttpxClient(base_url=server.url, concurrency=limiter)
+        assert all(r.ok for r in client.get_many(ids, batch_size=1, workers=8))
+
+    statuses = Counter(server.statuses())
+    assert statuses[200] == 60 and statuses[429] == limiter.throttled > 0
+    assert limiter.decreases >= 1 and limiter.in_flight == 0
+
+
+def test_429_pauses_shared_rate_limiter():
+    with FakeCTGServer(n_studies=10) as server:
+        bucket = TokenBucket(1000)
+        client = CTGRequestsClient(base_url=server.url, rate_limiter=bucket)
+        other = CTGHttpxClient(base_url=server.url, rate_limiter=bucket)
+        server.fail_next(1, status=429, retry_after=0.2)
+
+        client.get("NCT00000001")
+        start = time.monotonic()
+        other.get("NCT00000002")
+        assert time.monotonic() - start < 0.05  # client already waited out the pause
+
+        server.fail_next(1, status=429, retry_after=0.2)
+        threading.Thread(target=client.get, args=("NCT00000003",)).start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        other.get("NCT00000004")
+        assert time.monotonic() - start >= 0.1
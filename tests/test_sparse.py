@@ -0,0 +1,87 @@
+import pytest
+from conftest import make_raw_study
+
+from ctgforge.export import to_property_graph
+from ctgforge.flatten import flatten_core
+
+sp = pytest.importorskip("scipy.sparse")
+
+from ctgforge.export.sparse import SparseGraph, to_sparse_graph  # noqa: E402
+
+
+def _trials():
+    a = make_raw_study("NCT00000001")
+    b = make_raw_study("NCT00000002")
+    b["protocolSection"]["conditionsModule"]["conditions"] = ["Asthma"]
+    return [flatten_core(a), flatten_core(b)]
+
+
+def test_index_maps_are_sorted_and_stable():
+    trials = _trials()
+    graph = SparseGraph.from_trials(trials)
+    reverse = SparseGraph.from_trials(trials[::-1])
+
+    assert graph.labels == ["Condition", "Intervention", "Sponsor", "Trial"]
+    for label in graph.labels:
+        assert graph.index[label].is_monotonic_increasing
+        assert graph.index[label].equals(reverse.index[label])
+        assert (graph.incidence(label) != reverse.incidence(label)).nnz == 0
+
+
+def test_incidence_matches_edges():
+    trials = _trials()
+    nodes, edges = to_property_graph(trials)
+    graph = to_sparse_graph(nodes, edges)
+
+    conditions = graph.incidence("Condition")
+    assert sp.isspmatrix_csr(conditions)
+    assert conditions.shape == (2, len(graph.index["Condition"]))
+    assert conditions.nnz == (edges["rel"] == "HAS_CONDITION").sum()
+
+    row = graph.index["Trial"].get_loc("Trial:NCT00000002")
+    col = graph.index["Condition"].get_loc("Condition:asthma")
+    assert conditions[row, col] == 1
+
+    lead = graph.incidence("Sponsor", rels={"SPONSORED_BY"})
+    assert lead.sum(axis=1).tolist() == [[1], [1]]
+
+
+def test_cooccurrence_counts_trials():
+    trials = _trials()
+    graph = SparseGraph.from_trials(trials)
+
+    counts = graph.cooccurrence("Condition", "Intervention")
+    assert counts.shape == (len(graph.index["Condition"]), len(graph.index["Intervention"]))
+    asthma = graph.index["Condition"].get_loc("Condition:asthma")
+    # every intervention of trial 2 co-occurs with asthma once, and both trials share them
+    assert set(counts[asthma].data) == {1}
+    assert counts.max() == 1
+
+    sponsors = graph.cooccurrence("Sponsor", "Sponsor")
+    assert (sponsors != sponsors.T).nnz == 0
+    assert sponsors.diagonal().max() == 2
+
+    frame = graph.cooccurrence_frame("Condition", "Intervention")
+    assert list(frame.columns) == ["Condition", "Intervention", "trials"]
+    assert len(frame) == counts.nnz
+    assert frame["trials"].is_monotonic_decreasing
+
+
+def test_adjacency_is_symmetric_over_all_nodes():
+    nodes, edges = to_property_graph(_trials())
+    graph = to_sparse_graph(nodes, edges)
+
+    adj, node_ids = graph.adjacency()
+    assert adj.shape == (len(nodes), len(nodes))
+    assert set(node_ids) == set(nodes["node_id"])
+    assert adj.nnz == 2 * len(edges)
+    assert (adj != adj.T).nnz == 0
+
+    directed, _ = graph.adjacency(symmetric=False)
+    assert directed.nnz == len(edges)
+
+
+def test_unknown_label():
+    graph = SparseGraph.from_trials(_trials())
+    with pytest.raises(KeyError):
+        graph.incidence("Drug")
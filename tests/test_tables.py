@@ -0,0 +1,51 @@
+from conftest import make_raw_study
+
+from ctgforge.export import to_tables
+from ctgforge.export.tables import TABLES
+from ctgforge.flatten import flatten_core
+
+
+def test_to_tables_shapes_and_keys():
+    trials = [flatten_core(make_raw_study(f"NCT{i:08d}")) for i in range(3)]
+    tables = to_tables(trials)
+
+    assert set(tables) == set(TABLES)
+    for name, df in tables.items():
+        assert tuple(df.columns) == TABLES[name]
+        assert set(df["nct_id"]) == {t.nct_id for t in trials}
+
+    t = trials[0]
+    assert len(tables["trial"]) == 3
+    assert len(tables["condition"]) == 3 * len(t.conditions)
+    assert len(tables["intervention"]) == 3 * len(t.interventions)
+    assert len(tables["arm_group"]) == 3 * len(t.arm_groups)
+    assert len(tables["collaborator"]) == 3 * len(t.collaborators)
+    assert len(tables["phase"]) == 3 * len(t.phases)
+
+
+def test_to_tables_keeps_child_fields():
+    t = flatten_core(make_raw_study("NCT00000001"))
+    tables = to_tables([t])
+
+    cond = tables["condition"]
+    assert cond["name"].tolist() == [c.name for c in t.conditions]
+    assert cond["mesh_uid"].tolist() == [c.mesh_uid for c in t.conditions]
+
+    intr = tables["intervention"]
+    assert intr["type"].tolist() == [i.type for i in t.interventions]
+    assert str(intr["type"].dtype) == "category"
+
+    links = tables["arm_intervention"]
+    expected = [(ag, i.name) for i in t.interventions for ag in i.arm_group_labels]
+    assert list(zip(links["arm_group_label"], links["intervention_name"])) == expected
+    # every link resolves to an arm group of the same trial
+    merged = links.merge(
+        tables["arm_group"], left_on=["nct_id", "arm_group_label"], right_on=["nct_id", "label"]
+    )
+    assert len(merged) == len(links)
+
+
+def test_to_tables_empty():
+    tables = to_tables([])
+    assert all(df.empty for df in tables.values())
+    assert tuple(tables["trial"].columns) == TABLES["trial"]